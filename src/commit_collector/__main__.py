@@ -6,6 +6,7 @@ import sys
 from typing import List, Optional
 
 from ..utils.config import Config
+from ..utils.github_client import report_client_stats
 from .commit_stats import collect_all_commit_data, upload_to_sheets
 
 
@@ -31,6 +32,31 @@ def main() -> int:
         help='開始日（YYYY-MM-DD形式、指定しない場合は2025-05-01）',
         default='2025-05-01'
     )
+    parser.add_argument(
+        '--until-date',
+        help='終了日（YYYY-MM-DD形式、この日を含む。指定しない場合は現在まで）'
+    )
+    parser.add_argument(
+        '--branch',
+        help='取得するブランチ（指定しない場合は各リポジトリのデフォルトブランチ）'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['api', 'git'],
+        default='api',
+        help='コミットの取得方法（api: REST API, git: ベアミラーを git fetch で更新して git log から集計）'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='同時に取得するリポジトリ数'
+    )
+    parser.add_argument(
+        '--window-days',
+        type=int,
+        help='日・週・月別に加えて、開始日からこの日数ごとの集計も rollups.json に出力する'
+    )
     parser.add_argument(
         '--output-dir',
         help='出力ディレクトリ',
@@ -51,6 +77,16 @@ def main() -> int:
         action='store_true',
         help='Google Sheetsの既存データをクリアしてから書き込み'
     )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='中断した前回の実行をチェックポイントから再開する'
+    )
+    parser.add_argument(
+        '--from-store',
+        action='store_true',
+        help='GitHub APIを呼ばず、保存済みのコミットデータ（Webhook受信で追加したものを含む）から集計する'
+    )
     parser.add_argument(
         '--config',
         help='設定ファイルのパス'
@@ -73,19 +109,32 @@ def main() -> int:
         repos = full_repos
     
     print(f"コミットデータ収集を開始します...")
-    print(f"対象期間: {args.since_date}以降")
+    if args.until_date:
+        print(f"対象期間: {args.since_date}〜{args.until_date}")
+    else:
+        print(f"対象期間: {args.since_date}以降")
     print(f"タイムゾーン: {args.timezone}")
+    if args.backend == 'git':
+        print(f"取得方法: ローカルのミラー（{config.get('github.mirror_url')}）")
     
     if repos:
         print(f"対象リポジトリ: {repos}")
     else:
         print("対象: team-mirai-volunteer組織の全パブリックリポジトリ")
     
-    commit_data, json_file = collect_all_commit_data(
+    commit_data, json_file, failed_repos = collect_all_commit_data(
         repos=repos,
         since_date=args.since_date,
         timezone_str=args.timezone,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        resume=args.resume,
+        from_store=args.from_store,
+        until_date=args.until_date,
+        branch=args.branch,
+        backend=args.backend,
+        mirror_url=config.get("github.mirror_url"),
+        jobs=max(1, args.jobs),
+        window_days=args.window_days
     )
     
     if not commit_data:
@@ -94,6 +143,13 @@ def main() -> int:
     
     print(f"収集完了: {len(commit_data)}件のコミット")
     
+    if failed_repos:
+        # 一部のリポジトリが欠けた集計でシートを上書きしない
+        print(f"{len(failed_repos)}件のリポジトリのコミットが欠けているため、Google Sheetsへのアップロードを行いません")
+        if args.backend == 'api':
+            print("--resume を付けて再実行すると、失敗したリポジトリだけを取得し直します")
+        return 1
+    
     if not args.no_upload:
         print("Google Sheetsにアップロード中...")
         
@@ -115,4 +171,6 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    exit_code = main()
+    report_client_stats()
+    sys.exit(exit_code)
@@ -0,0 +1,267 @@
+"""
+リポジトリごとのコミットデータのキャッシュ管理モジュール
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from ..utils.file_utils import ensure_dir, file_lock, read_json_lines
+from ..utils.sync_state import SyncState
+
+# ブランチを指定しない場合（デフォルトブランチ）の保存データのキー
+DEFAULT_BRANCH = "HEAD"
+
+
+class CommitCache:
+    """
+    前回取得したコミットデータを、取得時のリポジトリの pushedAt と一緒に保存するクラス
+
+    ブランチごとに取り込み済みの最新のコミットのSHA（台帳）も記録し、次回はそのSHAより
+    新しいコミットだけを取得して追加できるようにする。コミットデータと取得条件はリポジトリと
+    ブランチの組ごとに保存し、デフォルトブランチ以外は `<リポジトリ>@<ブランチ>` をキーにする。
+    台帳はデフォルトブランチでも実際のブランチ名をキーにする。保存データは取得元に関係なく
+    APIと同じ新しい順に保つ。収集処理とWebhook受信サーバーが同じデータを書き換えるため、
+    読み込みから置き換えまではプロセス間のファイルロックを取って行う。
+    """
+
+    def __init__(self, state_dir: Union[str, Path]):
+        """
+        キャッシュを初期化
+
+        Args:
+            state_dir: 状態ディレクトリ（`commit_sync.json` と `commits/` を置く）
+        """
+        self.state = SyncState(Path(state_dir) / "commit_sync.json")
+        self.data_dir = Path(state_dir) / "commits"
+
+    @staticmethod
+    def _key(repo: str, branch: str) -> str:
+        """
+        リポジトリとブランチの組の状態のキー（デフォルトブランチはリポジトリ名のまま）
+        """
+        return repo if branch == DEFAULT_BRANCH else f"{repo}@{branch}"
+
+    def _data_path(self, repo: str, branch: str = DEFAULT_BRANCH) -> Path:
+        """
+        リポジトリとブランチの組のコミットデータファイルのパス
+        """
+        return self.data_dir / f"{self._key(repo, branch).replace('/', '__')}.jsonl"
+
+    def _write(self, repo: str, commits: List[Dict[str, Any]], branch: str = DEFAULT_BRANCH) -> None:
+        """
+        リポジトリとブランチの組のコミットデータを一時ファイル経由で書き換える
+        """
+        ensure_dir(self.data_dir)
+        data_path = self._data_path(repo, branch)
+        # 呼び出し側で file_lock を取っているため、一時ファイルの名前は固定でよい
+        tmp_path = data_path.with_name(data_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for commit in commits:
+                f.write(json.dumps(commit, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, data_path)
+
+    def load(
+        self,
+        repo: str,
+        since_date: str,
+        timezone_str: str,
+        pushed_at: Optional[str],
+        until_date: Optional[str] = None,
+        branch: str = DEFAULT_BRANCH
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        前回から push がなく、同じ条件で取得したコミットデータがあれば返す
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+            since_date: 開始日
+            timezone_str: タイムゾーン
+            pushed_at: リポジトリの現在の pushedAt
+            until_date: 終了日
+            branch: ブランチ名（デフォルトブランチの場合は DEFAULT_BRANCH）
+
+        Returns:
+            コミットデータのリスト（使えるキャッシュがない場合はNone）
+        """
+        if not pushed_at:
+            return None
+
+        entry = self.state.get(self._key(repo, branch))
+        if (
+            entry.get("pushed_at") != pushed_at
+            or entry.get("since_date") != since_date
+            or entry.get("timezone") != timezone_str
+            or entry.get("until_date") != until_date
+        ):
+            return None
+
+        data_path = self._data_path(repo, branch)
+        if not data_path.exists():
+            return None
+        return read_json_lines(data_path)
+
+    def save(
+        self,
+        repo: str,
+        commits: List[Dict[str, Any]],
+        since_date: str,
+        timezone_str: str,
+        pushed_at: Optional[str],
+        until_date: Optional[str] = None,
+        heads: Optional[Dict[str, str]] = None,
+        branch: str = DEFAULT_BRANCH
+    ) -> None:
+        """
+        コミットデータを保存（保存済みのブランチのデータは置き換える）
+
+        pushedAt がわからない場合も台帳のために保存する（pushedAt による再利用はされない）。
+        台帳は記録済みのものに heads をマージする。
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+            commits: コミットデータのリスト
+            since_date: 開始日
+            timezone_str: タイムゾーン
+            pushed_at: 取得前に確認したリポジトリの pushedAt
+            until_date: 終了日
+            heads: ブランチ -> 取り込んだ最新のコミットのSHA
+            branch: ブランチ名（デフォルトブランチの場合は DEFAULT_BRANCH）
+        """
+        with file_lock(self._data_path(repo, branch)):
+            self._write(repo, commits, branch)
+
+        key = self._key(repo, branch)
+        merged = dict(self.state.get(key).get("heads") or {})
+        merged.update(heads or {})
+        self.state.update(
+            key, pushed_at=pushed_at, since_date=since_date, until_date=until_date, timezone=timezone_str,
+            heads=merged
+        )
+
+    def last_seen(
+        self,
+        repo: str,
+        branch: str,
+        since_date: str,
+        timezone_str: str,
+        ref: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        同じ条件で取り込み済みのブランチの最新のコミットのSHAを返す
+
+        期間の終了日を指定して保存したデータや、開始日・タイムゾーンが異なるデータには
+        追加できないためNoneを返す。
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+            branch: ブランチ名（デフォルトブランチの場合は DEFAULT_BRANCH）
+            since_date: 開始日
+            timezone_str: タイムゾーン
+            ref: 台帳のキーにする実際のブランチ名（指定しない場合は branch）
+
+        Returns:
+            コミットのSHA（追加できない場合はNone）
+        """
+        entry = self.state.get(self._key(repo, branch))
+        if (
+            entry.get("since_date") != since_date
+            or entry.get("timezone") != timezone_str
+            or entry.get("until_date")
+        ):
+            return None
+        if not self._data_path(repo, branch).exists():
+            return None
+        return (entry.get("heads") or {}).get(ref or branch)
+
+    def append(
+        self,
+        repo: str,
+        commits: List[Dict[str, Any]],
+        branch: str,
+        head: Optional[str],
+        pushed_at: Optional[str],
+        ref: Optional[str] = None
+    ) -> int:
+        """
+        前回より新しいコミットを保存済みのデータに追加し、台帳を更新
+
+        保存済みのデータはAPIと同じ新しい順に保つため、追加するコミットは先頭に置く。
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+            commits: 台帳のSHAより新しいコミットデータのリスト
+            branch: ブランチ名（デフォルトブランチの場合は DEFAULT_BRANCH）
+            head: 取り込んだ最新のコミットのSHA
+            pushed_at: 取得前に確認したリポジトリの pushedAt
+            ref: 台帳のキーにする実際のブランチ名（指定しない場合は branch）
+
+        Returns:
+            追加した件数（SHAが保存済みのものは追加しない）
+        """
+        with file_lock(self._data_path(repo, branch)):
+            existing = self.read(repo, branch)
+            seen = {commit.get('sha') for commit in existing if commit.get('sha')}
+            added = [commit for commit in commits if not commit.get('sha') or commit['sha'] not in seen]
+            if added:
+                self._write(repo, added + existing, branch)
+
+        key = self._key(repo, branch)
+        heads = dict(self.state.get(key).get("heads") or {})
+        if head:
+            heads[ref or branch] = head
+        self.state.update(key, pushed_at=pushed_at, heads=heads)
+        return len(added)
+
+    def repos(self) -> List[str]:
+        """
+        デフォルトブランチのコミットデータを保存済みのリポジトリ一覧
+
+        Returns:
+            リポジトリ名（owner/repo形式）のリスト
+        """
+        if not self.data_dir.exists():
+            return []
+        return sorted(
+            path.stem.replace('__', '/', 1) for path in self.data_dir.glob("*.jsonl") if '@' not in path.stem
+        )
+
+    def read(self, repo: str, branch: str = DEFAULT_BRANCH) -> List[Dict[str, Any]]:
+        """
+        保存済みのコミットデータを条件に関係なく読み込む（--from-store 用）
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+            branch: ブランチ名（デフォルトブランチの場合は DEFAULT_BRANCH）
+
+        Returns:
+            コミットデータのリスト（保存されていない場合は空のリスト）
+        """
+        data_path = self._data_path(repo, branch)
+        if not data_path.exists():
+            return []
+        return read_json_lines(data_path)
+
+    def add(self, repo: str, commits: List[Dict[str, Any]]) -> int:
+        """
+        Webhookで受け取ったコミットを保存済みのデータに追加（SHAが同じものは追加しない）
+
+        取得時の pushedAt は更新しないため、次回のポーリングではリポジトリを取得し直す。
+        pushイベントのコミットは古い順のため、append と同じく新しい順にして先頭に置く。
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+            commits: コミットデータのリスト（pushイベントと同じ古い順）
+
+        Returns:
+            追加した件数
+        """
+        with file_lock(self._data_path(repo)):
+            existing = self.read(repo)
+            seen = {commit.get('sha') for commit in existing if commit.get('sha')}
+            added = [commit for commit in commits if not commit.get('sha') or commit['sha'] not in seen]
+            if not added:
+                return 0
+
+            self._write(repo, added[::-1] + existing)
+        return len(added)
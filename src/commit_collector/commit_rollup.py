@@ -0,0 +1,453 @@
+"""
+コミットデータの多粒度集計モジュール
+
+集計済みのコミットデータ（aggregated_commits.json）や保存済みのコミットデータから、
+日・ISO週・月・任意の日数ごとの集計と、作成者別・リポジトリ別の合計を作る。
+APIを呼ばないため、新しい粒度の集計が必要になっても取得し直す必要はない。
+
+    python -m src.commit_collector.commit_rollup data/2025-05-01_to_2025-06-01/raw/commits/aggregated_commits.json --window-days 14
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from ..utils.file_utils import write_json_file
+
+GRANULARITIES = ("day", "week", "month")
+
+# 日付を整数（この日からの日数）で扱うときの基準日（木曜日）
+EPOCH = date(1970, 1, 1)
+
+
+def period_label(day: date, granularity: str, origin: Optional[date] = None, window_days: int = 1) -> str:
+    """
+    日付が属する期間のラベル
+
+    Args:
+        day: 日付
+        granularity: "day" / "week" / "month" / "window"
+        origin: granularity が "window" の場合の最初の期間の開始日
+        window_days: granularity が "window" の場合の期間の日数
+
+    Returns:
+        ラベル（日: 2025-05-01、週: 2025-W18、月: 2025-05、任意の期間: 開始日）
+    """
+    if granularity == "day":
+        return day.isoformat()
+    if granularity == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return f"{day.year}-{day.month:02d}"
+    if granularity == "window":
+        offset = (day - origin).days // window_days * window_days
+        return (origin + timedelta(days=offset)).isoformat()
+    raise ValueError(f"不明な集計の粒度です: {granularity}")
+
+
+def _period_start(key: int, granularity: str, origin: int, window_days: int) -> date:
+    """
+    期間のキー（CommitRollup._period_codes の値）から期間に含まれる日付を求める
+    """
+    if granularity == "month":
+        return date(1970 + key // 12, key % 12 + 1, 1)
+    if granularity == "window":
+        return EPOCH + timedelta(days=origin + key * window_days)
+    return EPOCH + timedelta(days=key)
+
+
+class CommitRollup:
+    """
+    コミットデータをリポジトリ・作成者・日付の列に変換し、複数の粒度でまとめて集計するクラス
+
+    add で受け取るたびに文字列の列を整数のコードに変換して保持するため、個別のコミットデータ
+    （辞書）を保持せずに集約できる。numpy がインストールされている場合は日付の解析・期間の計算・
+    集計を配列に対するベクトル演算で行い、ない場合は同じ結果を重複のない日付ごとの計算と
+    Counter で求める。集計結果は列ごとのリストで返す。
+    """
+
+    def __init__(self, commits: Iterable[Dict[str, Any]] = ()):
+        """
+        コミットデータを列に変換
+
+        Args:
+            commits: repository / author / date（YYYY-MM-DD）と、任意で count を持つ辞書
+                （個別のコミットデータでも集計済みのデータでもよい）
+        """
+        self.size = 0
+        self.total = 0
+        # 文字列の列は値 -> 出現順のコードの辞書とコードの列で保持する（numpy の場合、日付と件数は
+        # add ごとの配列で保持する）
+        self._index: Dict[str, Dict[str, int]] = {"repository": {}, "author": {}, "date": {}}
+        self._codes: Dict[str, List[int]] = {"repository": [], "author": [], "date": []}
+        self._day_chunks: List[Any] = []
+        self._count_chunks: List[Any] = []
+        self._counts: List[int] = []
+        self._encoded = False
+        self.add(commits)
+
+    def add(self, commits: Iterable[Dict[str, Any]]) -> None:
+        """
+        コミットデータを追加
+
+        Args:
+            commits: repository / author / date と、任意で count を持つ辞書
+        """
+        commits = commits if isinstance(commits, list) else list(commits)
+        if not commits:
+            return
+
+        repositories = [commit['repository'] for commit in commits]
+        authors = [commit['author'] for commit in commits]
+        days = [commit['date'] for commit in commits]
+        counts = [commit.get('count', 1) for commit in commits]
+
+        # 文字列の列は辞書で整数のコードに変換する（種類の少ない列では文字列の配列をソートするより速い）
+        columns = [("repository", repositories), ("author", authors)]
+        if NUMPY_AVAILABLE:
+            self._day_chunks.append(np.array(days, dtype='datetime64[D]').astype(np.int64))
+            self._count_chunks.append(np.array(counts, dtype=np.int64))
+        else:
+            columns.append(("date", days))
+            self._counts += counts
+        for name, values in columns:
+            index = self._index[name]
+            self._codes[name] += [index.setdefault(value, len(index)) for value in values]
+
+        self.size += len(commits)
+        self.total += sum(counts)
+        self._encoded = False
+
+    def _encode(self) -> None:
+        """
+        追加されたコミットデータの列を、ソート済みの重複のない値とそのインデックスの列にまとめる
+        """
+        if self._encoded:
+            return
+
+        self.repositories, self._repository_codes = self._sort_codes("repository")
+        self.authors, self._author_codes = self._sort_codes("author")
+        if NUMPY_AVAILABLE:
+            empty = np.zeros(0, dtype=np.int64)
+            self._day_numbers = np.concatenate(self._day_chunks) if self.size else empty
+            self._count_column = np.concatenate(self._count_chunks) if self.size else empty
+        else:
+            days, self._date_codes = self._sort_codes("date")
+            # 日付は重複のないものだけ解析する
+            self._unique_day_numbers = [(date.fromisoformat(day) - EPOCH).days for day in days]
+            self._count_column = self._counts
+        self._encoded = True
+
+    def _sort_codes(self, name: str) -> Tuple[List[str], Sequence[int]]:
+        """
+        出現順に振ったコードを、ソート済みの重複のない値のインデックスに付け替える
+        """
+        index = self._index[name]
+        uniques = sorted(index)
+        remap = [0] * len(uniques)
+        for position, value in enumerate(uniques):
+            remap[index[value]] = position
+        return uniques, self._take_codes(remap, self._codes[name])
+
+    def _first_day(self) -> int:
+        """
+        最も古い日付（基準日からの日数）
+        """
+        if NUMPY_AVAILABLE:
+            return int(self._day_numbers.min())
+        return min(self._unique_day_numbers)
+
+    def _period_codes(self, granularity: str, origin: int, window_days: int) -> Tuple[List[int], Sequence[int]]:
+        """
+        各行の期間のコードと、コードに対応する期間のキー（期間の順に並ぶ整数）
+
+        キーは日・週では期間の最初の日、月では1970年1月からの月数、任意の日数では origin からの
+        期間の番号。
+
+        Args:
+            granularity: "day" / "week" / "month" / "window"
+            origin: granularity が "window" の場合の最初の期間の開始日（基準日からの日数）
+            window_days: granularity が "window" の場合の期間の日数
+
+        Returns:
+            (昇順の期間のキー, 各行の期間のコード)
+        """
+        if granularity not in GRANULARITIES + ("window",):
+            raise ValueError(f"不明な集計の粒度です: {granularity}")
+
+        if NUMPY_AVAILABLE:
+            days = self._day_numbers
+            if granularity == "week":
+                # 基準日は木曜日のため、(日数 + 3) % 7 が月曜日からの日数になる
+                keys = days - (days + 3) % 7
+            elif granularity == "month":
+                keys = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+            elif granularity == "window":
+                keys = (days - origin) // window_days
+            else:
+                keys = days
+            # キーの範囲は狭いため、ソートせずに出現したキーを数えて連番のコードを振る
+            lowest = keys.min()
+            present = np.bincount(keys - lowest) > 0
+            codes = (np.cumsum(present) - 1)[keys - lowest]
+            return (np.flatnonzero(present) + lowest).tolist(), codes
+
+        keys_by_day = []
+        for number in self._unique_day_numbers:
+            if granularity == "week":
+                key = number - (number + 3) % 7
+            elif granularity == "month":
+                day = EPOCH + timedelta(days=number)
+                key = (day.year - 1970) * 12 + day.month - 1
+            elif granularity == "window":
+                key = (number - origin) // window_days
+            else:
+                key = number
+            keys_by_day.append(key)
+        # 期間は重複のない日付ごとに求め、行ごとにはコードを引くだけにする
+        keys = sorted(set(keys_by_day))
+        index = {key: position for position, key in enumerate(keys)}
+        code_by_day = [index[key] for key in keys_by_day]
+        return keys, [code_by_day[code] for code in self._date_codes]
+
+    @staticmethod
+    def _take(values: List[str], codes: Sequence[int]) -> List[str]:
+        """
+        コードの列を値の列に変換
+        """
+        if NUMPY_AVAILABLE:
+            return np.asarray(values, dtype=object)[codes].tolist() if len(codes) else []
+        return [values[code] for code in codes]
+
+    @staticmethod
+    def _take_codes(remap: List[int], codes: Sequence[int]) -> Sequence[int]:
+        """
+        コードの列を別のコードに付け替える
+        """
+        if NUMPY_AVAILABLE:
+            return np.asarray(remap, dtype=np.int64)[np.asarray(codes, dtype=np.int64)]
+        return [remap[code] for code in codes]
+
+    def _group(self, columns: List[Sequence[int]], sizes: List[int]) -> Tuple[List[Sequence[int]], List[int]]:
+        """
+        コードの列の組ごとに件数を合計
+
+        列の組は1つの整数のキーにまとめて集計するため、結果はコードの昇順（最初の列から順に
+        比較した順）になる。
+
+        Args:
+            columns: コードの列のリスト
+            sizes: 各列のコードの種類数
+
+        Returns:
+            (組ごとの各列のコードの列, 組ごとの合計件数)
+        """
+        if not self.size:
+            return [[] for _ in columns], []
+
+        if NUMPY_AVAILABLE:
+            keys = np.asarray(columns[0], dtype=np.int64)
+            for column, size in zip(columns[1:], sizes[1:]):
+                keys = keys * size + column
+            uniques, inverse = np.unique(keys, return_inverse=True)
+            sums = np.bincount(inverse.ravel(), weights=self._count_column, minlength=len(uniques))
+            decoded = []
+            for size in reversed(sizes):
+                uniques, remainder = np.divmod(uniques, size)
+                decoded.append(remainder)
+            return decoded[::-1], sums.astype(np.int64).tolist()
+
+        keys = columns[0]
+        for column, size in zip(columns[1:], sizes[1:]):
+            keys = [key * size + code for key, code in zip(keys, column)]
+        if self.total == self.size:
+            totals = Counter(keys)
+        else:
+            totals = Counter()
+            for key, count in zip(keys, self._count_column):
+                totals[key] += count
+        ordered = sorted(totals)
+        decoded = []
+        remaining = ordered
+        for size in reversed(sizes):
+            decoded.append([key % size for key in remaining])
+            remaining = [key // size for key in remaining]
+        return decoded[::-1], [totals[key] for key in ordered]
+
+    def rollup(
+        self,
+        granularity: str = "day",
+        window_days: Optional[int] = None,
+        origin: Optional[str] = None,
+        repository_order: Optional[List[str]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        リポジトリ・作成者・期間ごとの件数
+
+        Args:
+            granularity: "day" / "week" / "month" / "window"
+            window_days: granularity が "window" の場合の期間の日数
+            origin: granularity が "window" の場合の最初の期間の開始日（YYYY-MM-DD形式、
+                Noneの場合は最も古い日付）
+            repository_order: リポジトリの並び順（含まれないリポジトリは最後に名前順で並ぶ。
+                Noneの場合は名前順）
+
+        Returns:
+            repository / author / period / count の列（リポジトリ、作成者、期間の順にソート）
+        """
+        if granularity == "window" and not window_days:
+            raise ValueError("window の集計には window_days が必要です")
+
+        self._encode()
+        columns: Dict[str, List[Any]] = {'repository': [], 'author': [], 'period': [], 'count': []}
+        if not self.size:
+            return columns
+
+        origin_number = 0
+        if granularity == "window":
+            origin_number = (date.fromisoformat(origin) - EPOCH).days if origin else self._first_day()
+
+        window_days = window_days or 1
+        period_keys, period_codes = self._period_codes(granularity, origin_number, window_days)
+        # ラベルは重複のない期間についてのみ作る
+        origin_date = EPOCH + timedelta(days=origin_number)
+        periods = [
+            period_label(_period_start(key, granularity, origin_number, window_days), granularity, origin_date, window_days)
+            for key in period_keys
+        ]
+
+        repositories, repository_codes = self.repositories, self._repository_codes
+        if repository_order is not None:
+            position = {name: index for index, name in enumerate(repository_order)}
+            repositories = sorted(repositories, key=lambda name: (position.get(name, len(repository_order)), name))
+            rank = {name: index for index, name in enumerate(repositories)}
+            repository_codes = self._take_codes([rank[name] for name in self.repositories], repository_codes)
+
+        (repository_list, author_list, period_list), counts = self._group(
+            [repository_codes, self._author_codes, period_codes],
+            [len(repositories), len(self.authors), len(periods)]
+        )
+        columns['repository'] = self._take(repositories, repository_list)
+        columns['author'] = self._take(self.authors, author_list)
+        columns['period'] = self._take(periods, period_list)
+        columns['count'] = counts
+        return columns
+
+    def aggregate(self, repository_order: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Repository, Author, Date 別の件数（aggregated_commits.json とスプレッドシートの形式）
+
+        Args:
+            repository_order: リポジトリの並び順（並列実行でリポジトリの完了順が変わっても出力を
+                同じにするために使う。リポジトリ内は作成者、日付の順）
+
+        Returns:
+            repository / author / date / count を持つ辞書のリスト
+        """
+        columns = self.rollup("day", repository_order=repository_order)
+        return [
+            {'repository': repository, 'author': author, 'date': day, 'count': count}
+            for repository, author, day, count in zip(
+                columns['repository'], columns['author'], columns['period'], columns['count']
+            )
+        ]
+
+    def totals(self, by: str) -> Dict[str, List[Any]]:
+        """
+        作成者別またはリポジトリ別の合計件数
+
+        Args:
+            by: "author" または "repository"
+
+        Returns:
+            by と count の列（件数の多い順、同数の場合は名前順）
+        """
+        self._encode()
+        if by == "author":
+            names, codes = self.authors, self._author_codes
+        elif by == "repository":
+            names, codes = self.repositories, self._repository_codes
+        else:
+            raise ValueError(f"不明な集計の単位です: {by}")
+
+        (code_list,), counts = self._group([codes], [len(names)])
+        order = sorted(range(len(counts)), key=lambda position: -counts[position])
+        return {
+            by: [names[code_list[position]] for position in order],
+            'count': [counts[position] for position in order],
+        }
+
+    def rollups(
+        self,
+        granularities: Sequence[str] = GRANULARITIES,
+        window_days: Optional[int] = None,
+        origin: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        複数の粒度の集計と、作成者別・リポジトリ別の合計をまとめて作成
+
+        Args:
+            granularities: 集計する粒度（"day" / "week" / "month"）
+            window_days: 指定した場合は、この日数ごとの集計も "window_<N>d" として加える
+            origin: window_days の最初の期間の開始日（YYYY-MM-DD形式）
+
+        Returns:
+            粒度 -> 集計結果の列、"authors" / "repositories" -> 合計の列 の辞書
+        """
+        result: Dict[str, Any] = {
+            granularity: self.rollup(granularity) for granularity in granularities
+        }
+        if window_days:
+            result[f"window_{window_days}d"] = self.rollup("window", window_days, origin)
+        result["authors"] = self.totals("author")
+        result["repositories"] = self.totals("repository")
+        return result
+
+
+def main() -> int:
+    """
+    メイン関数（保存済みの集計データから多粒度の集計を作る）
+
+    Returns:
+        終了コード（0: 成功, 1: 失敗）
+    """
+    parser = argparse.ArgumentParser(description='集計済みのコミットデータから日・週・月などの集計を作る')
+    parser.add_argument('input', help='aggregated_commits.json、または保存済みのコミットデータ（.jsonl）')
+    parser.add_argument('--window-days', type=int, help='この日数ごとの集計も作る')
+    parser.add_argument('--origin', help='--window-days の最初の期間の開始日（YYYY-MM-DD形式）')
+    parser.add_argument('--output', help='出力ファイル（指定しない場合は入力と同じディレクトリの rollups.json）')
+
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"エラー: {input_path} が見つかりません")
+        return 1
+
+    with open(input_path, 'r', encoding='utf-8') as f:
+        if input_path.suffix == '.jsonl':
+            commits = [json.loads(line) for line in f if line.strip()]
+        else:
+            commits = json.load(f)
+
+    rollup = CommitRollup(commits)
+    result = rollup.rollups(window_days=args.window_days, origin=args.origin)
+
+    output_path = Path(args.output) if args.output else input_path.with_name("rollups.json")
+    write_json_file(result, output_path)
+    print(f"{rollup.size}件のデータを集計して {output_path} に保存しました")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
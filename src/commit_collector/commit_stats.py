@@ -1,143 +1,451 @@
 """
 GitHubコミット統計収集モジュール
 """
-import json
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from ..utils.checkpoint import Checkpoint
 from ..utils.config import Config
-from ..utils.file_utils import ensure_dir, write_json_file
+from ..utils.console import capture_output
+from ..utils.file_utils import append_json_lines, ensure_dir, read_json_lines, write_json_file
+from ..utils.github_client import GitHubAPIError, GitHubClient, get_client, to_github_datetime
+from ..utils.rate_limiter import PRIORITY_LOW
+from ..utils.repo_metadata import fetch_repo_metadata
 from ..utils.sheets_client import SheetsClient
 from ..utils.user_mapping import map_username
+from .commit_cache import DEFAULT_BRANCH, CommitCache
+from .commit_rollup import CommitRollup
+from .git_mirror import DEFAULT_MIRROR_URL, GitMirror, GitMirrorError
 
 
-def get_github_token() -> Optional[str]:
+def list_team_mirai_repos(
+    since_date: Optional[str] = None,
+    timezone_str: str = "UTC"
+) -> Dict[str, Dict[str, Optional[str]]]:
     """
-    GitHub CLIからトークンを取得
+    team-mirai-volunteer組織の全パブリックリポジトリを最後にpushされた日時・デフォルトブランチとともに取得
+    
+    最後にpushされた日時の降順に全ページを取得し、since_date 以降にpushされていない
+    リポジトリ（コミットが増えていないもの）に達した時点で打ち切る。
+    
+    Args:
+        since_date: この日付以降にpushのないリポジトリを除外する（YYYY-MM-DD形式、Noneの場合は除外しない）
+        timezone_str: タイムゾーン
     
     Returns:
-        GitHubトークン
+        リポジトリ名 -> {pushedAt, defaultBranch}（pushedの降順、fetch_repo_metadata と同じキー）
     """
+    client = get_client()
+    if client is None:
+        return {}
+    
+    since_iso = None
+    if since_date:
+        tz = timezone.utc if timezone_str == "UTC" else timezone(timedelta(hours=9))
+        since_iso = to_github_datetime(datetime.fromisoformat(since_date).replace(tzinfo=tz))
+    
+    repos: Dict[str, Dict[str, Optional[str]]] = {}
+    archived = forks = 0
+    reached_dormant = False
+    
     try:
-        result = subprocess.run(['gh', 'auth', 'token'], capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError:
-        print("GitHub CLIでの認証が必要です。'gh auth login' を実行してください。")
-        return None
+        pages = client.rest_pages(
+            'orgs/team-mirai-volunteer/repos',
+            params={'type': 'public', 'sort': 'pushed', 'direction': 'desc', 'per_page': 100},
+            priority=PRIORITY_LOW
+        )
+        for page in pages:
+            for repo in page:
+                pushed_at = repo.get('pushed_at')
+                if not pushed_at:
+                    # 一度もpushされていない空のリポジトリ
+                    continue
+                if since_iso and pushed_at < since_iso:
+                    reached_dormant = True
+                    break
+                repos[f"team-mirai-volunteer/{repo['name']}"] = {
+                    "pushedAt": pushed_at,
+                    "defaultBranch": repo.get('default_branch'),
+                }
+                archived += 1 if repo.get('archived') else 0
+                forks += 1 if repo.get('fork') else 0
+            if reached_dormant:
+                break
+    except GitHubAPIError as e:
+        print(f"リポジトリ一覧の取得に失敗しました: {e}")
+        return {}
+    
+    print(f"取得したリポジトリ数: {len(repos)}（うちアーカイブ済み: {archived}件, フォーク: {forks}件）")
+    if reached_dormant:
+        print(f"{since_date}以降にpushされていないリポジトリは対象外にしました")
+    
+    return repos
 
 
-def get_team_mirai_repos() -> List[str]:
+def get_team_mirai_repos(since_date: Optional[str] = None, timezone_str: str = "UTC") -> List[str]:
     """
     team-mirai-volunteer組織の全パブリックリポジトリを取得
     
+    Args:
+        since_date: この日付以降にpushのないリポジトリを除外する（YYYY-MM-DD形式、Noneの場合は除外しない）
+        timezone_str: タイムゾーン
+    
     Returns:
         リポジトリ名のリスト
     """
-    try:
-        cmd = [
-            'gh', 'repo', 'list', 'team-mirai-volunteer',
-            '--visibility=public', '--limit', '100',
-            '--json', 'name'
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        repos_data = json.loads(result.stdout)
-        
-        repos = [f"team-mirai-volunteer/{repo['name']}" for repo in repos_data]
-        print(f"取得したリポジトリ数: {len(repos)}")
-        
-        return repos
+    return list(list_team_mirai_repos(since_date, timezone_str))
+
+
+def commit_window(
+    since_date: str,
+    until_date: Optional[str] = None,
+    timezone_str: str = "UTC"
+) -> Tuple[str, Optional[str]]:
+    """
+    コミットの取得期間をGitHub APIの日時形式に変換
+    
+    Args:
+        since_date: 開始日（YYYY-MM-DD形式）
+        until_date: 終了日（YYYY-MM-DD形式、この日を含む。Noneの場合は現在まで）
+        timezone_str: タイムゾーン
         
-    except subprocess.CalledProcessError as e:
-        print(f"リポジトリ一覧の取得に失敗しました: {e}")
-        return []
-    except json.JSONDecodeError as e:
-        print(f"JSONの解析に失敗しました: {e}")
-        return []
+    Returns:
+        (開始日時, 終了日時) のタプル（終了日時は終了日の最後の秒、指定がない場合はNone）
+    """
+    tz = timezone.utc if timezone_str == "UTC" else timezone(timedelta(hours=9))
+    since_iso = to_github_datetime(datetime.fromisoformat(since_date).replace(tzinfo=tz))
+    until_iso = None
+    if until_date:
+        until_end = datetime.fromisoformat(until_date).replace(tzinfo=tz) + timedelta(days=1, seconds=-1)
+        until_iso = to_github_datetime(until_end)
+    return since_iso, until_iso
 
 
 def extract_commit_data(
     repo: str,
     since_date: str = "2025-05-01",
-    timezone_str: str = "UTC"
+    timezone_str: str = "UTC",
+    checkpoint: Optional[Checkpoint] = None,
+    cache: Optional[CommitCache] = None,
+    pushed_at: Optional[str] = None,
+    until_date: Optional[str] = None,
+    branch: Optional[str] = None,
+    default_branch: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     指定されたリポジトリからコミットデータを抽出
     
+    期間は since / until パラメータとしてAPIに渡し、期間内のコミットのみを取得する。
+    コミットは新しい順に返されるため、期間内のコミットが1件もないページに達した時点で
+    以降のページは取得しない（期間で絞り込まれない場合でも古い履歴を辿らない）。
+    キャッシュの台帳に同じ条件で取り込み済みのSHAがある場合は、そのSHAとブランチの先頭を
+    比較して、先頭からは辿れるがそのSHAからは辿れないコミット（マージしたブランチの
+    古い日時のコミットを含む）だけを保存済みのデータに追加する。
+    作成者名は取得したままの名前で途中結果・キャッシュに保存し、返すときにマッピングする。
+    
     Args:
         repo: リポジトリ名（owner/repo形式）
-        days: 過去何日分を取得するか
+        since_date: 開始日（YYYY-MM-DD形式）
         timezone_str: タイムゾーン
+        checkpoint: ページごとの進捗と途中結果を記録するチェックポイント（再開時は完了済みの
+            リポジトリの途中結果を返し、中断したリポジトリは次のページから続きを取得する）
+        cache: 前回のコミットデータのキャッシュ（pushed_at が前回と同じであれば取得せずに使い、
+            変わっていれば台帳のSHAより新しいコミットだけを取得する）
+        pushed_at: リポジトリの現在の pushedAt
+        until_date: 終了日（YYYY-MM-DD形式、この日を含む。Noneの場合は現在まで）
+        branch: ブランチ名（Noneの場合はデフォルトブランチ）
+        default_branch: リポジトリのデフォルトブランチ名（比較APIと台帳に使う。わからない場合は
+            台帳を使わずに期間全体を取得する）
         
     Returns:
         コミットデータのリスト
     """
-    token = get_github_token()
-    if not token:
+    commits = []
+    resume_url = None
+    # 保存データはデフォルトブランチを名前によらず同じキーにし、台帳と比較には実際のブランチ名を使う
+    branch_key = DEFAULT_BRANCH if branch is None or branch == default_branch else branch
+    ref = branch or default_branch
+    
+    if checkpoint is not None:
+        entry = checkpoint.get(repo)
+        data_path = checkpoint.data_path(repo)
+        if entry.get("status") == "done" and entry.get("last_seen") and cache is not None:
+            # 途中結果は追加した分だけのため、追加後の保存済みデータを使う
+            commits = cache.read(repo, branch_key)
+            print(f"リポジトリ {repo} はチェックポイントで完了済みのためスキップします（{len(commits)}件）")
+            return _map_authors(commits)
+        if entry.get("status") == "done" and data_path.exists():
+            commits = read_json_lines(data_path)
+            print(f"リポジトリ {repo} はチェックポイントで完了済みのためスキップします（{len(commits)}件）")
+            return _map_authors(commits)
+    
+    if cache is not None:
+        cached = cache.load(repo, since_date, timezone_str, pushed_at, until_date, branch_key)
+        if cached is not None:
+            print(f"リポジトリ {repo} は前回の取得からpushがないため、キャッシュを使います（{len(cached)}件）")
+            if checkpoint is not None:
+                checkpoint.update(repo, status="done")
+            return _map_authors(cached)
+    
+    last_seen = None
+    if cache is not None and until_date is None and ref:
+        last_seen = cache.last_seen(repo, branch_key, since_date, timezone_str, ref)
+    head = None
+    
+    if checkpoint is not None:
+        if entry.get("status") == "in_progress" and entry.get("next_url") and data_path.exists():
+            # ページを辿るのは期間全体を取得する場合のみ
+            commits = read_json_lines(data_path)
+            resume_url = entry["next_url"]
+            last_seen = None
+            head = entry.get("head")
+            print(f"リポジトリ {repo} をチェックポイントから再開します（取得済み: {len(commits)}件）")
+        else:
+            checkpoint.reset(repo)
+            checkpoint.update(repo, status="in_progress", next_url=None, last_seen=last_seen)
+    
+    client = get_client()
+    if client is None:
         return []
     
-    tz = timezone.utc if timezone_str == "UTC" else timezone(timedelta(hours=9))
-    start_date = datetime.fromisoformat(since_date).replace(tzinfo=tz)
-    since_iso = start_date.isoformat()
+    since_iso, until_iso = commit_window(since_date, until_date, timezone_str)
+    
+    if last_seen:
+        print(f"リポジトリ {repo} から {last_seen[:7]} より新しいコミットを取得中... ({ref})")
+        try:
+            compared = compare_commits(client, repo, last_seen, ref, since_iso)
+        except GitHubAPIError as e:
+            if e.status_code != 404:
+                print(f"リポジトリ {repo} のコミットデータ取得に失敗しました: {e}")
+                return []
+            compared = None
+        
+        if compared is not None:
+            new_commits, head = compared
+            added = cache.append(repo, new_commits, branch_key, head, pushed_at, ref)
+            commits = cache.read(repo, branch_key)
+            print(f"リポジトリ {repo}: {added}件を保存済みのデータに追加しました（合計: {len(commits)}件）")
+            if checkpoint is not None:
+                checkpoint.update(repo, status="done")
+            return _map_authors(commits)
+        
+        # 履歴が書き換えられた場合など。期間全体を取得し直して置き換える
+        print(f"リポジトリ {repo}: {last_seen[:7]} からブランチの先頭を辿れないため、保存済みのデータを置き換えます")
+        last_seen = None
+        if checkpoint is not None:
+            checkpoint.update(repo, last_seen=None)
     
-    print(f"リポジトリ {repo} からコミットデータを取得中... ({since_date}以降)")
+    params = {"since": since_iso}
+    if until_iso:
+        params["until"] = until_iso
+    if branch:
+        params["sha"] = branch
     
+    period = f"{since_date}〜{until_date}" if until_date else f"{since_date}以降"
+    print(f"リポジトリ {repo} からコミットデータを取得中... ({period})")
+    
+    pages_fetched = 0
     try:
-        cmd = [
-            'gh', 'api', f'repos/{repo}/commits',
-            '--paginate',
-            '--jq', f'''
-            .[] | select(.commit.author.date >= "{since_iso}") | {{
-                sha: .sha,
-                author: .commit.author.name,
-                email: .commit.author.email,
-                date: .commit.author.date,
-                message: .commit.message,
-                url: .html_url
-            }}
-            '''
-        ]
+        # ページ本文は受信しながら1件ずつデコードし、集計用のデータに変換したものだけを残す
+        pages = client.rest_page_stream(
+            f'repos/{repo}/commits', params=params, priority=PRIORITY_LOW, start_url=resume_url
+        )
+        for page, next_url in pages:
+            pages_fetched += 1
+            page_commits = []
+            reached_window = False
+            for commit in page:
+                sha = commit.get('sha')
+                if head is None and resume_url is None:
+                    head = sha
+                
+                details = commit.get('commit') or {}
+                author = details.get('author') or {}
+                commit_date = author.get('date', '')
+                # 一覧の順序はコミット日時によるため、作成日時と両方で期間に達したかを判定する
+                committed_at = (details.get('committer') or {}).get('date', '')
+                if max(commit_date, committed_at) >= since_iso:
+                    reached_window = True
+                if commit_date < since_iso or (until_iso and commit_date > until_iso):
+                    continue
+                
+                page_commits.append(build_commit_record(
+                    repo, sha, author.get('name', 'unknown'), commit_date
+                ))
+            
+            if not reached_window:
+                next_url = None
+            
+            commits.extend(page_commits)
+            if checkpoint is not None:
+                append_json_lines(page_commits, checkpoint.data_path(repo))
+                # APIのベースURLが変わっても再開できるようにパスで記録する
+                if next_url and next_url.startswith(client.api_url):
+                    next_url = next_url[len(client.api_url):]
+                checkpoint.update(repo, next_url=next_url, head=head)
+            if next_url is None:
+                break
+    except GitHubAPIError as e:
+        print(f"リポジトリ {repo} のコミットデータ取得に失敗しました: {e}")
+        return []
+    
+    print(f"リポジトリ {repo}: {len(commits)}件のコミットを取得（{pages_fetched}ページ）")
+    
+    if cache is not None:
+        heads = {ref: head} if head and ref and until_date is None else None
+        cache.save(repo, commits, since_date, timezone_str, pushed_at, until_date, heads, branch_key)
+    if checkpoint is not None:
+        checkpoint.update(repo, status="done")
+    
+    return _map_authors(commits)
+
+
+def compare_commits(
+    client: GitHubClient,
+    repo: str,
+    base: str,
+    branch: str,
+    since_iso: str
+) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+    """
+    取り込み済みのSHAとブランチの先頭を比較し、先頭からのみ辿れるコミットを取得
+    
+    一覧APIと異なり日時の順序に依存しないため、取り込み済みのSHAより古い日時でマージされた
+    コミットも漏れない。比較結果は古い順に返され、per_page / page でページを辿る。
+    
+    Args:
+        client: GitHubクライアント
+        repo: リポジトリ名（owner/repo形式）
+        base: 取り込み済みの最新のコミットのSHA
+        branch: ブランチ名（デフォルトブランチの場合もその名前）
+        since_iso: 開始日時（これより前に作成されたコミットは除く）
         
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    Returns:
+        (新しい順のコミットデータのリスト, ブランチの先頭のSHA) のタプル
+        （base からブランチの先頭を辿れない場合はNone）
         
-        commits = []
-        for line in result.stdout.strip().split('\n'):
-            if line.strip():
-                try:
-                    commit_data = json.loads(line)
-                    
-                    commit_date = commit_data.get('date', '')
-                    if commit_date:
-                        try:
-                            dt = datetime.fromisoformat(commit_date.replace('Z', '+00:00'))
-                            formatted_date = dt.strftime('%Y-%m-%d')
-                        except ValueError:
-                            formatted_date = commit_date[:10] if len(commit_date) >= 10 else commit_date
-                    else:
-                        formatted_date = ''
-                    
-                    repo_name = repo.replace('team-mirai-volunteer/', '') if repo.startswith('team-mirai-volunteer/') else repo
-                    processed_commit = {
-                        'repository': repo_name,
-                        'author': map_username(commit_data.get('author', 'unknown')),
-                        'date': formatted_date,
-                        'count': 1
-                    }
-                    
-                    commits.append(processed_commit)
-                    
-                except json.JSONDecodeError:
-                    continue
+    Raises:
+        GitHubAPIError: 比較に失敗した場合（base が存在しない場合は404）
+    """
+    records: List[Dict[str, Any]] = []
+    head = base
+    page = 1
+    fetched = 0
+    while True:
+        result = client.rest(
+            f'repos/{repo}/compare/{base}...{branch}',
+            params={'per_page': 100, 'page': page},
+            priority=PRIORITY_LOW
+        )
+        if result.get('status') not in ('ahead', 'identical'):
+            # behind / diverged は base がブランチの履歴にない（履歴の書き換えなど）
+            return None
+        page_commits = result.get('commits') or []
+        for commit in page_commits:
+            head = commit.get('sha') or head
+            author = (commit.get('commit') or {}).get('author') or {}
+            commit_date = author.get('date', '')
+            if commit_date >= since_iso:
+                records.append(build_commit_record(repo, commit.get('sha'), author.get('name', 'unknown'), commit_date))
+        fetched += len(page_commits)
+        if not page_commits or fetched >= result.get('total_commits', 0):
+            break
+        page += 1
+    
+    records.reverse()
+    return records, head
+
+
+def extract_commit_data_from_mirror(
+    repo: str,
+    mirror: GitMirror,
+    since_date: str = "2025-05-01",
+    timezone_str: str = "UTC",
+    until_date: Optional[str] = None,
+    branch: Optional[str] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    リポジトリのベアミラーを更新し、git log からコミットデータを抽出
+    
+    Args:
+        repo: リポジトリ名（owner/repo形式）
+        mirror: ミラーの管理オブジェクト
+        since_date: 開始日（YYYY-MM-DD形式）
+        timezone_str: タイムゾーン
+        until_date: 終了日（YYYY-MM-DD形式、この日を含む。Noneの場合は現在まで）
+        branch: ブランチ名（Noneの場合はデフォルトブランチ）
         
-        print(f"リポジトリ {repo}: {len(commits)}件のコミットを取得")
-        return commits
+    Returns:
+        コミットデータのリスト（ミラーの更新・読み込みに失敗した場合はNone）
+    """
+    since_iso, until_iso = commit_window(since_date, until_date, timezone_str)
+    
+    try:
+        created = mirror.sync(repo)
+        print(f"リポジトリ {repo} のミラーを{'作成' if created else '更新'}しました")
+        commits = [
+            build_commit_record(repo, sha, author_name, commit_date)
+            for sha, author_name, commit_date in mirror.log(repo, since_iso, until_iso, branch)
+        ]
+    except GitMirrorError as e:
+        print(f"リポジトリ {repo} のミラーからコミットデータを取得できませんでした: {e}")
+        return None
+    
+    print(f"リポジトリ {repo}: {len(commits)}件のコミットを取得")
+    return _map_authors(commits)
+
+
+def build_commit_record(repo: str, sha: Optional[str], author_name: str, commit_date: str) -> Dict[str, Any]:
+    """
+    1件のコミットを集計用のデータに変換
+    
+    Args:
+        repo: リポジトリ名（owner/repo形式）
+        sha: コミットのSHA（Webhookとの重複排除に使う）
+        author_name: コミットの作成者名（マッピング前）
+        commit_date: コミット日時（ISO 8601形式）
         
-    except subprocess.CalledProcessError as e:
-        print(f"リポジトリ {repo} のコミットデータ取得に失敗しました: {e}")
-        return []
+    Returns:
+        コミットデータ（repository, author, date, count, sha）
+    """
+    repo_name = repository_name(repo)
+    
+    try:
+        dt = datetime.fromisoformat(commit_date.replace('Z', '+00:00'))
+        formatted_date = dt.astimezone(timezone.utc).strftime('%Y-%m-%d')
+    except ValueError:
+        formatted_date = commit_date[:10] if len(commit_date) >= 10 else commit_date
+    
+    return {
+        'repository': repo_name,
+        'author': author_name,
+        'date': formatted_date,
+        'count': 1,
+        'sha': sha
+    }
+
+
+def repository_name(repo: str) -> str:
+    """
+    集計データの Repository 列に使う名前（team-mirai-volunteer組織のリポジトリは組織名を省く）
+    
+    Args:
+        repo: リポジトリ名（owner/repo形式）
+        
+    Returns:
+        リポジトリの表示名
+    """
+    return repo.replace('team-mirai-volunteer/', '') if repo.startswith('team-mirai-volunteer/') else repo
+
+
+def _map_authors(commits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    コミットデータの作成者名をマッピング後の名前にする
+    """
+    return [dict(commit, author=map_username(commit['author'])) for commit in commits]
 
 
 def aggregate_commit_data(commits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -148,52 +456,111 @@ def aggregate_commit_data(commits: List[Dict[str, Any]]) -> List[Dict[str, Any]]
         commits: 個別コミットデータのリスト
         
     Returns:
-        集約されたコミットデータ
+        集約されたコミットデータ（リポジトリ、作成者、日付の順）
+    """
+    return CommitRollup(commits).aggregate()
+
+
+def extract_repos(
+    repos: List[str],
+    extract: Callable[[str], Optional[List[Dict[str, Any]]]],
+    jobs: int = 1
+) -> Iterator[Tuple[str, Optional[List[Dict[str, Any]]]]]:
     """
-    aggregated = {}
+    リポジトリごとにコミットデータを抽出し、完了したものから順に返す（jobs > 1 の場合は並列実行）
     
-    for commit in commits:
-        key = (commit['repository'], commit['author'], commit['date'])
-        if key in aggregated:
-            aggregated[key]['count'] += 1
-        else:
-            aggregated[key] = {
-                'repository': commit['repository'],
-                'author': commit['author'],
-                'date': commit['date'],
-                'count': 1
-            }
-    
-    return list(aggregated.values())
+    1つのリポジトリで例外が発生しても他のリポジトリの処理は続ける。並列実行時の
+    コンソール出力はリポジトリごとにまとめ、完了した時点で表示する。
+    
+    Args:
+        repos: リポジトリ名のリスト
+        extract: リポジトリ名を受け取ってコミットデータを返す関数（失敗した場合はNone）
+        jobs: 同時に処理するリポジトリ数
+        
+    Returns:
+        (リポジトリ名, コミットデータ) のイテレータ（例外が発生した場合のコミットデータはNone）
+    """
+    def run(repo: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            return extract(repo)
+        except Exception as e:
+            print(f"リポジトリ {repo} の処理中にエラーが発生しました: {e}")
+            return None
+    
+    if jobs <= 1 or len(repos) <= 1:
+        for repo in repos:
+            yield repo, run(repo)
+        return
+    
+    def run_captured(repo: str) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+        with capture_output() as buffer:
+            commits = run(repo)
+        return commits, buffer.getvalue()
+    
+    print(f"{len(repos)}件のリポジトリを最大{jobs}並列で取得します")
+    
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(run_captured, repo): repo for repo in repos}
+        for future in as_completed(futures):
+            commits, output = future.result()
+            print(output, end="")
+            yield futures[future], commits
 
 
 def collect_all_commit_data(
     repos: Optional[List[str]] = None,
     since_date: str = "2025-05-01",
     timezone_str: str = "UTC",
-    output_dir: str = "./data"
-) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    output_dir: str = "./data",
+    resume: bool = False,
+    from_store: bool = False,
+    until_date: Optional[str] = None,
+    branch: Optional[str] = None,
+    backend: str = "api",
+    mirror_url: str = DEFAULT_MIRROR_URL,
+    jobs: int = 1,
+    window_days: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str], List[str]]:
     """
     全リポジトリからコミットデータを収集
     
     Args:
         repos: リポジトリのリスト（Noneの場合は全パブリックリポジトリ）
-        days: 過去何日分を取得するか
+        since_date: 開始日（YYYY-MM-DD形式）
         timezone_str: タイムゾーン
         output_dir: 出力ディレクトリ
+        resume: 中断した前回の実行をチェックポイントから再開するか
+        from_store: APIを呼ばず、保存済みのコミットデータ（Webhookで追加したものを含む）から集計するか
+        until_date: 終了日（YYYY-MM-DD形式、この日を含む。Noneの場合は現在まで）
+        branch: 取得するブランチ（Noneの場合は各リポジトリのデフォルトブランチ）
+        backend: コミットの取得方法（"api": REST API, "git": ローカルのベアミラーの git log）
+        mirror_url: backend が "git" の場合のミラー元URLのテンプレート
+        jobs: 同時に取得するリポジトリ数（リポジトリごとの結果は完了した時点で集約する）
+        window_days: 指定した場合は、開始日からこの日数ごとの集計も rollups.json に加える
         
     Returns:
-        集約されたコミットデータとJSONファイルパス
+        集約されたコミットデータ、JSONファイルパス、取得に失敗したリポジトリのリスト
     """
-    if repos is None:
-        repos = get_team_mirai_repos()
+    cache = CommitCache(Path(output_dir) / "state")
+    client = None if from_store or backend == "git" else get_client(pool_size=max(10, jobs))
+    
+    metadata: Dict[str, Dict[str, Optional[str]]] = {}
+    if from_store:
+        repos = repos or cache.repos()
+    elif repos is None:
+        metadata = list_team_mirai_repos(since_date, timezone_str)
+        repos = list(metadata)
+    elif client is not None:
+        metadata = fetch_repo_metadata(client, repos, priority=PRIORITY_LOW)
+    pushed_at = {repo: values.get("pushedAt") for repo, values in metadata.items()}
+    default_branches = {repo: values.get("defaultBranch") for repo, values in metadata.items()}
     
     if not repos:
         print("処理対象のリポジトリがありません")
-        return [], None
+        return [], None, []
     
     tz = timezone.utc if timezone_str == "UTC" else timezone(timedelta(hours=9))
-    end_date = datetime.now(tz)
+    end_date = datetime.fromisoformat(until_date).replace(tzinfo=tz) if until_date else datetime.now(tz)
     start_date = datetime.fromisoformat(since_date).replace(tzinfo=tz)
     
     date_range_dir = f"{start_date.date().isoformat()}_to_{end_date.date().isoformat()}"
@@ -202,38 +569,91 @@ def collect_all_commit_data(
     commit_raw_dir = output_path / "raw" / "commits"
     ensure_dir(commit_raw_dir)
     
-    all_commits = []
+    # リポジトリごとに取得したコミットデータをその場で列に変換し、個別のコミットデータは保持しない
+    rollup = CommitRollup()
+    failed_repos: List[str] = []
     
-    for repo in repos:
-        repo_commits = extract_commit_data(repo, since_date, timezone_str)
-        all_commits.extend(repo_commits)
+    if from_store:
+        print(f"{len(repos)}件のリポジトリの保存済みコミットデータから集計します（APIは呼びません）")
+        for repo in repos:
+            stored = [
+                commit for commit in cache.read(repo, branch or DEFAULT_BRANCH)
+                if commit.get('date', '') >= since_date and (not until_date or commit.get('date', '') <= until_date)
+            ]
+            rollup.add(_map_authors(stored))
+    elif backend == "git":
+        mirror = GitMirror(Path(output_dir) / "state" / "mirrors", mirror_url)
+        print(f"{len(repos)}件のリポジトリのコミットをローカルのミラー（{mirror.cache_dir}）から集計します")
+        
+        def extract_from_mirror(repo: str) -> Optional[List[Dict[str, Any]]]:
+            return extract_commit_data_from_mirror(repo, mirror, since_date, timezone_str, until_date, branch)
+        
+        for repo, commits in extract_repos(repos, extract_from_mirror, jobs):
+            if commits is None:
+                failed_repos.append(repo)
+            else:
+                rollup.add(commits)
+        failed_repos.sort(key=repos.index)
+        if failed_repos:
+            print(f"{len(failed_repos)}件のリポジトリの取得に失敗しました: {failed_repos}")
+    else:
+        checkpoint = Checkpoint(
+            Path(output_dir) / "state" / "commit_checkpoint.json",
+            run={"since_date": since_date, "until_date": until_date, "timezone": timezone_str, "branch": branch},
+            resume=resume
+        )
+        checkpoint.announce_resume(repos)
+        
+        def extract_from_api(repo: str) -> List[Dict[str, Any]]:
+            return extract_commit_data(
+                repo, since_date, timezone_str, checkpoint=checkpoint, cache=cache, pushed_at=pushed_at.get(repo),
+                until_date=until_date, branch=branch, default_branch=default_branches.get(repo)
+            )
+        
+        for _, commits in extract_repos(repos, extract_from_api, jobs):
+            rollup.add(commits or [])
+        
+        failed_repos = [repo for repo in repos if not checkpoint.is_done(repo)]
+        if failed_repos:
+            print(f"{len(failed_repos)}件のリポジトリの取得に失敗しました: {failed_repos}")
+            print("--resume を付けて再実行すると、完了済みのリポジトリをスキップして続きから取得します")
+        else:
+            checkpoint.clear()
     
-    if all_commits:
-        aggregated_commits = aggregate_commit_data(all_commits)
+    if rollup.total:
+        aggregated_commits = rollup.aggregate(repository_order=[repository_name(repo) for repo in repos])
         
         commit_file = commit_raw_dir / "aggregated_commits.json"
         write_json_file(aggregated_commits, commit_file)
         
-        print(f"全{len(all_commits)}件のコミットを{len(aggregated_commits)}件に集約して {commit_file} に保存しました")
+        print(f"全{rollup.total}件のコミットを{len(aggregated_commits)}件に集約して {commit_file} に保存しました")
+        
+        # 日別の集約と同じ列から週・月などの集計を作る
+        rollup_file = commit_raw_dir / "rollups.json"
+        rollups = rollup.rollups(window_days=window_days, origin=since_date)
+        write_json_file(rollups, rollup_file)
+        print(f"日・週・月別の集計を {rollup_file} に保存しました")
         
         summary = {
-            "total_commits": len(all_commits),
+            "total_commits": rollup.total,
             "aggregated_commits": len(aggregated_commits),
             "repositories_count": len(repos),
             "period": {
                 "start": start_date.date().isoformat(),
                 "end": end_date.date().isoformat(),
-                "since_date": since_date
+                "since_date": since_date,
+                "until_date": until_date
             },
-            "repositories": repos
+            "repositories": repos,
+            "failed_repositories": failed_repos
         }
         
         summary_file = commit_raw_dir / "summary.json"
         write_json_file([summary], summary_file)
         
-        return aggregated_commits, str(commit_file)
+        return aggregated_commits, str(commit_file), failed_repos
     
-    return [], None
+    return [], None, failed_repos
 
 
 def upload_to_sheets(
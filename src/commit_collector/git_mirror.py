@@ -0,0 +1,143 @@
+"""
+リポジトリのベアミラーからコミットデータを抽出するモジュール
+"""
+import os
+import shutil
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from ..utils.file_utils import ensure_dir
+from ..utils.github_client import to_github_datetime
+
+# ミラー元URLの既定のテンプレート（{repo} は owner/repo、{owner} / {name} はその各部分）
+DEFAULT_MIRROR_URL = "https://github.com/{repo}.git"
+
+# git log の1行の形式（SHA、作成者名、作成日時をNUL区切り）
+LOG_FORMAT = "%H%x00%an%x00%aI"
+
+
+class GitMirrorError(Exception):
+    """ミラーの作成・更新・読み込みに失敗した場合の例外"""
+    pass
+
+
+class GitMirror:
+    """
+    リポジトリを `git clone --mirror` で複製しておき、`git fetch` で差分だけ更新するクラス
+
+    コミットの一覧はミラーの `git log` から作るため、履歴の長さに関係なくリポジトリ
+    あたりのネットワークアクセスは1回の fetch で済み、APIのレート制限も消費しない。
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], url_template: str = DEFAULT_MIRROR_URL):
+        """
+        ミラーの管理を初期化
+
+        Args:
+            cache_dir: ミラーを置くディレクトリ
+            url_template: ミラー元URLのテンプレート（ローカルのリポジトリのパスも指定できる）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.url_template = url_template
+
+    def url(self, repo: str) -> str:
+        """
+        リポジトリのミラー元URL
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+
+        Returns:
+            URLまたはパス
+        """
+        owner, name = repo.split("/", 1)
+        return self.url_template.format(repo=repo, owner=owner, name=name)
+
+    def path(self, repo: str) -> Path:
+        """
+        リポジトリのミラーのパス
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+
+        Returns:
+            ミラーのディレクトリ
+        """
+        return self.cache_dir / f"{repo.replace('/', '__')}.git"
+
+    def _git(self, args: List[str], cwd: Optional[Path] = None) -> str:
+        """
+        gitコマンドを実行して標準出力を返す
+        """
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        try:
+            result = subprocess.run(
+                ["git", *args], cwd=cwd, env=env, capture_output=True, text=True, check=True
+            )
+        except FileNotFoundError as e:
+            raise GitMirrorError("gitコマンドが見つかりません") from e
+        except subprocess.CalledProcessError as e:
+            raise GitMirrorError(f"git {args[0]} に失敗しました: {e.stderr.strip()}") from e
+        return result.stdout
+
+    def sync(self, repo: str) -> bool:
+        """
+        ミラーを作成、または既存のミラーを更新
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+
+        Returns:
+            新しく作成した場合はTrue、既存のミラーを更新した場合はFalse
+
+        Raises:
+            GitMirrorError: gitコマンドが失敗した場合
+        """
+        path = self.path(repo)
+        if (path / "HEAD").exists():
+            self._git(["fetch", "--prune", "--quiet", "origin"], cwd=path)
+            return False
+
+        ensure_dir(self.cache_dir)
+        tmp_path = path.with_name(path.name + ".tmp")
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        # 途中で失敗した複製を次回に使わないよう、完了してから所定の場所に移す
+        self._git(["clone", "--mirror", "--quiet", self.url(repo), str(tmp_path)])
+        os.replace(tmp_path, path)
+        return True
+
+    def log(
+        self,
+        repo: str,
+        since_iso: str,
+        until_iso: Optional[str] = None,
+        branch: Optional[str] = None
+    ) -> Iterator[Tuple[str, str, str]]:
+        """
+        ミラーのコミットを新しい順に返す（作成日時が期間内のもののみ）
+
+        Args:
+            repo: リポジトリ名（owner/repo形式）
+            since_iso: 開始日時（GitHub APIの日時形式）
+            until_iso: 終了日時（GitHub APIの日時形式、Noneの場合は現在まで）
+            branch: ブランチ名（Noneの場合はデフォルトブランチ）
+
+        Returns:
+            (SHA, 作成者名, 作成日時) のイテレータ（作成日時はUTCのGitHub APIの日時形式）
+
+        Raises:
+            GitMirrorError: gitコマンドが失敗した場合
+        """
+        # --since / --until はコミット日時で絞り込まれるため、作成日時は取り出してから判定する
+        args = ["log", f"--format={LOG_FORMAT}", f"--since={since_iso}", branch or "HEAD", "--"]
+        output = self._git(args, cwd=self.path(repo))
+
+        for line in output.splitlines():
+            sha, author_name, authored_at = line.split("\x00")
+            commit_date = to_github_datetime(datetime.fromisoformat(authored_at).astimezone(timezone.utc))
+            if commit_date < since_iso or (until_iso and commit_date > until_iso):
+                continue
+            yield sha, author_name, commit_date
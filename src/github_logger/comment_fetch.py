@@ -0,0 +1,265 @@
+"""
+issue/PRコメントの遅延取得モジュール
+"""
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+from ..utils.file_utils import ensure_dir
+from ..utils.github_client import GitHubClient
+
+COMMENT_PAGE_SIZE = 50
+
+# 期間内のアイテムのコメントを並行して取得する数
+COMMENT_FETCH_WORKERS = 4
+
+COMMENT_NODE_FIELDS = """
+id
+author { login }
+authorAssociation
+body
+createdAt
+url
+"""
+
+ITEM_COMMENTS_QUERY = """
+query ItemComments($owner: String!, $name: String!, $number: Int!, $last: Int!, $before: String) {
+  rateLimit { limit cost remaining resetAt }
+  repository(owner: $owner, name: $name) {
+    issueOrPullRequest(number: $number) {
+      ... on Issue {
+        comments(last: $last, before: $before) {
+          pageInfo { hasPreviousPage startCursor }
+          nodes { %(fields)s }
+        }
+      }
+      ... on PullRequest {
+        comments(last: $last, before: $before) {
+          pageInfo { hasPreviousPage startCursor }
+          nodes { %(fields)s }
+        }
+      }
+    }
+  }
+}
+""" % {"fields": COMMENT_NODE_FIELDS}
+
+
+def fetch_comments_since(
+    client: GitHubClient,
+    repo: str,
+    number: int,
+    stop_before: str
+) -> List[Dict[str, Any]]:
+    """
+    アイテムのコメントを新しい順に遡り、指定日時より前に作成されたものに達した時点で打ち切る
+
+    Args:
+        client: GitHubクライアント
+        repo: リポジトリ名（owner/repo形式）
+        number: issue/PR番号
+        stop_before: この日時より前に作成されたコメントは取得しない
+
+    Returns:
+        stop_before 以降に作成されたコメント（作成日時の昇順）
+    """
+    owner, name = repo.split("/", 1)
+    comments: List[Dict[str, Any]] = []
+    before = None
+
+    while True:
+        data = client.graphql(ITEM_COMMENTS_QUERY, {
+            "owner": owner,
+            "name": name,
+            "number": number,
+            "last": COMMENT_PAGE_SIZE,
+            "before": before
+        })
+        item = (data.get("repository") or {}).get("issueOrPullRequest") or {}
+        connection = item.get("comments") or {}
+
+        reached_end = False
+        for node in reversed(connection.get("nodes") or []):
+            if node.get("createdAt", "") < stop_before:
+                reached_end = True
+                break
+            comments.append(node)
+
+        page_info = connection.get("pageInfo") or {}
+        if reached_end or not page_info.get("hasPreviousPage"):
+            break
+        before = page_info.get("startCursor")
+
+    comments.reverse()
+    return comments
+
+
+class CommentFetcher:
+    """期間内のアイテムについてのみコメントを取得し、アイテム単位でキャッシュするクラス"""
+
+    def __init__(self, client: Optional[GitHubClient], repo: str, cache_dir: Union[str, Path]):
+        """
+        取得器を初期化
+
+        Args:
+            client: GitHubクライアント（Noneの場合はAPIを呼ばずにキャッシュだけを使う）
+            repo: リポジトリ名（owner/repo形式）
+            cache_dir: コメントキャッシュのディレクトリ
+        """
+        self.client = client
+        self.repo = repo
+        self.cache_dir = Path(cache_dir) / repo.replace("/", "__")
+        self.fetched = 0
+        self.cached = 0
+        self._count_lock = threading.Lock()
+
+    def _cache_file(self, number: int) -> Path:
+        """
+        アイテムのキャッシュファイルのパス
+        """
+        return self.cache_dir / f"{number}.json"
+
+    def _read_cache(self, number: int) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュを読み込む（存在しない・壊れている場合はNone）
+        """
+        cache_file = self._cache_file(number)
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_cache(self, number: int, entry: Dict[str, Any]) -> None:
+        """
+        キャッシュを一時ファイル経由で書き換える
+        """
+        ensure_dir(self.cache_dir)
+        cache_file = self._cache_file(number)
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+
+    def recent_comments(self, item: Dict[str, Any], since: str) -> List[Dict[str, Any]]:
+        """
+        アイテムの since 以降に作成されたコメントを取得
+
+        キャッシュがアイテムの updatedAt と一致していればAPIを呼ばない。更新されている場合も、
+        キャッシュ済みの最新コメントより新しいものだけを取得してマージする。
+
+        Args:
+            item: issue/PRデータ（number, updatedAt, commentCount を参照）
+            since: この日時以降に作成されたコメントのみ返す
+
+        Returns:
+            コメントのリスト（作成日時の昇順）
+        """
+        number = item["number"]
+        if item.get("commentCount", 0) == 0:
+            return []
+
+        entry = self._read_cache(number)
+        usable = entry is not None and entry.get("since", "") <= since
+        cached_comments = entry.get("comments", []) if usable else []
+
+        if usable and entry.get("updatedAt") == item.get("updatedAt"):
+            with self._count_lock:
+                self.cached += 1
+        elif self.client is None:
+            # APIを使わない場合は、古い可能性があってもキャッシュ済みのコメントを返す
+            pass
+        else:
+            stop_before = since
+            if usable and cached_comments:
+                stop_before = max(since, cached_comments[-1].get("createdAt", ""))
+            new_comments = fetch_comments_since(self.client, self.repo, number, stop_before)
+
+            known_ids = {comment.get("id") for comment in cached_comments}
+            cached_comments = [
+                comment
+                for comment in cached_comments + [c for c in new_comments if c.get("id") not in known_ids]
+                if comment.get("createdAt", "") >= since
+            ]
+            self._write_cache(number, {
+                "updatedAt": item.get("updatedAt"),
+                "since": since,
+                "comments": cached_comments
+            })
+            with self._count_lock:
+                self.fetched += 1
+
+        return [comment for comment in cached_comments if comment.get("createdAt", "") >= since]
+
+    def with_recent_comments(
+        self,
+        items: Iterable[Dict[str, Any]],
+        since: str,
+        workers: int = COMMENT_FETCH_WORKERS
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        アイテムに since 以降に作成されたコメントを付けて、元の順序のまま返す
+
+        コメントの取得は最大 workers 件を並行して行う。先読みするアイテムは workers の2倍までに
+        限るため、期間内のアイテムをすべてメモリに載せることはない。
+
+        Args:
+            items: issue/PRデータのイテレータ
+            since: この日時以降に作成されたコメントのみ付ける
+            workers: 並行して取得する数（1以下の場合は順番に取得する）
+
+        Returns:
+            comments を設定したアイテムのイテレータ
+        """
+        def attach(item: Dict[str, Any]) -> Dict[str, Any]:
+            item["comments"] = self.recent_comments(item, since)
+            return item
+
+        if workers <= 1 or self.client is None:
+            for item in items:
+                yield attach(item)
+            return
+
+        pending: Deque[Any] = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for item in items:
+                pending.append(executor.submit(attach, item))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def apply_comment_event(self, number: int, updated_at: str, comment: Dict[str, Any], action: str) -> bool:
+        """
+        Webhookで受信したコメントの作成・編集・削除をキャッシュに反映する
+
+        キャッシュがないアイテムは、それ以前のコメントがわからないため何もしない（次回の取得で作られる）。
+
+        Args:
+            number: issue/PR番号
+            updated_at: イベント後のアイテムの updatedAt
+            comment: コメントノード（id, author, authorAssociation, body, createdAt, url）
+            action: created / edited / deleted
+
+        Returns:
+            キャッシュを更新した場合はTrue
+        """
+        entry = self._read_cache(number)
+        if entry is None:
+            return False
+
+        comments = [cached for cached in entry.get("comments", []) if cached.get("id") != comment.get("id")]
+        if action != "deleted" and comment.get("createdAt", "") >= entry.get("since", ""):
+            comments.append(comment)
+            comments.sort(key=lambda cached: cached.get("createdAt", ""))
+
+        entry["comments"] = comments
+        entry["updatedAt"] = updated_at
+        self._write_cache(number, entry)
+        return True
@@ -0,0 +1,295 @@
+"""
+GitHub GraphQL APIによるissue/PRデータ取得モジュール
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..utils.github_client import GitHubClient
+
+COMMENT_PROFILES = ("full", "count")
+
+# コメント本文を含むページは重いため、件数のみの場合より小さいページで取得する
+PAGE_SIZES = {
+    "full": 50,
+    "count": 100,
+}
+
+COMMENT_FIELDS = {
+    "full": """
+comments(first: 100) {
+  totalCount
+  nodes {
+    id
+    author { login }
+    authorAssociation
+    body
+    createdAt
+    url
+  }
+}
+""",
+    "count": """
+comments { totalCount }
+""",
+}
+
+ISSUE_FIELDS = """
+number
+title
+body
+state
+createdAt
+updatedAt
+closedAt
+url
+author { login }
+assignees(first: 20) { nodes { login name } }
+labels(first: 20) { nodes { name description color } }
+"""
+
+PR_FIELDS = ISSUE_FIELDS + """
+mergedAt
+mergeable
+additions
+deletions
+changedFiles
+"""
+
+ISSUES_QUERY = """
+query RepoIssues($owner: String!, $name: String!, $first: Int!, $after: String, $since: DateTime) {
+  rateLimit { limit cost remaining resetAt }
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, filterBy: {since: $since}, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { %s }
+    }
+  }
+}
+"""
+
+PRS_QUERY = """
+query RepoPullRequests($owner: String!, $name: String!, $first: Int!, $after: String) {
+  rateLimit { limit cost remaining resetAt }
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { %s }
+    }
+  }
+}
+"""
+
+ISSUES_QUERIES = {profile: ISSUES_QUERY % (ISSUE_FIELDS + COMMENT_FIELDS[profile]) for profile in COMMENT_PROFILES}
+PRS_QUERIES = {profile: PRS_QUERY % (PR_FIELDS + COMMENT_FIELDS[profile]) for profile in COMMENT_PROFILES}
+
+
+def covers_profile(stored: Optional[str], requested: str) -> bool:
+    """
+    保存済みデータの取得プロファイルが、要求されたプロファイルの情報を含むか
+
+    Args:
+        stored: 保存済みデータの取得プロファイル
+        requested: 要求されたプロファイル
+
+    Returns:
+        含む場合はTrue
+    """
+    if stored not in COMMENT_PROFILES:
+        return False
+    return COMMENT_PROFILES.index(stored) <= COMMENT_PROFILES.index(requested)
+
+
+def normalize_item(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    GraphQLのノードを `gh issue list --json` と同じ形の辞書に変換
+
+    Args:
+        node: GraphQLのissue/PRノード
+
+    Returns:
+        レンダラーが扱うアイテム辞書
+    """
+    item = dict(node)
+    for key in ("assignees", "labels"):
+        connection = item.get(key)
+        if isinstance(connection, dict):
+            item[key] = connection.get("nodes") or []
+
+    comments = item.pop("comments", None)
+    if isinstance(comments, dict):
+        item["commentCount"] = comments.get("totalCount", 0)
+        if "nodes" in comments:
+            item["comments"] = comments.get("nodes") or []
+    return item
+
+
+def _iter_connection_pages(
+    client: GitHubClient,
+    repo: str,
+    query: str,
+    connection_name: str,
+    since: Optional[str] = None,
+    after: Optional[str] = None,
+    page_size: int = PAGE_SIZES["full"],
+    first_page: Optional[Dict[str, Any]] = None
+) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """
+    リポジトリ配下のコネクションを更新日時の降順でカーソルページングしながら1ページずつ返す
+
+    Args:
+        client: GitHubクライアント
+        repo: リポジトリ名（owner/repo形式）
+        query: GraphQLクエリ
+        connection_name: 取得するコネクション名（issues / pullRequests）
+        since: この日時以降に更新されたアイテムのみ取得（`YYYY-MM-DDTHH:MM:SSZ` 形式）
+        after: 取得を再開するカーソル
+        page_size: 1ページあたりの件数
+        first_page: 取得済みの最初のページ（バッチ取得の結果）。指定した場合は2ページ目から問い合わせる
+
+    Returns:
+        (ページ内のアイテム, そのページの終端カーソル) のイテレータ
+    """
+    owner, name = repo.split("/", 1)
+    cursor = after
+
+    while True:
+        if first_page is not None:
+            connection, first_page = first_page, None
+        else:
+            variables = {
+                "owner": owner,
+                "name": name,
+                "first": page_size,
+                "after": cursor
+            }
+            if since and "$since" in query:
+                variables["since"] = since
+
+            data = client.graphql(query, variables)
+            connection = (data.get("repository") or {}).get(connection_name) or {}
+
+        items: List[Dict[str, Any]] = []
+        reached_end = False
+        for node in connection.get("nodes") or []:
+            # pullRequestsはsinceで絞り込めないため、降順に並んだ結果を期間外に達した時点で打ち切る
+            if since and node.get("updatedAt", "") < since:
+                reached_end = True
+                break
+            items.append(normalize_item(node))
+
+        page_info = connection.get("pageInfo") or {}
+        cursor = page_info.get("endCursor") or cursor
+        if items:
+            yield items, cursor
+        if reached_end or not page_info.get("hasNextPage"):
+            break
+
+
+def iter_issue_pages(
+    client: GitHubClient,
+    repo: str,
+    since: Optional[str] = None,
+    after: Optional[str] = None,
+    profile: str = "full",
+    first_page: Optional[Dict[str, Any]] = None
+) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """
+    リポジトリのissueを1ページずつ取得
+
+    Args:
+        client: GitHubクライアント
+        repo: リポジトリ名（owner/repo形式）
+        since: この日時以降に更新されたissueのみ取得
+        after: 取得を再開するカーソル
+        profile: コメントの取得プロファイル（full: 本文まで取得, count: 件数のみ）
+        first_page: fetch_first_pages で取得済みの最初のページ
+
+    Returns:
+        (issueのリスト, 終端カーソル) のイテレータ
+    """
+    return _iter_connection_pages(
+        client, repo, ISSUES_QUERIES[profile], "issues", since, after, PAGE_SIZES[profile], first_page
+    )
+
+
+def iter_pull_request_pages(
+    client: GitHubClient,
+    repo: str,
+    since: Optional[str] = None,
+    after: Optional[str] = None,
+    profile: str = "full",
+    first_page: Optional[Dict[str, Any]] = None
+) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """
+    リポジトリのPRを1ページずつ取得
+
+    Args:
+        client: GitHubクライアント
+        repo: リポジトリ名（owner/repo形式）
+        since: この日時以降に更新されたPRのみ取得
+        after: 取得を再開するカーソル
+        profile: コメントの取得プロファイル（full: 本文まで取得, count: 件数のみ）
+        first_page: fetch_first_pages で取得済みの最初のページ
+
+    Returns:
+        (PRのリスト, 終端カーソル) のイテレータ
+    """
+    return _iter_connection_pages(
+        client, repo, PRS_QUERIES[profile], "pullRequests", since, after, PAGE_SIZES[profile], first_page
+    )
+
+
+def fetch_first_pages(
+    client: GitHubClient,
+    targets: List[Tuple[str, Optional[str]]],
+    include_prs: bool = True,
+    profile: str = "full"
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    複数リポジトリのissue/PRの最初のページを、エイリアスを使った1つのGraphQLクエリでまとめて取得
+
+    2ページ目以降が必要なリポジトリだけ、結果の endCursor から iter_issue_pages /
+    iter_pull_request_pages で続きを取得する。
+
+    Args:
+        client: GitHubクライアント
+        targets: (リポジトリ名, 更新日時の下限) のリスト
+        include_prs: PRも取得するか
+        profile: コメントの取得プロファイル
+
+    Returns:
+        リポジトリ名 -> コネクション名（issues / pullRequests） -> 最初のページ
+    """
+    variable_defs = ["$first: Int!"]
+    variables: Dict[str, Any] = {"first": PAGE_SIZES[profile]}
+    blocks = []
+
+    for index, (repo, since) in enumerate(targets):
+        owner, name = repo.split("/", 1)
+        variable_defs += [f"$owner{index}: String!", f"$name{index}: String!", f"$since{index}: DateTime"]
+        variables.update({f"owner{index}": owner, f"name{index}": name, f"since{index}": since})
+
+        connections = (
+            f"issues(first: $first, filterBy: {{since: $since{index}}}, "
+            f"orderBy: {{field: UPDATED_AT, direction: DESC}}) {{\n"
+            f"  pageInfo {{ hasNextPage endCursor }}\n"
+            f"  nodes {{ {ISSUE_FIELDS + COMMENT_FIELDS[profile]} }}\n"
+            f"}}\n"
+        )
+        if include_prs:
+            connections += (
+                f"pullRequests(first: $first, orderBy: {{field: UPDATED_AT, direction: DESC}}) {{\n"
+                f"  pageInfo {{ hasNextPage endCursor }}\n"
+                f"  nodes {{ {PR_FIELDS + COMMENT_FIELDS[profile]} }}\n"
+                f"}}\n"
+            )
+        blocks.append(f"r{index}: repository(owner: $owner{index}, name: $name{index}) {{\n{connections}}}")
+
+    query = (
+        f"query BatchFirstPages({', '.join(variable_defs)}) {{\n"
+        f"  rateLimit {{ limit cost remaining resetAt }}\n"
+        + "\n".join(blocks)
+        + "\n}\n"
+    )
+
+    data = client.graphql(query, variables)
+    return {repo: data.get(f"r{index}") or {} for index, (repo, _) in enumerate(targets)}
@@ -2,31 +2,32 @@
 GitHub活動データ収集モジュール
 """
 import argparse
-import json
-import subprocess
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+from ..utils.checkpoint import Checkpoint
 from ..utils.config import Config
-from ..utils.file_utils import ensure_dir, read_json_file, write_json_file, write_text_file
+from ..utils.console import capture_output
+from ..utils.file_utils import ensure_dir, read_json_file, write_json_file, write_json_items, write_text_file
+from ..utils.github_client import GitHubAPIError, GitHubClient, get_client, report_client_stats, to_github_datetime
+from ..utils.repo_metadata import fetch_repo_metadata
+from ..utils.sync_state import SyncState
 from ..utils.user_mapping import map_username
-
-
-def get_github_token() -> Optional[str]:
-    """
-    GitHub CLIからトークンを取得
-    
-    Returns:
-        GitHubトークン
-    """
-    try:
-        result = subprocess.run(['gh', 'auth', 'token'], capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError:
-        print("GitHub CLIでの認証が必要です。'gh auth login' を実行してください。")
-        return None
+from .github_fetch import (
+    COMMENT_PROFILES,
+    covers_profile,
+    fetch_first_pages,
+    iter_issue_pages,
+    iter_pull_request_pages,
+)
+from .comment_fetch import COMMENT_FETCH_WORKERS, CommentFetcher
+from .item_store import ItemStore
+from .review_fetch import ReviewFetcher
 
 
 def extract_username_from_email(email: str) -> str:
@@ -52,12 +53,157 @@ def extract_username_from_email(email: str) -> str:
         return email.split("@")[0]
 
 
+def report_window(last_days: int, timezone_str: str = "UTC") -> Tuple[datetime, datetime]:
+    """
+    レポート対象期間を計算
+    
+    Args:
+        last_days: 過去何日分を対象にするか
+        timezone_str: タイムゾーン
+        
+    Returns:
+        開始日時と終了日時
+    """
+    tz = timezone.utc if timezone_str == "UTC" else timezone(timedelta(hours=9))
+    end_date = datetime.now(tz)
+    return end_date - timedelta(days=last_days), end_date
+
+
+def plan_fetch(
+    repo_state: Dict[str, Any],
+    since: str,
+    store_exists: bool,
+    include_prs: bool,
+    list_profile: str,
+    full_sync: bool = False
+) -> Tuple[bool, str]:
+    """
+    同期状態から差分取得できるかを判定し、取得の起点となる日時を決める
+    
+    保存コピーが期間の開始時点から途切れずに揃っている場合のみ差分取得する。
+    
+    Args:
+        repo_state: リポジトリの同期状態
+        since: 期間の開始日時
+        store_exists: 保存コピーが存在するか
+        include_prs: PRを含めるかどうか
+        list_profile: 一覧取得のコメントプロファイル
+        full_sync: ウォーターマークを無視するか
+        
+    Returns:
+        差分取得するかどうかと、取得の起点となる日時
+    """
+    watermark = repo_state.get("updated_at")
+    
+    incremental = (
+        store_covers(repo_state, since, store_exists, include_prs, list_profile, full_sync)
+        and watermark is not None
+        and since <= watermark
+    )
+    return incremental, watermark if incremental else since
+
+
+def store_covers(
+    repo_state: Dict[str, Any],
+    since: str,
+    store_exists: bool,
+    include_prs: bool,
+    list_profile: str,
+    full_sync: bool = False
+) -> bool:
+    """
+    保存コピーが期間の開始時点から、必要な種類とコメントの取得方法で揃っているか
+    
+    Args:
+        repo_state: リポジトリの同期状態
+        since: 期間の開始日時
+        store_exists: 保存コピーが存在するか
+        include_prs: PRを含めるかどうか
+        list_profile: 一覧取得のコメントプロファイル
+        full_sync: ウォーターマークを無視するか
+        
+    Returns:
+        保存コピーで期間を賄える場合はTrue
+    """
+    synced_since = repo_state.get("synced_since")
+    return (
+        not full_sync
+        and store_exists
+        and synced_since is not None
+        and synced_since <= since
+        and (repo_state.get("include_prs", False) or not include_prs)
+        and covers_profile(repo_state.get("comment_profile", "full"), list_profile)
+    )
+
+
+def item_fingerprint(metadata: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    リポジトリの更新状況から、issue/PRの変更を判定するフィンガープリントを作成
+    
+    issue/PRの更新ではリポジトリの pushedAt は変わらないため、最新のissue/PRの updatedAt を使う。
+    
+    Args:
+        metadata: fetch_repo_metadata で取得したリポジトリの更新状況
+        
+    Returns:
+        フィンガープリント（更新状況がない場合はNone）
+    """
+    if metadata is None:
+        return None
+    return {key: metadata.get(key) for key in ("issuesUpdatedAt", "pullRequestsUpdatedAt")}
+
+
+def is_unchanged(
+    repo_state: Dict[str, Any],
+    metadata: Optional[Dict[str, Any]],
+    since: str,
+    store_exists: bool,
+    include_prs: bool,
+    list_profile: str,
+    full_sync: bool = False
+) -> bool:
+    """
+    前回の取得からissue/PRが変更されていないか（取得を省略して保存コピーを使えるか）
+    
+    期間内に更新のないリポジトリ（ウォーターマークが期間の開始より前）も、保存コピーが
+    期間を賄っていればフィンガープリントだけで判定する。
+    
+    Args:
+        repo_state: リポジトリの同期状態
+        metadata: リポジトリの現在の更新状況
+        since: 期間の開始日時
+        store_exists: 保存コピーが存在するか
+        include_prs: PRを含めるかどうか
+        list_profile: 一覧取得のコメントプロファイル
+        full_sync: ウォーターマークを無視するか
+        
+    Returns:
+        変更がなく取得を省略できる場合はTrue
+    """
+    fingerprint = item_fingerprint(metadata)
+    return (
+        fingerprint is not None
+        and repo_state.get("fingerprint") == fingerprint
+        and store_covers(repo_state, since, store_exists, include_prs, list_profile, full_sync)
+    )
+
+
 def extract_github_data(
     repo: str,
     output_dir: str = "./data",
     last_days: int = 7,
     include_prs: bool = True,
-    timezone_str: str = "UTC"
+    timezone_str: str = "UTC",
+    client: Optional[GitHubClient] = None,
+    full_sync: bool = False,
+    sync_state: Optional[SyncState] = None,
+    comment_profile: str = "full",
+    prefetched: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[Checkpoint] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    from_store: bool = False,
+    reviews: bool = False,
+    window: Optional[Tuple[datetime, datetime]] = None
 ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """
     GitHubからissueとPRデータを抽出
@@ -68,17 +214,35 @@ def extract_github_data(
         last_days: 過去何日分を取得するか
         include_prs: PRを含めるかどうか
         timezone_str: タイムゾーン
+        client: GitHubクライアント（指定しない場合は共有クライアントを使う）
+        full_sync: 保存済みのウォーターマークを無視して期間全体を取得し直すか
+        sync_state: 同期状態（並列実行時に共有する、指定しない場合は出力ディレクトリから読み込む）
+        comment_profile: コメントの取得方法（full: 本文まで取得, count: 件数のみ,
+            recent: 件数のみ取得し、期間内のアイテムについて期間内に作成されたコメントを後から取得）
+        prefetched: prefetch_first_pages で取得済みの最初のページ
+        checkpoint: ページごとの進捗を記録するチェックポイント（再開時は完了済みのリポジトリを
+            スキップし、中断したリポジトリは記録済みのカーソルから続きを取得する）
+        metadata: fetch_repo_metadata で取得したリポジトリの更新状況（前回から変更がなければ
+            issue/PRを取得せずに保存コピーから出力する）
+        from_store: APIを呼ばず、保存コピー（Webhookで更新したものを含む）とコメントキャッシュだけから出力するか
+        reviews: 期間内に更新されたPRにレビューとレビュースレッドを付けるか
+        window: report_window で計算済みの期間（prefetch_first_pages と同じ期間を使う場合に指定する、
+            指定しない場合は last_days から計算する）
         
     Returns:
         抽出結果の辞書とJSONファイルパス
     """
-    token = get_github_token()
-    if not token:
-        return None, None
+    checkpoint_entry = checkpoint.get(repo) if checkpoint is not None else {}
+    if checkpoint_entry.get("status") == "done" and Path(checkpoint_entry.get("file", "")).exists():
+        print(f"リポジトリ {repo} はチェックポイントで完了済みのためスキップします")
+        return checkpoint_entry.get("result"), checkpoint_entry["file"]
     
-    tz = timezone.utc if timezone_str == "UTC" else timezone(timedelta(hours=9))
-    end_date = datetime.now(tz)
-    start_date = end_date - timedelta(days=last_days)
+    if client is None and not from_store:
+        client = get_client()
+        if client is None:
+            return None, None
+    
+    start_date, end_date = window or report_window(last_days, timezone_str)
     
     date_range_dir = f"{start_date.date().isoformat()}_to_{end_date.date().isoformat()}"
     
@@ -87,49 +251,191 @@ def extract_github_data(
     ensure_dir(github_raw_dir)
     
     repo_name = repo.split("/")[1]
+    since = to_github_datetime(start_date)
+    
+    state_dir = Path(output_dir) / "state"
+    if sync_state is None:
+        sync_state = SyncState(state_dir / "github_sync.json")
+    store = ItemStore(state_dir / "github", repo)
+    
+    repo_state = sync_state.get(repo)
+    watermark = repo_state.get("updated_at")
+    synced_since = repo_state.get("synced_since")
+    list_profile = "full" if comment_profile == "full" else "count"
+    incremental, fetch_since = plan_fetch(
+        repo_state, since, store.exists(), include_prs, list_profile, full_sync
+    )
+    unchanged = from_store or is_unchanged(
+        repo_state, metadata, since, store.exists(), include_prs, list_profile, full_sync
+    )
     
-    print(f"リポジトリ {repo} からissueデータを取得中...")
-    
-    issue_cmd = [
-        'gh', 'issue', 'list',
-        '--repo', repo,
-        '--state', 'all',
-        '--limit', '1000',
-        '--json', 'number,title,body,state,createdAt,updatedAt,closedAt,author,assignees,labels,comments,url'
-    ]
-    
-    try:
-        result = subprocess.run(issue_cmd, capture_output=True, text=True, check=True)
-        all_issues = json.loads(result.stdout)
-    except subprocess.CalledProcessError as e:
-        print(f"issueデータの取得に失敗しました: {e}")
-        all_issues = []
-    
-    all_prs = []
-    if include_prs:
-        print(f"リポジトリ {repo} からPRデータを取得中...")
+    progress: Dict[str, Dict[str, Any]] = {}
+    if from_store:
+        pass
+    elif checkpoint_entry.get("status") == "in_progress" and store.has_staged():
+        # 中断時の一時ファイルを残したまま、記録済みのカーソルから続きを取得する
+        incremental = checkpoint_entry["incremental"]
+        fetch_since = checkpoint_entry["fetch_since"]
+        progress = {name: dict(state) for name, state in checkpoint_entry.get("connections", {}).items()}
+        unchanged = False
+        print(f"リポジトリ {repo} をチェックポイントから再開します")
+    else:
+        store.discard()
+        if checkpoint is not None and not unchanged:
+            checkpoint.update(
+                repo, status="in_progress", incremental=incremental, fetch_since=fetch_since, connections={}
+            )
+    
+    if from_store:
+        print(f"リポジトリ {repo} は保存コピーから出力します（APIは呼びません）")
+    elif unchanged:
+        print(f"リポジトリ {repo} は前回の取得からissue/PRの更新がないため、保存コピーを使います")
+    elif incremental:
+        print(f"リポジトリ {repo} は {watermark} 以降の差分のみ取得します")
+    
+    fetch_ok = True
+    new_watermark = watermark or since
+    fetched_count = 0
+    
+    connections = []
+    if not unchanged:
+        connections.append(("issue", "issues", iter_issue_pages))
+        if include_prs:
+            connections.append(("PR", "pullRequests", iter_pull_request_pages))
+    
+    for _, connection_name, _ in connections:
+        progress.setdefault(connection_name, {"cursor": None, "pages": 0, "count": 0, "latest": "", "done": False})
+    progress_lock = threading.Lock()
+    
+    def fetch_connection(label: str, connection_name: str, iter_pages: Any) -> bool:
+        state = progress[connection_name]
+        if state["done"]:
+            print(f"リポジトリ {repo} の{label}データはチェックポイントで取得済みです（{state['count']}件）")
+            return True
         
-        pr_cmd = [
-            'gh', 'pr', 'list',
-            '--repo', repo,
-            '--state', 'all',
-            '--limit', '1000',
-            '--json', 'number,title,body,state,createdAt,updatedAt,closedAt,mergedAt,author,assignees,labels,comments,url,mergeable,additions,deletions,changedFiles'
-        ]
+        print(f"リポジトリ {repo} から{label}データを取得中... ({fetch_since}以降に更新されたもの)")
+        
+        first_page = None
+        if (
+            state["cursor"] is None
+            and prefetched
+            and prefetched.get("since") == fetch_since
+            and prefetched.get("profile") == list_profile
+        ):
+            first_page = prefetched["connections"].get(connection_name)
         
         try:
-            result = subprocess.run(pr_cmd, capture_output=True, text=True, check=True)
-            all_prs = json.loads(result.stdout)
-        except subprocess.CalledProcessError as e:
-            print(f"PRデータの取得に失敗しました: {e}")
-            all_prs = []
+            _stage_pages(
+                iter_pages(
+                    client, repo, since=fetch_since, after=state["cursor"], profile=list_profile, first_page=first_page
+                ),
+                store,
+                label,
+                progress,
+                connection_name,
+                checkpoint,
+                progress_lock
+            )
+        except GitHubAPIError as e:
+            print(f"{label}データの取得に失敗しました: {e}")
+            return False
+        return True
+    
+    def run_connection(connection: Tuple[str, str, Any]) -> Tuple[bool, str]:
+        with capture_output() as buffer:
+            ok = fetch_connection(*connection)
+        return ok, buffer.getvalue()
+    
+    if len(connections) > 1:
+        # issueとPRは独立しているため並行して取得し、出力はissue、PRの順に表示する
+        with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+            outcomes = list(executor.map(run_connection, connections))
+    else:
+        outcomes = [(fetch_connection(*connection), "") for connection in connections]
+    
+    for (_, connection_name, _), (ok, output) in zip(connections, outcomes):
+        print(output, end="")
+        if not ok:
+            fetch_ok = False
+            continue
+        state = progress[connection_name]
+        fetched_count += state["count"]
+        new_watermark = max(new_watermark, state["latest"])
+    
+    if not fetch_ok and checkpoint is not None:
+        print(f"リポジトリ {repo} は取得済みのページを残して中断しました（--resume で続きから再開できます）")
+        return None, None
     
-    all_data = all_issues + all_prs
+    if from_store:
+        pass
+    elif unchanged:
+        sync_state.update(repo, last_synced_at=to_github_datetime(datetime.now(timezone.utc)))
+    else:
+        stored_count = store.commit()
+        print(f"{fetched_count}件の更新を保存コピーにマージしました（保存件数: {stored_count}件）")
+    
+    if fetch_ok and not unchanged:
+        sync_state.update(
+            repo,
+            updated_at=new_watermark,
+            synced_since=synced_since if incremental else since,
+            cursors={name: state["cursor"] for name, state in progress.items()},
+            include_prs=include_prs,
+            comment_profile=list_profile,
+            fingerprint=item_fingerprint(metadata),
+            last_synced_at=to_github_datetime(datetime.now(timezone.utc))
+        )
     
-    github_file = github_raw_dir / f"{repo_name}.json"
-    write_json_file(all_data, github_file)
+    comment_fetcher = None
+    if comment_profile == "recent":
+        comment_fetcher = CommentFetcher(client, repo, state_dir / "comments")
+    
+    review_fetcher = None
+    if reviews and include_prs:
+        review_fetcher = ReviewFetcher(client, repo, state_dir / "reviews")
+    
+    counts = {"issues": 0, "prs": 0, "reviews": 0}
+    
+    def window_items() -> Iterator[Dict[str, Any]]:
+        # 保存コピーを種類ごとに読み直し、issue、PRの順に期間内のアイテムだけを流す
+        for key, is_pr in (("issues", False), ("prs", True)):
+            if is_pr and not include_prs:
+                continue
+            items = (
+                item for item in store.iter_items()
+                if ("mergeable" in item) == is_pr and item.get("updatedAt", "") >= since
+            )
+            if comment_fetcher:
+                items = comment_fetcher.with_recent_comments(items, since)
+            if review_fetcher and is_pr:
+                items = review_fetcher.with_reviews(items, since)
+            for item in items:
+                counts[key] += 1
+                counts["reviews"] += len(item.get("reviews", []))
+                yield item
     
-    print(f"{len(all_issues)}件のissueと{len(all_prs)}件のPRを {github_file} に保存しました")
+    github_file = github_raw_dir / f"{repo_name}.json"
+    # コメント・レビューの取得に失敗した場合に途中までの出力を残さないよう、一時ファイルに
+    # 書き出してからすべて付け終えた時点で置き換える
+    tmp_file = github_file.with_name(github_file.name + ".tmp")
+    try:
+        total = write_json_items(window_items(), tmp_file)
+    except GitHubAPIError as e:
+        print(f"リポジトリ {repo} のコメント・レビューの取得に失敗しました: {e}")
+        tmp_file.unlink(missing_ok=True)
+        if checkpoint is not None:
+            checkpoint.update(repo, status="failed")
+        return None, None
+    os.replace(tmp_file, github_file)
+    
+    print(f"{counts['issues']}件のissueと{counts['prs']}件のPRを {github_file} に保存しました")
+    if comment_fetcher:
+        print(f"コメントを{comment_fetcher.fetched}件のアイテムで取得しました（キャッシュ利用: {comment_fetcher.cached}件）")
+    if review_fetcher:
+        print(
+            f"{counts['reviews']}件のレビューを付けました（{review_fetcher.fetched}件のPRを"
+            f"{review_fetcher.queries}クエリで取得、キャッシュ利用: {review_fetcher.cached}件）"
+        )
     
     result = {
         "repo": repo,
@@ -139,21 +445,194 @@ def extract_github_data(
             "days": last_days
         },
         "counts": {
-            "issues": len(all_issues),
-            "prs": len(all_prs),
-            "total": len(all_data)
+            "issues": counts["issues"],
+            "prs": counts["prs"],
+            "total": total
         },
         "file": str(github_file)
     }
+    if review_fetcher:
+        result["counts"]["reviews"] = counts["reviews"]
     
     summary_file = github_raw_dir / f"{repo_name}_summary.json"
     write_json_file([result], summary_file)
     
     print(f"抽出結果の概要を {summary_file} に保存しました")
     
+    if checkpoint is not None:
+        checkpoint.update(repo, status="done", result=result, file=str(github_file))
+    
     return result, str(github_file)
 
 
+def prefetch_first_pages(
+    client: GitHubClient,
+    repos: List[str],
+    output_dir: str,
+    sync_state: SyncState,
+    last_days: int = 7,
+    include_prs: bool = True,
+    timezone_str: str = "UTC",
+    full_sync: bool = False,
+    comment_profile: str = "full",
+    batch_size: int = 10,
+    window: Optional[Tuple[datetime, datetime]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    複数リポジトリの最初のページを batch_size 件ずつまとめて取得
+    
+    extract_github_data と同じ基準で取得起点を決め、その結果を prefetched として渡すと
+    最初のページの問い合わせが省略される。取得起点が一致するよう、extract_github_data には
+    同じ window を渡すこと。バッチが失敗した場合は、そのバッチのリポジトリは
+    通常どおり個別に取得される。
+    
+    Args:
+        client: GitHubクライアント
+        repos: リポジトリ名のリスト
+        output_dir: 出力ディレクトリ
+        sync_state: 同期状態
+        last_days: 過去何日分を取得するか
+        include_prs: PRを含めるかどうか
+        timezone_str: タイムゾーン
+        full_sync: ウォーターマークを無視するか
+        comment_profile: コメントの取得方法
+        batch_size: 1クエリにまとめるリポジトリ数
+        window: report_window で計算済みの期間（指定しない場合は last_days から計算する）
+        
+    Returns:
+        リポジトリ名 -> {"since", "profile", "connections"}
+    """
+    start_date, _ = window or report_window(last_days, timezone_str)
+    since = to_github_datetime(start_date)
+    list_profile = "full" if comment_profile == "full" else "count"
+    store_dir = Path(output_dir) / "state" / "github"
+    
+    targets = []
+    for repo in repos:
+        _, fetch_since = plan_fetch(
+            sync_state.get(repo),
+            since,
+            ItemStore(store_dir, repo).exists(),
+            include_prs,
+            list_profile,
+            full_sync
+        )
+        targets.append((repo, fetch_since))
+    
+    prefetched: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(targets), batch_size):
+        batch = targets[start:start + batch_size]
+        print(f"{len(batch)}件のリポジトリの最初のページをまとめて取得中...")
+        try:
+            pages = fetch_first_pages(client, batch, include_prs=include_prs, profile=list_profile)
+        except GitHubAPIError as e:
+            print(f"まとめて取得できなかったため個別に取得します: {e}")
+            continue
+        for repo, fetch_since in batch:
+            if pages.get(repo):
+                prefetched[repo] = {"since": fetch_since, "profile": list_profile, "connections": pages[repo]}
+    
+    return prefetched
+
+
+def _stage_pages(
+    pages: Iterator[Tuple[List[Dict[str, Any]], Optional[str]]],
+    store: ItemStore,
+    label: str,
+    progress: Dict[str, Dict[str, Any]],
+    connection_name: str,
+    checkpoint: Optional[Checkpoint] = None,
+    progress_lock: Optional[threading.Lock] = None
+) -> None:
+    """
+    取得したページを届いた順に保存コピーの一時ファイルへ書き出す
+    
+    Args:
+        pages: (アイテムのリスト, 終端カーソル) のイテレータ
+        store: 保存コピー
+        label: 進捗表示用のラベル
+        progress: コネクション名 -> 進捗（cursor, pages, count, latest, done）。ページを書き出すたびに更新する
+        connection_name: 取得中のコネクション名
+        checkpoint: 進捗をページごとに記録するチェックポイント
+        progress_lock: 複数のコネクションを並行して取得する場合に、進捗の更新と記録を直列化するロック
+    """
+    progress_lock = progress_lock or threading.Lock()
+    state = progress[connection_name]
+    for items, cursor in pages:
+        staged = store.stage(items)
+        with progress_lock:
+            state["count"] += staged
+            state["latest"] = max([state["latest"]] + [item.get("updatedAt", "") for item in items])
+            state["cursor"] = cursor
+            state["pages"] += 1
+            if checkpoint is not None:
+                checkpoint.update(store.repo, connections={name: dict(value) for name, value in progress.items()})
+        print(f"  {label} {state['pages']}ページ目を取得しました（累計{state['count']}件）")
+    
+    with progress_lock:
+        state["done"] = True
+        if checkpoint is not None:
+            checkpoint.update(store.repo, connections={name: dict(value) for name, value in progress.items()})
+
+
+def extract_repos(
+    repos: List[str],
+    jobs: int = 1,
+    prefetched: Optional[Dict[str, Dict[str, Any]]] = None,
+    metadata: Optional[Dict[str, Dict[str, Any]]] = None,
+    **kwargs: Any
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    複数リポジトリのデータを抽出（jobs > 1 の場合は並列実行）
+    
+    並列実行時も結果とコンソール出力は repos の順序で返す。
+    
+    Args:
+        repos: リポジトリ名のリスト
+        jobs: 同時に処理するリポジトリ数
+        prefetched: prefetch_first_pages の結果（リポジトリごとに extract_github_data へ渡す）
+        metadata: fetch_repo_metadata の結果（リポジトリごとに extract_github_data へ渡す）
+        **kwargs: extract_github_data に渡す引数
+        
+    Returns:
+        (リポジトリ名, 抽出結果, JSONファイルパス) のイテレータ
+    """
+    prefetched = prefetched or {}
+    metadata = metadata or {}
+    
+    if jobs <= 1 or len(repos) <= 1:
+        for repo in repos:
+            try:
+                result, json_file = extract_github_data(
+                    repo=repo, prefetched=prefetched.get(repo), metadata=metadata.get(repo), **kwargs
+                )
+            except Exception as e:
+                print(f"リポジトリ {repo} の処理中にエラーが発生しました: {e}")
+                result, json_file = None, None
+            yield repo, result, json_file
+        return
+    
+    def run(repo: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], str]:
+        with capture_output() as buffer:
+            try:
+                result, json_file = extract_github_data(
+                    repo=repo, prefetched=prefetched.get(repo), metadata=metadata.get(repo), **kwargs
+                )
+            except Exception as e:
+                print(f"リポジトリ {repo} の処理中にエラーが発生しました: {e}")
+                result, json_file = None, None
+        return result, json_file, buffer.getvalue()
+    
+    print(f"{len(repos)}件のリポジトリを最大{jobs}並列で取得します")
+    
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run, repo) for repo in repos]
+        for repo, future in zip(repos, futures):
+            result, json_file, output = future.result()
+            print(output, end="")
+            yield repo, result, json_file
+
+
 def format_item(item: Dict[str, Any]) -> str:
     """
     アイテムをMarkdown形式でフォーマット
@@ -193,7 +672,7 @@ def format_item(item: Dict[str, Any]) -> str:
     if item.get("labels"):
         labels = [label.get("name", "") for label in item["labels"] if label.get("name")]
     
-    comment_count = len(item.get("comments", []))
+    comment_count = item.get("commentCount", len(item.get("comments", [])))
     
     formatted = f"## {item_type} #{number}: {title}\n\n"
     formatted += f"- **状態**: {state}\n"
@@ -207,6 +686,17 @@ def format_item(item: Dict[str, Any]) -> str:
     if comment_count > 0:
         formatted += f"- **コメント数**: {comment_count}\n"
     
+    if item.get("reviews"):
+        reviewers = [
+            f"{map_username((review.get('author') or {}).get('login', 'unknown'))}（{review.get('state', '')}）"
+            for review in item["reviews"]
+        ]
+        formatted += f"- **レビュー**: {', '.join(reviewers)}\n"
+    
+    if item.get("reviewThreads"):
+        thread_comments = sum(len(thread.get("comments", [])) for thread in item["reviewThreads"])
+        formatted += f"- **レビューコメント**: {thread_comments}件（{len(item['reviewThreads'])}スレッド）\n"
+    
     formatted += f"- **URL**: {url}\n\n"
     
     body = item.get("body", "")
@@ -273,7 +763,11 @@ def generate_markdown(
     markdown_report += f"## 概要\n\n"
     markdown_report += f"- **総アイテム数**: {len(items)}\n"
     markdown_report += f"- **Issue数**: {len(issues)}\n"
-    markdown_report += f"- **PR数**: {len(prs)}\n\n"
+    markdown_report += f"- **PR数**: {len(prs)}\n"
+    review_count = sum(len(item.get("reviews", [])) for item in prs)
+    if review_count:
+        markdown_report += f"- **レビュー数**: {review_count}\n"
+    markdown_report += "\n"
     
     open_items = [item for item in items if item.get("state") == "open"]
     closed_items = [item for item in items if item.get("state") == "closed"]
@@ -388,6 +882,32 @@ def main() -> int:
     parser.add_argument('--output-dir', help='出力ディレクトリ', default=config.get("output.default_dir", "./data"))
     parser.add_argument('--last-days', type=int, help='過去何日分を取得するか', default=7)
     parser.add_argument('--no-prs', action='store_true', help='PRを含めない')
+    parser.add_argument(
+        '--comments',
+        choices=COMMENT_PROFILES + ("recent",),
+        help='コメントの取得方法（full: 本文まで取得してAIレポートにも使う, count: 件数のみ取得してMarkdownレポート専用, '
+             'recent: 期間内のアイテムについて期間内に作成されたコメントのみ取得）',
+        default='full'
+    )
+    parser.add_argument(
+        '--reviews',
+        action='store_true',
+        help='期間内に更新されたPRのレビューとレビュースレッドも取得する（PRごとに件数の上限あり）'
+    )
+    parser.add_argument('--jobs', type=int, help='同時に取得するリポジトリ数', default=1)
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        help='複数リポジトリの最初のページを1つのGraphQLクエリでまとめて取得する件数（1で無効）',
+        default=10
+    )
+    parser.add_argument('--full-sync', action='store_true', help='前回のウォーターマークを無視して期間全体を取得し直す')
+    parser.add_argument('--resume', action='store_true', help='中断した前回の実行をチェックポイントから再開する')
+    parser.add_argument(
+        '--from-store',
+        action='store_true',
+        help='GitHub APIを呼ばず、保存コピー（Webhook受信で更新したものを含む）からレポートを生成する'
+    )
     parser.add_argument('--markdown', action='store_true', help='Markdownレポートも生成する')
     parser.add_argument('--output', help='Markdownレポートの出力ファイル名（指定しない場合はリポジトリ名から自動生成）')
     parser.add_argument('--json-file', help='既存のJSONファイルからMarkdownレポートを生成する場合に指定')
@@ -429,53 +949,127 @@ def main() -> int:
     
     output_dir = args.output_dir or config.get("output.default_dir", "./data")
     
-    tz = timezone.utc if timezone_str == "UTC" else timezone(timedelta(hours=9))
-    end_date = datetime.now(tz)
-    start_date = end_date - timedelta(days=args.last_days)
+    # 最初のページのまとめ取得とリポジトリごとの取得で取得起点が一致するよう、期間は一度だけ計算する
+    start_date, end_date = report_window(args.last_days, timezone_str)
     date_range_dir = f"{start_date.date().isoformat()}_to_{end_date.date().isoformat()}"
     
+    jobs = max(1, args.jobs)
+    client = None
+    if not args.from_store:
+        # リポジトリごとに issue/PR の2本、またはコメントの取得を COMMENT_FETCH_WORKERS 本同時に使う
+        client = get_client(config, pool_size=max(10, jobs * max(2, COMMENT_FETCH_WORKERS)))
+        if client is None:
+            return 1
+    sync_state = SyncState(Path(output_dir) / "state" / "github_sync.json")
+    checkpoint = None
+    if not args.from_store:
+        checkpoint = Checkpoint(
+            Path(output_dir) / "state" / "github_checkpoint.json",
+            run={
+                "last_days": args.last_days,
+                "include_prs": not args.no_prs,
+                "comment_profile": args.comments,
+                "full_sync": args.full_sync,
+                "timezone": timezone_str,
+                "reviews": args.reviews,
+            },
+            resume=args.resume
+        )
+        checkpoint.announce_resume(repos)
+    
     all_results = []
     all_items = []
     
-    for repo in repos:
-        result, json_file = extract_github_data(
-            repo=repo,
+    # チェックポイントで完了済み・途中まで取得済みのリポジトリは更新状況も最初のページも問い合わせない
+    pending_repos = [] if checkpoint is None else [repo for repo in repos if not checkpoint.get(repo)]
+    metadata = fetch_repo_metadata(client, pending_repos) if pending_repos else {}
+    
+    # 前回から変更がなく、保存コピーで期間を賄えるリポジトリは最初のページも取得しない
+    since = to_github_datetime(start_date)
+    list_profile = "full" if args.comments == "full" else "count"
+    fetch_repos = [
+        repo for repo in pending_repos
+        if not is_unchanged(
+            sync_state.get(repo),
+            metadata.get(repo),
+            since,
+            ItemStore(Path(output_dir) / "state" / "github", repo).exists(),
+            not args.no_prs,
+            list_profile,
+            args.full_sync
+        )
+    ]
+    
+    prefetched = None
+    if len(fetch_repos) > 1 and args.batch_size > 1:
+        prefetched = prefetch_first_pages(
+            client=client,
+            repos=fetch_repos,
             output_dir=output_dir,
+            sync_state=sync_state,
             last_days=args.last_days,
             include_prs=not args.no_prs,
-            timezone_str=timezone_str
+            timezone_str=timezone_str,
+            full_sync=args.full_sync,
+            comment_profile=args.comments,
+            batch_size=args.batch_size,
+            window=(start_date, end_date)
         )
+    
+    extracted = extract_repos(
+        repos=repos,
+        jobs=jobs,
+        prefetched=prefetched,
+        metadata=metadata,
+        output_dir=output_dir,
+        last_days=args.last_days,
+        include_prs=not args.no_prs,
+        timezone_str=timezone_str,
+        client=client,
+        full_sync=args.full_sync,
+        sync_state=sync_state,
+        comment_profile=args.comments,
+        checkpoint=checkpoint,
+        from_store=args.from_store,
+        reviews=args.reviews,
+        window=(start_date, end_date)
+    )
+    
+    failed_repos = []
+    for repo, result, json_file in extracted:
+        if not result:
+            failed_repos.append(repo)
+            continue
+        
+        all_results.append(result)
         
-        if result:
-            all_results.append(result)
+        if args.markdown:
+            repo_name = repo.split("/")[1]
             
-            if args.markdown:
-                repo_name = repo.split("/")[1]
-                
-                if not args.output:
-                    markdown_dir = Path(output_dir) / date_range_dir / "markdown" / "github"
-                    ensure_dir(markdown_dir)
-                    output_file = markdown_dir / f"github_report-{repo_name}.md"
+            if not args.output:
+                markdown_dir = Path(output_dir) / date_range_dir / "markdown" / "github"
+                ensure_dir(markdown_dir)
+                output_file = markdown_dir / f"github_report-{repo_name}.md"
+            else:
+                if len(repos) > 1:
+                    output_path = Path(args.output)
+                    base, ext = output_path.stem, output_path.suffix
+                    output_file = output_path.with_name(f"{base}-{repo_name}{ext}")
                 else:
-                    if len(repos) > 1:
-                        output_path = Path(args.output)
-                        base, ext = output_path.stem, output_path.suffix
-                        output_file = output_path.with_name(f"{base}-{repo_name}{ext}")
-                    else:
-                        output_file = args.output
-                
-                items = []
-                if json_file and Path(json_file).exists():
-                    items = read_json_file(json_file)
-                    all_items.extend(items)
-                
-                generate_markdown(
-                    items=items,
-                    repo=repo,
-                    start_date=result["period"]["start"],
-                    end_date=result["period"]["end"],
-                    output_file=output_file
-                )
+                    output_file = args.output
+            
+            items = []
+            if json_file and Path(json_file).exists():
+                items = read_json_file(json_file)
+                all_items.extend(items)
+            
+            generate_markdown(
+                items=items,
+                repo=repo,
+                start_date=result["period"]["start"],
+                end_date=result["period"]["end"],
+                output_file=output_file
+            )
     
     if len(repos) > 1 and all_items and args.markdown:
         markdown_dir = Path(output_dir) / date_range_dir / "markdown" / "github"
@@ -495,8 +1089,19 @@ def main() -> int:
         
         print(f"まとめレポートは {combined_output} に保存されました。")
     
+    if failed_repos:
+        print(f"{len(failed_repos)}件のリポジトリの取得に失敗しました: {failed_repos}")
+        if checkpoint is not None:
+            print("--resume を付けて再実行すると、完了済みのリポジトリをスキップして続きから取得します")
+        return 1
+    
+    if checkpoint is not None:
+        checkpoint.clear()
+    
     return 0
 
 
 if __name__ == "__main__":
-    exit(main())
+    exit_code = main()
+    report_client_stats()
+    exit(exit_code)
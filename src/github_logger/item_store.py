@@ -0,0 +1,172 @@
+"""
+issue/PRの保存コピー管理モジュール
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from ..utils.file_utils import ensure_dir, file_lock
+
+
+class ItemStore:
+    """
+    リポジトリごとのissue/PRをJSON Lines形式で保持するクラス
+
+    収集処理とWebhook受信サーバーが同じ保存コピーを書き換えるため、読み込みから置き換えまでは
+    プロセス間のファイルロックを取って行う。
+    """
+
+    def __init__(self, store_dir: Union[str, Path], repo: str):
+        """
+        保存先を初期化
+
+        Args:
+            store_dir: 保存ディレクトリ
+            repo: リポジトリ名（owner/repo形式）
+        """
+        self.repo = repo
+        self.path = Path(store_dir) / f"{repo.replace('/', '__')}.jsonl"
+        self._staging_path = self.path.with_name(self.path.name + ".incoming")
+        # issueとPRを並行して取得する場合も、一時ファイルへの追記が行の途中で混ざらないようにする
+        self._stage_lock = threading.Lock()
+
+    def exists(self) -> bool:
+        """
+        保存コピーが存在するか
+
+        Returns:
+            存在する場合はTrue
+        """
+        return self.path.exists()
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """
+        保存されているアイテムを1件ずつ読み出す
+
+        Returns:
+            アイテムのイテレータ
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def get(self, number: int) -> Optional[Dict[str, Any]]:
+        """
+        番号を指定してアイテムを取得
+
+        Args:
+            number: issue/PR番号
+
+        Returns:
+            アイテム（保存されていない場合はNone）
+        """
+        for item in self.iter_items():
+            if item.get("number") == number:
+                return item
+        return None
+
+    def has_staged(self) -> bool:
+        """
+        コミットされていない一時ファイルがあるか（中断した取得の再開時に確認する）
+
+        Returns:
+            一時ファイルがある場合はTrue
+        """
+        return self._staging_path.exists()
+
+    def stage(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        取得したアイテムを一時ファイルに追記する（commit でマージされる）
+
+        Args:
+            items: 取得したアイテム
+
+        Returns:
+            追記した件数
+        """
+        lines = [json.dumps(item, ensure_ascii=False) + "\n" for item in items]
+        ensure_dir(self.path.parent)
+        with self._stage_lock:
+            with open(self._staging_path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+        return len(lines)
+
+    def commit(self) -> int:
+        """
+        一時ファイルのアイテムを番号単位で保存コピーに上書きマージする
+
+        同じ番号のアイテムが複数回追記されている場合は後のものを採用する。
+        取得したアイテムが1件もない場合も、期間内に更新がないことを記録するため空の保存コピーを作る。
+
+        Returns:
+            マージ後の総件数
+        """
+        if not self._staging_path.exists():
+            with file_lock(self.path):
+                if not self.path.exists():
+                    self.path.touch()
+                return sum(1 for _ in self.iter_items())
+
+        latest_line: Dict[int, int] = {}
+        with open(self._staging_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f):
+                if line.strip():
+                    latest_line[json.loads(line)["number"]] = line_no
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        count = 0
+        with file_lock(self.path):
+            with open(tmp_path, 'w', encoding='utf-8') as out:
+                for item in self.iter_items():
+                    if item.get("number") in latest_line:
+                        continue
+                    out.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    count += 1
+                with open(self._staging_path, 'r', encoding='utf-8') as f:
+                    for line_no, line in enumerate(f):
+                        if line.strip() and latest_line.get(json.loads(line)["number"]) == line_no:
+                            out.write(line)
+                            count += 1
+            os.replace(tmp_path, self.path)
+        self.discard()
+
+        return count
+
+    def discard(self) -> None:
+        """
+        一時ファイルを破棄する
+        """
+        if self._staging_path.exists():
+            self._staging_path.unlink()
+
+    def upsert(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        アイテムを番号単位で直接上書きする（Webhookの受信など、取得処理の一時ファイルを使わない更新用）
+
+        Args:
+            items: 更新するアイテム
+
+        Returns:
+            更新後の総件数
+        """
+        updates = {item["number"]: item for item in items}
+
+        tmp_path = self.path.with_name(f"{self.path.name}.{threading.get_ident()}.tmp")
+        count = 0
+        with file_lock(self.path):
+            with open(tmp_path, 'w', encoding='utf-8') as out:
+                for item in self.iter_items():
+                    item = updates.pop(item.get("number"), item)
+                    out.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    count += 1
+                for item in updates.values():
+                    out.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    count += 1
+            os.replace(tmp_path, self.path)
+
+        return count
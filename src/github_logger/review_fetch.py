@@ -0,0 +1,258 @@
+"""
+PRレビュー・レビュースレッドの取得モジュール
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from ..utils.file_utils import ensure_dir
+from ..utils.github_client import GitHubClient
+
+# 1つのGraphQLクエリにまとめるPR数
+REVIEW_BATCH_SIZE = 20
+
+# PRごとに取得する上限（新しいものから）。レビューの多いPRでもコストが増えすぎないようにする
+MAX_REVIEWS_PER_PR = 20
+MAX_THREADS_PER_PR = 20
+MAX_COMMENTS_PER_THREAD = 5
+
+REVIEW_FIELDS = """
+updatedAt
+reviews(last: %(reviews)d) {
+  totalCount
+  nodes {
+    id
+    author { login }
+    state
+    body
+    submittedAt
+    url
+  }
+}
+reviewThreads(last: %(threads)d) {
+  totalCount
+  nodes {
+    id
+    isResolved
+    path
+    comments(last: %(comments)d) {
+      totalCount
+      nodes {
+        id
+        author { login }
+        body
+        createdAt
+        url
+      }
+    }
+  }
+}
+""" % {"reviews": MAX_REVIEWS_PER_PR, "threads": MAX_THREADS_PER_PR, "comments": MAX_COMMENTS_PER_THREAD}
+
+
+def build_reviews_query(count: int) -> str:
+    """
+    count 件のPRのレビューをまとめて取得するクエリを作成
+
+    Args:
+        count: PR数（変数 $n0 〜 $n{count-1} にPR番号を渡す）
+
+    Returns:
+        GraphQLクエリ
+    """
+    variable_defs = ", ".join(f"$n{index}: Int!" for index in range(count))
+    blocks = "\n".join(f"    p{index}: pullRequest(number: $n{index}) {{ {REVIEW_FIELDS} }}" for index in range(count))
+    return (
+        f"query PullRequestReviews($owner: String!, $name: String!, {variable_defs}) {{\n"
+        f"  rateLimit {{ limit cost remaining resetAt }}\n"
+        f"  repository(owner: $owner, name: $name) {{\n{blocks}\n  }}\n"
+        f"}}\n"
+    )
+
+
+def window_reviews(node: Dict[str, Any], since: str) -> Dict[str, Any]:
+    """
+    PRノードから since 以降のレビューと、since 以降にコメントのあったスレッドを取り出す
+
+    Args:
+        node: PullRequestReviews クエリのPRノード
+        since: この日時以降の活動のみ残す
+
+    Returns:
+        reviews / reviewThreads / reviewCount / reviewThreadCount を持つ辞書
+    """
+    reviews_connection = node.get("reviews") or {}
+    threads_connection = node.get("reviewThreads") or {}
+
+    reviews = [
+        review for review in reviews_connection.get("nodes") or []
+        if (review.get("submittedAt") or "") >= since
+    ]
+
+    threads = []
+    for thread in threads_connection.get("nodes") or []:
+        comments_connection = thread.get("comments") or {}
+        comments = [
+            comment for comment in comments_connection.get("nodes") or []
+            if (comment.get("createdAt") or "") >= since
+        ]
+        if comments:
+            threads.append({
+                "id": thread.get("id"),
+                "isResolved": thread.get("isResolved"),
+                "path": thread.get("path"),
+                "commentCount": comments_connection.get("totalCount", len(comments)),
+                "comments": comments,
+            })
+
+    return {
+        "reviews": reviews,
+        "reviewThreads": threads,
+        "reviewCount": reviews_connection.get("totalCount", 0),
+        "reviewThreadCount": threads_connection.get("totalCount", 0),
+    }
+
+
+class ReviewFetcher:
+    """期間内に更新されたPRについてのみレビューを取得し、PR単位でキャッシュするクラス"""
+
+    def __init__(self, client: Optional[GitHubClient], repo: str, cache_dir: Union[str, Path]):
+        """
+        取得器を初期化
+
+        Args:
+            client: GitHubクライアント（Noneの場合はAPIを呼ばずにキャッシュだけを使う）
+            repo: リポジトリ名（owner/repo形式）
+            cache_dir: レビューキャッシュのディレクトリ
+        """
+        self.client = client
+        self.repo = repo
+        self.cache_dir = Path(cache_dir) / repo.replace("/", "__")
+        self.fetched = 0
+        self.cached = 0
+        self.queries = 0
+        self._count_lock = threading.Lock()
+
+    def _cache_file(self, number: int) -> Path:
+        """
+        PRのキャッシュファイルのパス
+        """
+        return self.cache_dir / f"{number}.json"
+
+    def _read_cache(self, number: int) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュを読み込む（存在しない・壊れている場合はNone）
+        """
+        cache_file = self._cache_file(number)
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_cache(self, number: int, entry: Dict[str, Any]) -> None:
+        """
+        キャッシュを一時ファイル経由で書き換える
+        """
+        ensure_dir(self.cache_dir)
+        cache_file = self._cache_file(number)
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+
+    def _fetch_batch(self, numbers: List[int], since: str) -> Dict[int, Dict[str, Any]]:
+        """
+        複数PRのレビューを1つのクエリで取得してキャッシュに保存
+        """
+        owner, name = self.repo.split("/", 1)
+        variables: Dict[str, Any] = {"owner": owner, "name": name}
+        variables.update({f"n{index}": number for index, number in enumerate(numbers)})
+
+        data = self.client.graphql(build_reviews_query(len(numbers)), variables)
+        repository = data.get("repository") or {}
+
+        results = {}
+        for index, number in enumerate(numbers):
+            node = repository.get(f"p{index}")
+            if not node:
+                continue
+            entry = {"updatedAt": node.get("updatedAt"), "since": since, **window_reviews(node, since)}
+            self._write_cache(number, entry)
+            results[number] = entry
+
+        with self._count_lock:
+            self.queries += 1
+            self.fetched += len(results)
+        return results
+
+    def _attach(self, items: List[Dict[str, Any]], since: str) -> None:
+        """
+        PRのリストにレビューを付ける（キャッシュが古いものだけをまとめて取得する）
+        """
+        entries: Dict[int, Optional[Dict[str, Any]]] = {}
+        stale = []
+        for item in items:
+            number = item["number"]
+            entry = self._read_cache(number)
+            usable = entry is not None and entry.get("since", "") <= since
+            entries[number] = entry if usable else None
+            if usable and entry.get("updatedAt") == item.get("updatedAt"):
+                with self._count_lock:
+                    self.cached += 1
+            elif self.client is not None:
+                stale.append(number)
+
+        if stale:
+            entries.update(self._fetch_batch(stale, since))
+
+        for item in items:
+            entry = entries.get(item["number"])
+            if entry is None:
+                continue
+            item["reviews"] = [
+                review for review in entry.get("reviews", [])
+                if (review.get("submittedAt") or "") >= since
+            ]
+            item["reviewThreads"] = [
+                thread for thread in entry.get("reviewThreads", [])
+                if any((comment.get("createdAt") or "") >= since for comment in thread.get("comments", []))
+            ]
+            item["reviewCount"] = entry.get("reviewCount", 0)
+            item["reviewThreadCount"] = entry.get("reviewThreadCount", 0)
+
+    def with_reviews(
+        self,
+        items: Iterable[Dict[str, Any]],
+        since: str,
+        batch_size: int = REVIEW_BATCH_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        PRに since 以降のレビューとレビュースレッドを付けて、元の順序のまま返す
+
+        batch_size 件ずつまとめて処理するため、先読みするPRは batch_size 件まで。
+        PRの updatedAt がキャッシュと同じであれば取得しない（レビューやレビューコメントが
+        付くとPRの updatedAt も更新される）。
+
+        Args:
+            items: PRデータのイテレータ（期間内に更新されたもの）
+            since: この日時以降の活動のみ付ける
+            batch_size: 1クエリにまとめるPR数
+
+        Returns:
+            reviews / reviewThreads / reviewCount / reviewThreadCount を設定したPRのイテレータ
+        """
+        batch: List[Dict[str, Any]] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                self._attach(batch, since)
+                yield from batch
+                batch = []
+        if batch:
+            self._attach(batch, since)
+            yield from batch
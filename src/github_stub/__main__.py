@@ -0,0 +1,335 @@
+"""
+GitHub APIスタブサーバーのメインモジュール
+
+    # 合成データを返すサーバーを起動
+    python -m src.github_stub serve --repos 5 --latency 0.05
+
+    # 記録したフィクスチャを再生
+    GITHUB_RECORD_DIR=fixtures python -m src.github_logger.github_report --repo owner/repo
+    python -m src.github_stub serve --fixtures fixtures
+
+    # スタブに向けて収集処理を実行し、所要時間とリクエスト数を計測
+    python -m src.github_stub bench --repos 5 --latency 0.05 --jobs 4
+
+    # 合成データへの実行をフィクスチャに記録し、フィクスチャだけで再生できるか確認
+    python -m src.github_stub bench --repos 2 --replay
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..utils.file_utils import read_json_lines
+from .server import StubGitHubServer, load_fixtures, start_server
+from .synthetic import SyntheticGitHub
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    serve / bench 共通のサーバー設定の引数を追加
+
+    Args:
+        parser: 引数パーサー
+    """
+    parser.add_argument('--fixtures', help='再生するフィクスチャのディレクトリ（GITHUB_RECORD_DIR で記録したもの）')
+    parser.add_argument('--synthetic', action='store_true', help='フィクスチャにないリクエストに合成データで応答する')
+    parser.add_argument('--org', default='team-mirai-volunteer', help='合成データの組織名')
+    parser.add_argument('--repos', type=int, default=3, help='合成データのリポジトリ数')
+    parser.add_argument('--issues', type=int, default=200, help='リポジトリあたりのissue数')
+    parser.add_argument('--prs', type=int, default=100, help='リポジトリあたりのPR数')
+    parser.add_argument('--comments', type=int, default=3, help='アイテムあたりの最大コメント数')
+    parser.add_argument('--commits', type=int, default=500, help='リポジトリあたりのコミット数')
+    parser.add_argument('--span-days', type=int, default=60, help='更新日時・コミット日時を分布させる日数')
+    parser.add_argument('--dormant-repos', type=int, default=0, help='1年以上前から更新のないリポジトリ数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数シード')
+    parser.add_argument('--latency', type=float, default=0.0, help='1リクエストあたりの応答遅延（秒）')
+    parser.add_argument('--jitter', type=float, default=0.0, help='応答遅延に加えるランダムな揺らぎの最大値（秒）')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='1時間あたりのレート制限（0で無制限）')
+    parser.add_argument('--page-size', type=int, default=100, help='1ページあたりの最大件数')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='HTTP 502 を返すリクエストの割合（再試行の計測用）')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='--slow-latency だけ遅らせるリクエストの割合')
+    parser.add_argument('--slow-latency', type=float, default=2.0, help='遅いリクエストに加える遅延（秒）')
+
+
+def build_server(args: argparse.Namespace, host: str, port: int) -> StubGitHubServer:
+    """
+    引数からスタブサーバーを作成
+
+    Args:
+        args: 解析済みの引数
+        host: 待ち受けるホスト
+        port: 待ち受けるポート（0の場合は空いているポート）
+
+    Returns:
+        スタブサーバー
+    """
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else None
+    dataset = None
+    if not fixtures or args.synthetic:
+        dataset = SyntheticGitHub(
+            org=args.org,
+            repos=args.repos,
+            issues=args.issues,
+            pull_requests=args.prs,
+            comments=args.comments,
+            commits=args.commits,
+            span_days=args.span_days,
+            dormant_repos=args.dormant_repos,
+            seed=args.seed
+        )
+
+    return StubGitHubServer(
+        (host, port),
+        dataset=dataset,
+        fixtures=fixtures,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        max_page_size=args.page_size,
+        quiet=not getattr(args, 'verbose', False),
+        error_rate=args.error_rate,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency
+    )
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    スタブサーバーを起動して終了まで待つ
+
+    Args:
+        args: 解析済みの引数
+
+    Returns:
+        終了コード
+    """
+    server = build_server(args, args.host, args.port)
+    if server.fixtures:
+        print(f"フィクスチャ {len(server.fixtures)}件を読み込みました: {args.fixtures}")
+    if server.dataset is not None:
+        print(f"合成データ: {server.dataset.org} の {len(server.dataset.repo_names)}リポジトリ")
+    print(f"スタブサーバーを起動しました: {server.url}")
+    print(f"収集処理は GITHUB_API_URL={server.url} GITHUB_TOKEN=stub を設定して実行してください")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"リクエスト数: {server.request_counts}")
+    return 0
+
+
+def run_collector(command: List[str], env: Dict[str, str], verbose: bool) -> float:
+    """
+    収集処理を別プロセスで実行して所要時間を計測
+
+    Args:
+        command: 実行するモジュールと引数
+        env: 環境変数
+        verbose: 収集処理の出力を表示するか
+
+    Returns:
+        所要時間（秒）
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-m'] + command,
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=None if verbose else subprocess.DEVNULL,
+        stderr=None if verbose else subprocess.STDOUT
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        print(f"  {command[0]} が終了コード {result.returncode} で終了しました")
+    return elapsed
+
+
+def run_collectors(
+    label: str,
+    server: StubGitHubServer,
+    repos: List[str],
+    output_dir: str,
+    stats_file: Path,
+    args: argparse.Namespace,
+    record_dir: Optional[Path] = None
+) -> Dict[str, int]:
+    """
+    スタブサーバーに向けて issue/PR 収集とコミット収集を1回実行し、所要時間とリクエスト数を表示
+
+    Args:
+        label: 表示する実行の名前
+        server: 起動済みのスタブサーバー
+        repos: 対象リポジトリ（owner/repo形式）
+        output_dir: 出力ディレクトリ
+        stats_file: 収集処理が終了時にクライアントの再試行・ヘッジ・キャッシュの回数を書き出すファイル
+        args: 解析済みの引数
+        record_dir: 指定した場合はレスポンスをこのディレクトリにフィクスチャとして記録する
+
+    Returns:
+        この実行でのリクエスト数（種類ごと）
+    """
+    env = dict(os.environ)
+    env.update({
+        'GITHUB_API_URL': server.url,
+        'GITHUB_TOKEN': 'stub',
+        'OUTPUT_DIR': output_dir,
+        'GITHUB_HTTP_CACHE_DIR': str(Path(output_dir) / 'state' / 'http_cache'),
+        'GITHUB_STATS_FILE': str(stats_file),
+    })
+    env.pop('GITHUB_RECORD_DIR', None)
+    if record_dir is not None:
+        env['GITHUB_RECORD_DIR'] = str(record_dir)
+    if stats_file.exists():
+        stats_file.unlink()
+
+    before = dict(server.request_counts)
+    timings = {}
+    timings['github_report'] = run_collector([
+        'src.github_logger.github_report',
+        '--repo', ','.join(repos),
+        '--output-dir', output_dir,
+        '--last-days', str(args.last_days),
+        '--comments', args.comment_profile,
+        '--jobs', str(args.jobs),
+    ] + (['--reviews'] if args.reviews else []), env, args.verbose)
+
+    if not args.skip_commits:
+        timings['commit_collector'] = run_collector([
+            'src.commit_collector',
+            '--repos', ','.join(repos),
+            '--since-date', args.since_date,
+            '--output-dir', output_dir,
+            '--jobs', str(args.jobs),
+            '--no-upload',
+        ], env, args.verbose)
+
+    requests_made = {
+        name: count - before.get(name, 0)
+        for name, count in server.request_counts.items()
+        if count - before.get(name, 0)
+    }
+    print(f"[{label}] " + ", ".join(f"{name}: {elapsed:.2f}秒" for name, elapsed in timings.items()))
+    print(f"  リクエスト数: {sum(requests_made.values())} {requests_made}")
+    client_stats: Dict[str, int] = {}
+    if stats_file.exists():
+        for stats in read_json_lines(stats_file):
+            for name, count in stats.items():
+                client_stats[name] = client_stats.get(name, 0) + count
+    print(f"  クライアント: {client_stats}")
+    return requests_made
+
+
+def bench(args: argparse.Namespace) -> int:
+    """
+    スタブサーバーに向けて issue/PR 収集とコミット収集を実行し、所要時間とリクエスト数を表示
+
+    同じ出力ディレクトリで --runs 回繰り返すため、2回目以降は差分同期やキャッシュの効果を計測できる。
+    --replay の場合は、最初の実行をフィクスチャに記録してから、フィクスチャだけを返すサーバーで
+    --runs 回再生し、フィクスチャにないリクエストがあれば失敗とする。
+
+    Args:
+        args: 解析済みの引数
+
+    Returns:
+        終了コード（0: 成功, 1: 失敗）
+    """
+    server = build_server(args, '127.0.0.1', 0)
+    start_server(server)
+
+    if server.dataset is not None:
+        repos = [f"{server.dataset.org}/{name}" for name in server.dataset.repo_names]
+    else:
+        repos = [repo.strip() for repo in (args.repo or '').split(',') if repo.strip()]
+    if not repos:
+        print("エラー: フィクスチャを再生する場合は --repo で対象リポジトリを指定してください")
+        server.shutdown()
+        server.server_close()
+        return 1
+
+    exit_code = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_dir = args.output_dir or tmp_dir
+        stats_file = Path(tmp_dir) / 'client_stats.jsonl'
+
+        print(f"スタブサーバー: {server.url}（遅延 {args.latency}秒, 対象 {len(repos)}リポジトリ）")
+
+        if not args.replay:
+            for run in range(1, args.runs + 1):
+                run_collectors(f"{run}回目", server, repos, output_dir, stats_file, args)
+        else:
+            record_dir = Path(tmp_dir) / 'fixtures'
+            run_collectors("記録", server, repos, str(Path(tmp_dir) / 'record'), stats_file, args, record_dir)
+            server.shutdown()
+            server.server_close()
+
+            # 記録したフィクスチャだけで応答するサーバーに切り替える
+            replay_args = argparse.Namespace(**{**vars(args), 'fixtures': str(record_dir), 'synthetic': False})
+            server = build_server(replay_args, '127.0.0.1', 0)
+            start_server(server)
+            print(f"フィクスチャ {len(server.fixtures)}件を再生します: {server.url}")
+
+            for run in range(1, args.runs + 1):
+                # 記録時と同じリクエストになるよう、毎回空の出力ディレクトリから実行する
+                replay_dir = Path(tmp_dir) / 'replay'
+                shutil.rmtree(replay_dir, ignore_errors=True)
+                requests_made = run_collectors(f"再生 {run}回目", server, repos, str(replay_dir), stats_file, args)
+                if requests_made.get('missing'):
+                    print(f"  エラー: フィクスチャにないリクエストが {requests_made['missing']}件ありました")
+                    exit_code = 1
+
+    server.shutdown()
+    server.server_close()
+    return exit_code
+
+
+def main() -> int:
+    """
+    メイン関数
+
+    Returns:
+        終了コード（0: 成功, 1: 失敗）
+    """
+    parser = argparse.ArgumentParser(description='GitHub APIのスタブサーバー（フィクスチャの再生・合成データ）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='スタブサーバーを起動')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='待ち受けるホスト')
+    serve_parser.add_argument('--port', type=int, default=8765, help='待ち受けるポート')
+    serve_parser.add_argument('--verbose', action='store_true', help='アクセスログを出力')
+    add_server_arguments(serve_parser)
+
+    bench_parser = subparsers.add_parser('bench', help='スタブサーバーに向けて収集処理を実行して計測')
+    add_server_arguments(bench_parser)
+    bench_parser.add_argument('--repo', help='フィクスチャを再生する場合の対象リポジトリ（カンマ区切り、owner/repo形式）')
+    bench_parser.add_argument('--runs', type=int, default=2, help='同じ出力ディレクトリで繰り返す回数')
+    bench_parser.add_argument('--jobs', type=int, default=4, help='github_report / commit_collector の並列数')
+    bench_parser.add_argument('--last-days', type=int, default=7, help='github_report の対象日数')
+    bench_parser.add_argument('--comment-profile', choices=['full', 'count', 'recent'], default='recent',
+                              help='github_report のコメント取得方法')
+    bench_parser.add_argument('--reviews', action='store_true', help='github_report でPRのレビューも取得する')
+    bench_parser.add_argument('--since-date', default='2025-05-01', help='commit_collector の開始日')
+    bench_parser.add_argument('--skip-commits', action='store_true', help='commit_collector を実行しない')
+    bench_parser.add_argument('--output-dir', help='出力ディレクトリ（指定しない場合は一時ディレクトリ）')
+    bench_parser.add_argument('--verbose', action='store_true', help='収集処理の出力を表示')
+    bench_parser.add_argument('--replay', action='store_true',
+                              help='最初の実行をフィクスチャに記録し、フィクスチャだけで再生できるか確認する')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        return serve(args)
+    return bench(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,591 @@
+"""
+GitHub APIのスタブサーバー
+
+記録済みのフィクスチャ（src/utils/fixture_recorder.py）または合成データを、指定した遅延・
+ページング・レート制限ヘッダー付きで返す。GITHUB_API_URL をこのサーバーに向けると、
+収集処理を実際のGitHubに接続せずに実行・計測できる。
+"""
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from ..utils.fixture_recorder import fixture_key
+from .synthetic import DEFAULT_BRANCH, SyntheticGitHub
+
+_OPERATION_NAME_PATTERN = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+
+RATE_LIMIT_WINDOW = 3600
+
+JsonValue = Union[Dict[str, Any], List[Any]]
+
+
+def encode_cursor(offset: int) -> str:
+    """
+    オフセットをGraphQLのカーソル文字列に変換
+    """
+    return base64.b64encode(f"cursor:{offset}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    GraphQLのカーソル文字列をオフセットに変換（Noneや不正な値は0）
+    """
+    if not cursor:
+        return 0
+    try:
+        return int(base64.b64decode(cursor).decode("utf-8").split(":", 1)[1])
+    except (ValueError, IndexError):
+        return 0
+
+
+def load_fixtures(fixture_dir: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """
+    フィクスチャディレクトリを読み込む
+
+    Args:
+        fixture_dir: フィクスチャのディレクトリ
+
+    Returns:
+        フィクスチャのキー -> 記録されたレスポンス
+    """
+    fixtures = {}
+    for path in sorted(Path(fixture_dir).glob("*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        # キーの作り方が変わっても再生できるよう、記録したリクエストからキーを作り直す
+        request = fixture["request"]
+        body = request["body"].encode("utf-8") if request.get("body") else None
+        fixtures[fixture_key(request["method"], request["url"], body)] = fixture["response"]
+    return fixtures
+
+
+class RateLimitCounter:
+    """リソース種別ごとの残り回数を管理するクラス（1時間ごとにリセット）"""
+
+    def __init__(self, limit: int):
+        """
+        カウンターを初期化
+
+        Args:
+            limit: 1時間あたりの上限（0以下の場合は制限しない）
+        """
+        self.limit = limit
+        self._state: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, resource: str, cost: int = 1) -> Tuple[int, int, bool]:
+        """
+        予算を消費
+
+        Args:
+            resource: リソース種別
+            cost: 消費するポイント
+
+        Returns:
+            (残り, リセット時刻のUNIX秒, 消費できたか)
+        """
+        with self._lock:
+            now = int(time.time())
+            remaining, reset_at = self._state.get(resource, (self.limit, now + RATE_LIMIT_WINDOW))
+            if now >= reset_at:
+                remaining, reset_at = self.limit, now + RATE_LIMIT_WINDOW
+            if remaining < cost:
+                self._state[resource] = (remaining, reset_at)
+                return remaining, reset_at, False
+            remaining -= cost
+            self._state[resource] = (remaining, reset_at)
+            return remaining, reset_at, True
+
+
+class StubGitHubServer(ThreadingHTTPServer):
+    """フィクスチャ再生または合成データでGitHub APIを模倣するHTTPサーバー"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        dataset: Optional[SyntheticGitHub] = None,
+        fixtures: Optional[Dict[str, Dict[str, Any]]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: int = 5000,
+        max_page_size: int = 100,
+        quiet: bool = True,
+        error_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0
+    ):
+        """
+        サーバーを初期化
+
+        Args:
+            address: 待ち受けるホストとポート
+            dataset: 合成データ（fixtures と両方指定した場合はフィクスチャを優先し、ないものを合成する）
+            fixtures: load_fixtures で読み込んだフィクスチャ
+            latency: 1リクエストあたりの応答遅延（秒）
+            jitter: 応答遅延に加えるランダムな揺らぎの最大値（秒）
+            rate_limit: 1時間あたりのレート制限（0以下の場合は制限しない）
+            max_page_size: 1ページあたりの最大件数
+            quiet: アクセスログを出力しないか
+            error_rate: 一時的な障害として HTTP 502 を返すリクエストの割合
+            slow_rate: slow_latency だけ余分に遅らせるリクエストの割合（ヘッジリクエストの計測用）
+            slow_latency: 遅いリクエストに加える遅延（秒）
+        """
+        super().__init__(address, StubRequestHandler)
+        self.dataset = dataset
+        self.fixtures = fixtures or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limits = RateLimitCounter(rate_limit)
+        self.max_page_size = max_page_size
+        self.quiet = quiet
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.request_counts: Dict[str, int] = {}
+        self._count_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """
+        サーバーのベースURL
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str) -> None:
+        """
+        リクエスト数を種類別に数える
+        """
+        with self._count_lock:
+            self.request_counts[name] = self.request_counts.get(name, 0) + 1
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """スタブサーバーのリクエストハンドラー"""
+
+    server: StubGitHubServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """
+        アクセスログ（quiet の場合は出力しない）
+        """
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        """
+        GETリクエストを処理
+        """
+        self._handle(None)
+
+    def do_POST(self) -> None:
+        """
+        POSTリクエストを処理
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle(self.rfile.read(length) if length else b"")
+
+    def _handle(self, body: Optional[bytes]) -> None:
+        """
+        遅延・レート制限・フィクスチャ再生・合成データの順に処理してレスポンスを返す
+        """
+        server = self.server
+        if server.latency or server.jitter:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+        if server.slow_rate and random.random() < server.slow_rate:
+            server.count("slow")
+            time.sleep(server.slow_latency)
+        if server.error_rate and random.random() < server.error_rate:
+            server.count("error")
+            self._send_json(502, {"message": "Server Error"})
+            return
+
+        parts = urlsplit(self.path)
+        resource = "graphql" if parts.path.rstrip("/") == "/graphql" else "core"
+
+        fixture = server.fixtures.get(fixture_key(self.command, self.path, body))
+        if fixture is not None:
+            server.count("fixture")
+            headers = dict(fixture.get("headers", {}))
+            if "Link" in headers:
+                # 記録時にパスだけにしたページングのリンクをこのサーバーのURLにする
+                headers["Link"] = headers["Link"].replace("</", f"<http://{self.headers.get('Host', '')}/")
+            self._send_raw(fixture["status"], headers, fixture["body"].encode("utf-8"))
+            return
+
+        if server.dataset is None:
+            server.count("missing")
+            self._send_json(404, {"message": "Fixture not found", "key": fixture_key(self.command, self.path, body)})
+            return
+
+        if resource == "graphql":
+            self._handle_graphql(body or b"")
+        else:
+            self._handle_rest(parts.path, dict(parse_qsl(parts.query)))
+
+    def _rate_limit_headers(self, resource: str, cost: int = 1) -> Optional[Dict[str, str]]:
+        """
+        予算を消費してレート制限ヘッダーを作成（制限しない場合は空、超過した場合は403を返してNone）
+        """
+        if self.server.rate_limits.limit <= 0:
+            return {}
+        remaining, reset_at, allowed = self.server.rate_limits.consume(resource, cost)
+        headers = {
+            "X-RateLimit-Limit": str(self.server.rate_limits.limit),
+            "X-RateLimit-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Reset": str(reset_at),
+            "X-RateLimit-Resource": resource,
+        }
+        if not allowed:
+            self.server.count("rate_limited")
+            self._send_json(403, {"message": "API rate limit exceeded"}, headers)
+            return None
+        return headers
+
+    def _handle_rest(self, path: str, params: Dict[str, str]) -> None:
+        """
+        REST APIの合成レスポンス（組織のリポジトリ一覧・コミット一覧・コミットの比較）
+        """
+        dataset = self.server.dataset
+        segments = [segment for segment in path.strip("/").split("/") if segment]
+
+        if len(segments) == 5 and segments[0] == "repos" and segments[3] == "compare":
+            self._rest_compare(segments[1], segments[2], segments[4], params)
+            return
+
+        items: Optional[List[Dict[str, Any]]] = None
+        if len(segments) == 3 and segments[0] == "orgs" and segments[2] == "repos" and segments[1] == dataset.org:
+            self.server.count("org_repos")
+            items = dataset.org_repositories()
+            sort_key = {"pushed": "pushed_at", "updated": "updated_at", "full_name": "full_name"}.get(params.get("sort", ""))
+            if sort_key:
+                default_direction = "asc" if sort_key == "full_name" else "desc"
+                reverse = params.get("direction", default_direction) == "desc"
+                items = sorted(items, key=lambda repo: repo[sort_key] or "", reverse=reverse)
+        elif len(segments) == 4 and segments[0] == "repos" and segments[3] == "commits":
+            if dataset.has_repo(segments[1], segments[2]):
+                self.server.count("commits")
+                items = dataset.repository(segments[2])["commits"]
+                since, until = params.get("since"), params.get("until")
+                if since or until:
+                    items = [
+                        commit for commit in items
+                        if (not since or commit["commit"]["author"]["date"] >= since)
+                        and (not until or commit["commit"]["author"]["date"] <= until)
+                    ]
+
+        if items is None:
+            self.server.count("not_found")
+            self._send_json(404, {"message": "Not Found"})
+            return
+
+        headers = self._rate_limit_headers("core")
+        if headers is None:
+            return
+
+        per_page = min(max(int(params.get("per_page", 30)), 1), self.server.max_page_size)
+        page = max(int(params.get("page", 1)), 1)
+        last_page = max((len(items) + per_page - 1) // per_page, 1)
+        page_items = items[(page - 1) * per_page:page * per_page]
+
+        links = []
+        base = f"http://{self.headers.get('Host', '')}{path}"
+        for rel, number in (("next", page + 1), ("last", last_page)):
+            if page < last_page:
+                links.append(f'<{base}?{urlencode({**params, "page": number})}>; rel="{rel}"')
+        if links:
+            headers["Link"] = ", ".join(links)
+
+        body = json.dumps(page_items).encode("utf-8")
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        if self.headers.get("If-None-Match") == etag:
+            self._send_raw(304, {"ETag": etag}, b"")
+            return
+        headers["ETag"] = etag
+        self._send_raw(200, headers, body)
+
+    def _rest_compare(self, owner: str, name: str, basehead: str, params: Dict[str, str]) -> None:
+        """
+        コミットの比較（base より新しいコミットを古い順に、per_page / page でページ分割して返す）
+
+        合成データの履歴はデフォルトブランチの一直線のみのため、base が一覧にない場合や head が
+        デフォルトブランチでない場合は存在しないコミットとして404を返す。
+        """
+        dataset = self.server.dataset
+        base, _, head = basehead.partition("...")
+        commits = dataset.repository(name)["commits"] if dataset.has_repo(owner, name) and head == DEFAULT_BRANCH else []
+        position = next((index for index, commit in enumerate(commits) if commit["sha"] == base), None)
+        if position is None:
+            self.server.count("not_found")
+            self._send_json(404, {"message": "Not Found"})
+            return
+
+        self.server.count("compare")
+        headers = self._rate_limit_headers("core")
+        if headers is None:
+            return
+
+        newer = commits[:position][::-1]
+        per_page = min(max(int(params.get("per_page", 250)), 1), 250)
+        page = max(int(params.get("page", 1)), 1)
+        self._send_json(200, {
+            "status": "ahead" if newer else "identical",
+            "ahead_by": len(newer),
+            "behind_by": 0,
+            "total_commits": len(newer),
+            "commits": newer[(page - 1) * per_page:page * per_page],
+        }, headers)
+
+    def _handle_graphql(self, body: bytes) -> None:
+        """
+        GraphQLの合成レスポンス（操作名で処理を振り分ける）
+        """
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._send_json(400, {"message": "Problems parsing JSON"})
+            return
+
+        query = payload.get("query", "")
+        variables = payload.get("variables") or {}
+        match = _OPERATION_NAME_PATTERN.match(query)
+        operation = match.group(1) if match else ""
+        self.server.count(operation or "graphql")
+
+        handler = {
+            "RepoIssues": self._graphql_repo_connection,
+            "RepoPullRequests": self._graphql_repo_connection,
+            "ItemComments": self._graphql_item_comments,
+            "BatchFirstPages": self._graphql_batch_first_pages,
+            "RepoMetadata": self._graphql_repo_metadata,
+            "PullRequestReviews": self._graphql_pull_request_reviews,
+        }.get(operation)
+        if handler is None:
+            self._send_json(200, {"errors": [{"message": f"Unsupported operation: {operation or '(anonymous)'}"}]})
+            return
+
+        data, cost = handler(query, variables)
+        headers = self._rate_limit_headers("graphql", cost)
+        if headers is None:
+            return
+        if headers:
+            reset_at = datetime.fromtimestamp(int(headers["X-RateLimit-Reset"]), timezone.utc)
+            data["rateLimit"] = {
+                "limit": self.server.rate_limits.limit,
+                "cost": cost,
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "resetAt": reset_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        self._send_json(200, {"data": data}, headers)
+
+    def _connection(
+        self,
+        items: List[Dict[str, Any]],
+        query: str,
+        first: int,
+        after: Optional[str],
+        since: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        更新日時の降順に並んだアイテムから1ページ分のコネクションを作成
+        """
+        if since:
+            items = [item for item in items if item["updatedAt"] >= since]
+        start = decode_cursor(after)
+        end = start + min(max(int(first), 1), self.server.max_page_size)
+        full_comments = "comments(first" in query
+
+        nodes = []
+        for item in items[start:end]:
+            node = {key: value for key, value in item.items() if key not in ("kind", "comments")}
+            node["comments"] = {"totalCount": len(item["comments"])}
+            if full_comments:
+                node["comments"]["nodes"] = item["comments"]
+            nodes.append(node)
+
+        return {
+            "pageInfo": {"hasNextPage": end < len(items), "endCursor": encode_cursor(min(end, len(items)))},
+            "nodes": nodes,
+        }
+
+    def _graphql_repo_connection(self, query: str, variables: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        RepoIssues / RepoPullRequests
+        """
+        dataset = self.server.dataset
+        if not dataset.has_repo(variables.get("owner", ""), variables.get("name", "")):
+            return {"repository": None}, 1
+        repository = dataset.repository(variables["name"])
+        connection_name = "pullRequests" if "pullRequests(" in query else "issues"
+        connection = self._connection(
+            repository[connection_name], query, variables.get("first", 100), variables.get("after"),
+            variables.get("since") if connection_name == "issues" else None
+        )
+        return {"repository": {connection_name: connection}}, 1
+
+    def _graphql_batch_first_pages(self, query: str, variables: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        BatchFirstPages（r0, r1, ... のエイリアスごとに最初のページを返す）
+        """
+        dataset = self.server.dataset
+        data: Dict[str, Any] = {}
+        index = 0
+        while f"owner{index}" in variables:
+            owner, name = variables[f"owner{index}"], variables[f"name{index}"]
+            if dataset.has_repo(owner, name):
+                repository = dataset.repository(name)
+                block = {
+                    "issues": self._connection(
+                        repository["issues"], query, variables.get("first", 100), None, variables.get(f"since{index}")
+                    )
+                }
+                if "pullRequests(" in query:
+                    block["pullRequests"] = self._connection(
+                        repository["pullRequests"], query, variables.get("first", 100), None
+                    )
+                data[f"r{index}"] = block
+            else:
+                data[f"r{index}"] = None
+            index += 1
+        return data, max(index, 1)
+
+    def _graphql_repo_metadata(self, query: str, variables: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        RepoMetadata（r0, r1, ... のエイリアスごとに最終push日時と最新のissue/PRの更新日時を返す）
+        """
+        dataset = self.server.dataset
+        data: Dict[str, Any] = {}
+        index = 0
+        while f"owner{index}" in variables:
+            owner, name = variables[f"owner{index}"], variables[f"name{index}"]
+            if dataset.has_repo(owner, name):
+                repository = dataset.repository(name)
+                block: Dict[str, Any] = {
+                    "pushedAt": repository["pushedAt"],
+                    "updatedAt": repository["pushedAt"],
+                    "defaultBranchRef": {"name": DEFAULT_BRANCH},
+                }
+                for connection_name in ("issues", "pullRequests"):
+                    items = repository[connection_name]
+                    block[connection_name] = {"nodes": [{"updatedAt": items[0]["updatedAt"]}] if items else []}
+                data[f"r{index}"] = block
+            else:
+                data[f"r{index}"] = None
+            index += 1
+        return data, 1
+
+    def _graphql_item_comments(self, query: str, variables: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        ItemComments（コメントを新しい方から last/before で遡る）
+        """
+        dataset = self.server.dataset
+        if not dataset.has_repo(variables.get("owner", ""), variables.get("name", "")):
+            return {"repository": None}, 1
+        repository = dataset.repository(variables["name"])
+        number = variables.get("number")
+        item = next(
+            (item for item in repository["issues"] + repository["pullRequests"] if item["number"] == number),
+            None
+        )
+        if item is None:
+            return {"repository": {"issueOrPullRequest": None}}, 1
+
+        comments = item["comments"]
+        end = decode_cursor(variables.get("before")) if variables.get("before") else len(comments)
+        start = max(end - min(max(int(variables.get("last", 50)), 1), self.server.max_page_size), 0)
+        connection = {
+            "pageInfo": {"hasPreviousPage": start > 0, "startCursor": encode_cursor(start)},
+            "nodes": comments[start:end],
+        }
+        return {"repository": {"issueOrPullRequest": {"comments": connection}}}, 1
+
+    def _graphql_pull_request_reviews(self, query: str, variables: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        PullRequestReviews（エイリアスごとにPRのレビューとレビュースレッドを返す）
+        """
+        dataset = self.server.dataset
+        if not dataset.has_repo(variables.get("owner", ""), variables.get("name", "")):
+            return {"repository": None}, 1
+
+        def limit(pattern: str, default: int) -> int:
+            match = re.search(pattern, query)
+            return int(match.group(1)) if match else default
+
+        review_limit = limit(r"reviews\(last: (\d+)\)", 20)
+        thread_limit = limit(r"reviewThreads\(last: (\d+)\)", 20)
+        comment_limit = limit(r"comments\(last: (\d+)\)", 5)
+
+        repository: Dict[str, Any] = {}
+        for alias, variable in re.findall(r"(\w+): pullRequest\(number: \$(\w+)\)", query):
+            number = variables.get(variable)
+            generated = dataset.pull_request_reviews(variables["name"], number)
+            if generated is None:
+                repository[alias] = None
+                continue
+            reviews, threads = generated
+            item = dataset.repository(variables["name"])["items"][number]
+            repository[alias] = {
+                "updatedAt": item["updatedAt"],
+                "reviews": {"totalCount": len(reviews), "nodes": reviews[-review_limit:]},
+                "reviewThreads": {
+                    "totalCount": len(threads),
+                    "nodes": [
+                        {
+                            "id": thread["id"],
+                            "isResolved": thread["isResolved"],
+                            "path": thread["path"],
+                            "comments": {
+                                "totalCount": len(thread["comments"]),
+                                "nodes": thread["comments"][-comment_limit:],
+                            },
+                        }
+                        for thread in threads[-thread_limit:]
+                    ],
+                },
+            }
+        return {"repository": repository}, 1
+
+    def _send_json(self, status: int, payload: JsonValue, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        JSONレスポンスを送信
+        """
+        self._send_raw(status, headers or {}, json.dumps(payload).encode("utf-8"))
+
+    def _send_raw(self, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """
+        レスポンスを送信
+        """
+        self.send_response(status)
+        headers = {"Content-Type": "application/json; charset=utf-8", **headers}
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(server: StubGitHubServer) -> threading.Thread:
+    """
+    サーバーをバックグラウンドのスレッドで起動
+
+    Args:
+        server: スタブサーバー
+
+    Returns:
+        サーバーを動かしているスレッド
+    """
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
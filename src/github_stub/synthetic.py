@@ -0,0 +1,290 @@
+"""
+スタブサーバーが返す合成データの生成モジュール
+
+シードが同じであれば同じデータを生成するため、ベンチマーク結果を再現できる。
+"""
+import hashlib
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.github_client import to_github_datetime
+
+# 合成リポジトリのデフォルトブランチ名
+DEFAULT_BRANCH = "main"
+
+AUTHORS = ["alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi"]
+REVIEW_STATES = ["APPROVED", "CHANGES_REQUESTED", "COMMENTED"]
+LABELS = [
+    {"name": "bug", "description": "Something isn't working", "color": "d73a4a"},
+    {"name": "enhancement", "description": "New feature or request", "color": "a2eeef"},
+    {"name": "documentation", "description": "Improvements or additions to documentation", "color": "0075ca"},
+    {"name": "good first issue", "description": "Good for newcomers", "color": "7057ff"},
+]
+
+
+class SyntheticGitHub:
+    """組織・リポジトリ・issue/PR・コメント・コミットを決定的に生成するクラス"""
+
+    def __init__(
+        self,
+        org: str = "team-mirai-volunteer",
+        repos: int = 3,
+        issues: int = 200,
+        pull_requests: int = 100,
+        comments: int = 3,
+        commits: int = 500,
+        span_days: int = 60,
+        dormant_repos: int = 0,
+        seed: int = 0,
+        now: Optional[datetime] = None
+    ):
+        """
+        生成条件を初期化
+
+        Args:
+            org: 組織名
+            repos: リポジトリ数
+            issues: リポジトリあたりのissue数
+            pull_requests: リポジトリあたりのPR数
+            comments: アイテムあたりの最大コメント数
+            commits: リポジトリあたりのコミット数
+            span_days: 更新日時・コミット日時を分布させる日数（現在から遡る）
+            dormant_repos: 1年以上前から更新のないリポジトリの数（repos のうち末尾のもの、半数はアーカイブ済み）
+            seed: 乱数シード
+            now: 基準日時（指定しない場合は現在時刻）
+        """
+        self.org = org
+        self.repo_names = [f"repo-{index:02d}" for index in range(repos)]
+        self.issue_count = issues
+        self.pull_request_count = pull_requests
+        self.max_comments = comments
+        self.commit_count = commits
+        self.span = timedelta(days=span_days)
+        self.dormant_names = self.repo_names[len(self.repo_names) - min(dormant_repos, repos):]
+        self.seed = seed
+        self.now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+        self._repos: Dict[str, Dict[str, Any]] = {}
+        self._reviews: Dict[Tuple[str, int], Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def _random(self, repo: str) -> random.Random:
+        """
+        リポジトリごとに独立した乱数生成器（生成順序に依存しないようにする）
+        """
+        digest = hashlib.sha256(f"{self.seed}:{repo}".encode("utf-8")).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def _time_before(self, rng: random.Random, latest: datetime, span: timedelta) -> datetime:
+        """
+        latest から span 以内の過去の日時をランダムに選ぶ
+        """
+        return latest - timedelta(seconds=rng.randint(0, max(int(span.total_seconds()), 1)))
+
+    def has_repo(self, owner: str, name: str) -> bool:
+        """
+        合成データにリポジトリが存在するか
+
+        Args:
+            owner: オーナー名
+            name: リポジトリ名
+
+        Returns:
+            存在する場合はTrue
+        """
+        return owner == self.org and name in self.repo_names
+
+    def repository(self, name: str) -> Dict[str, Any]:
+        """
+        リポジトリの全データを取得（初回アクセス時に生成）
+
+        Args:
+            name: リポジトリ名
+
+        Returns:
+            issues / pullRequests / commits / pushedAt を持つ辞書
+        """
+        with self._lock:
+            if name not in self._repos:
+                self._repos[name] = self._generate(name)
+            return self._repos[name]
+
+    def _generate(self, name: str) -> Dict[str, Any]:
+        """
+        1リポジトリ分のデータを生成
+        """
+        rng = self._random(name)
+        full_name = f"{self.org}/{name}"
+        latest_time = self.now - timedelta(days=365) - self.span if name in self.dormant_names else self.now
+
+        items: List[Dict[str, Any]] = []
+        kinds = ["issue"] * self.issue_count + ["pr"] * self.pull_request_count
+        rng.shuffle(kinds)
+        for number, kind in enumerate(kinds, start=1):
+            updated = self._time_before(rng, latest_time, self.span)
+            created = self._time_before(rng, updated, self.span)
+            closed = updated if rng.random() < 0.4 else None
+            author = rng.choice(AUTHORS)
+            path = "pull" if kind == "pr" else "issues"
+
+            comments = []
+            for index in range(rng.randint(0, self.max_comments)):
+                comment_time = created + (updated - created) * (index + 1) / (self.max_comments + 1)
+                comment_author = rng.choice(AUTHORS)
+                comments.append({
+                    "id": f"IC_{name}_{number}_{index}",
+                    "author": {"login": comment_author},
+                    "authorAssociation": "MEMBER",
+                    "body": f"Comment {index + 1} on #{number} by {comment_author}",
+                    "createdAt": to_github_datetime(comment_time),
+                    "url": f"https://github.com/{full_name}/{path}/{number}#issuecomment-{number * 100 + index}",
+                })
+
+            item = {
+                "id": f"{'PR' if kind == 'pr' else 'I'}_{name}_{number}",
+                "number": number,
+                "title": f"{'Pull request' if kind == 'pr' else 'Issue'} #{number} in {name}",
+                "body": f"Synthetic {'pull request' if kind == 'pr' else 'issue'} body for #{number}.",
+                "state": ("MERGED" if kind == "pr" else "CLOSED") if closed else "OPEN",
+                "createdAt": to_github_datetime(created),
+                "updatedAt": to_github_datetime(updated),
+                "closedAt": to_github_datetime(closed) if closed else None,
+                "url": f"https://github.com/{full_name}/{path}/{number}",
+                "author": {"login": author},
+                "assignees": {"nodes": [{"login": author, "name": author.title()}] if rng.random() < 0.5 else []},
+                "labels": {"nodes": rng.sample(LABELS, rng.randint(0, 2))},
+                "comments": comments,
+                "kind": kind,
+            }
+            if kind == "pr":
+                item.update({
+                    "mergedAt": item["closedAt"],
+                    "mergeable": "UNKNOWN" if closed else "MERGEABLE",
+                    "additions": rng.randint(1, 500),
+                    "deletions": rng.randint(0, 200),
+                    "changedFiles": rng.randint(1, 20),
+                })
+            items.append(item)
+
+        items.sort(key=lambda item: item["updatedAt"], reverse=True)
+
+        commits = []
+        for index in range(self.commit_count):
+            author = rng.choice(AUTHORS)
+            date = to_github_datetime(self._time_before(rng, latest_time, self.span))
+            sha = hashlib.sha1(f"{full_name}:{index}".encode("utf-8")).hexdigest()
+            commits.append({
+                "sha": sha,
+                "html_url": f"https://github.com/{full_name}/commit/{sha}",
+                "commit": {
+                    "author": {"name": author, "email": f"{author}@example.com", "date": date},
+                    "committer": {"name": author, "email": f"{author}@example.com", "date": date},
+                    "message": f"Synthetic commit {index} by {author}",
+                },
+                "author": {"login": author},
+            })
+        commits.sort(key=lambda commit: commit["commit"]["author"]["date"], reverse=True)
+
+        latest = [commits[0]["commit"]["author"]["date"]] if commits else []
+        return {
+            "name": name,
+            "full_name": full_name,
+            "items": {item["number"]: item for item in items},
+            "issues": [item for item in items if item["kind"] == "issue"],
+            "pullRequests": [item for item in items if item["kind"] == "pr"],
+            "commits": commits,
+            "pushedAt": max(latest + [to_github_datetime(latest_time - self.span)]),
+            "archived": name in self.dormant_names[::2],
+        }
+
+    def pull_request_reviews(self, name: str, number: int) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        PRのレビューとレビュースレッドを取得（初回アクセス時に生成）
+
+        issue/PR本体とは別の乱数で生成するため、既存の合成データは変わらない。
+
+        Args:
+            name: リポジトリ名
+            number: PR番号
+
+        Returns:
+            (レビューのリスト, レビュースレッドのリスト)。PRが存在しない場合はNone
+        """
+        item = self.repository(name)["items"].get(number)
+        if item is None or item["kind"] != "pr":
+            return None
+
+        with self._lock:
+            key = (name, number)
+            if key not in self._reviews:
+                self._reviews[key] = self._generate_reviews(name, item)
+            return self._reviews[key]
+
+    def _generate_reviews(self, name: str, item: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        1PR分のレビューとレビュースレッドを生成（作成日時から更新日時の間に分布させる）
+        """
+        rng = self._random(f"{name}#{item['number']}:reviews")
+        created = datetime.strptime(item["createdAt"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        updated = datetime.strptime(item["updatedAt"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        span = updated - created
+
+        reviews = []
+        for index in range(rng.randint(0, 4)):
+            reviewer = rng.choice(AUTHORS)
+            reviews.append({
+                "id": f"PRR_{name}_{item['number']}_{index}",
+                "author": {"login": reviewer},
+                "state": rng.choice(REVIEW_STATES),
+                "body": f"Review {index + 1} on #{item['number']} by {reviewer}",
+                "submittedAt": to_github_datetime(self._time_before(rng, updated, span)),
+                "url": f"{item['url']}#pullrequestreview-{item['number'] * 100 + index}",
+            })
+        reviews.sort(key=lambda review: review["submittedAt"])
+
+        threads = []
+        for index in range(rng.randint(0, 3)):
+            comments = []
+            for comment_index in range(rng.randint(1, 4)):
+                commenter = rng.choice(AUTHORS)
+                comments.append({
+                    "id": f"PRRC_{name}_{item['number']}_{index}_{comment_index}",
+                    "author": {"login": commenter},
+                    "body": f"Review comment {comment_index + 1} in thread {index + 1} by {commenter}",
+                    "createdAt": to_github_datetime(self._time_before(rng, updated, span)),
+                    "url": f"{item['url']}#discussion_r{item['number'] * 1000 + index * 10 + comment_index}",
+                })
+            comments.sort(key=lambda comment: comment["createdAt"])
+            threads.append({
+                "id": f"PRRT_{name}_{item['number']}_{index}",
+                "isResolved": rng.random() < 0.5,
+                "path": f"src/module_{rng.randint(1, 9)}.py",
+                "comments": comments,
+            })
+        threads.sort(key=lambda thread: thread["comments"][0]["createdAt"])
+
+        return reviews, threads
+
+    def org_repositories(self) -> List[Dict[str, Any]]:
+        """
+        組織のリポジトリ一覧（REST `orgs/{org}/repos` の形式）
+
+        Returns:
+            リポジトリのリスト
+        """
+        repos = []
+        for name in self.repo_names:
+            data = self.repository(name)
+            repos.append({
+                "name": name,
+                "full_name": data["full_name"],
+                "private": False,
+                "fork": False,
+                "archived": data["archived"],
+                "default_branch": DEFAULT_BRANCH,
+                "pushed_at": data["pushedAt"],
+                "updated_at": data["pushedAt"],
+                "html_url": f"https://github.com/{data['full_name']}",
+            })
+        return repos
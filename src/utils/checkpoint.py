@@ -0,0 +1,103 @@
+"""
+複数リポジトリの収集処理のチェックポイント管理モジュール
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+
+from .sync_state import SyncState
+
+_RUN_KEY = "__run__"
+
+
+class Checkpoint(SyncState):
+    """
+    リポジトリごと・ページごとの進捗を記録し、中断した実行を再開できるようにするクラス
+
+    進捗はリポジトリ名をキーとして SyncState と同じ形式で保存する。実行条件（期間など）が
+    異なるチェックポイントは再開に使わない。
+    """
+
+    def __init__(self, checkpoint_file: Union[str, Path], run: Dict[str, Any], resume: bool = False):
+        """
+        チェックポイントを初期化
+
+        Args:
+            checkpoint_file: チェックポイントファイルのパス
+            run: 実行条件（再開時に一致を確認する）
+            resume: 既存のチェックポイントから再開するか（Falseの場合は破棄して新しく始める）
+        """
+        super().__init__(checkpoint_file)
+        self.data_dir = self.state_file.with_suffix("")
+
+        stored_run = self._state.get(_RUN_KEY)
+        if resume and stored_run is not None and stored_run != run:
+            print(f"チェックポイントの実行条件が異なるため再開せずに最初から実行します: {self.state_file}")
+        if not resume or stored_run != run:
+            self.clear()
+            super().update(_RUN_KEY, **run)
+
+        self.resumed = resume and stored_run == run
+
+    def announce_resume(self, keys: Iterable[str]) -> None:
+        """
+        前回の実行から再開した場合に、完了済み・途中まで取得済みのリポジトリ数を表示
+
+        Args:
+            keys: 処理対象のリポジトリ名
+        """
+        if not self.resumed:
+            return
+        entries = [self.get(key) for key in keys]
+        done = sum(1 for entry in entries if entry.get("status") == "done")
+        started = sum(1 for entry in entries if entry and entry.get("status") != "done")
+        print(f"チェックポイント {self.state_file} から再開します（完了済み: {done}件, 途中まで取得済み: {started}件）")
+
+    def is_done(self, key: str) -> bool:
+        """
+        リポジトリの処理が完了しているか
+
+        Args:
+            key: リポジトリ名
+
+        Returns:
+            完了している場合はTrue
+        """
+        return self.get(key).get("status") == "done"
+
+    def data_path(self, key: str) -> Path:
+        """
+        リポジトリごとの途中結果を保存するファイルのパス
+
+        Args:
+            key: リポジトリ名
+
+        Returns:
+            途中結果ファイルのパス
+        """
+        return self.data_dir / f"{key.replace('/', '__')}.jsonl"
+
+    def reset(self, key: str) -> None:
+        """
+        リポジトリの進捗と途中結果を破棄
+
+        Args:
+            key: リポジトリ名
+        """
+        with self._lock:
+            self._state.pop(key, None)
+            self._save()
+        data_path = self.data_path(key)
+        if data_path.exists():
+            data_path.unlink()
+
+    def clear(self) -> None:
+        """
+        すべての進捗と途中結果を破棄（実行がすべて成功した場合や、新しく始める場合に使う）
+        """
+        with self._lock:
+            self._state = {}
+            if self.state_file.exists():
+                self.state_file.unlink()
+        if self.data_dir.exists():
+            for data_path in self.data_dir.glob("*.jsonl"):
+                data_path.unlink()
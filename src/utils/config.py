@@ -24,6 +24,19 @@ class Config:
         self._config = {
             "github": {
                 "token": os.getenv("GITHUB_TOKEN"),
+                "api_url": os.getenv("GITHUB_API_URL", "https://api.github.com"),
+                "record_dir": os.getenv("GITHUB_RECORD_DIR"),
+                "webhook_secret": os.getenv("GITHUB_WEBHOOK_SECRET"),
+                "max_retries": os.getenv("GITHUB_MAX_RETRIES", "4"),
+                "hedge_after": os.getenv("GITHUB_HEDGE_AFTER"),
+                "stats_file": os.getenv("GITHUB_STATS_FILE"),
+                "mirror_url": os.getenv("GITHUB_MIRROR_URL", "https://github.com/{repo}.git"),
+                "http_cache_dir": os.getenv(
+                    "GITHUB_HTTP_CACHE_DIR",
+                    os.path.join(os.getenv("OUTPUT_DIR", "./data"), "state", "http_cache")
+                ),
+                "http_cache_max_age_days": os.getenv("GITHUB_HTTP_CACHE_MAX_AGE_DAYS"),
+                "http_cache_max_mb": os.getenv("GITHUB_HTTP_CACHE_MAX_MB"),
             },
             "openai": {
                 "api_key": os.getenv("OPENAI_API_KEY"),
@@ -0,0 +1,63 @@
+"""
+コンソール出力ユーティリティ
+"""
+import io
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
+
+class _ThreadLocalStdout:
+    """スレッドごとに出力先を切り替えられる標準出力のプロキシ"""
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self) -> None:
+        buffer = getattr(self._local, "buffer", None)
+        (buffer or self._stream).flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+
+_proxy_lock = threading.Lock()
+
+
+def _install_proxy() -> _ThreadLocalStdout:
+    """
+    標準出力をスレッドローカルなプロキシに差し替える（初回のみ）
+
+    Returns:
+        プロキシ
+    """
+    with _proxy_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStdout):
+            sys.stdout = _ThreadLocalStdout(sys.stdout)
+        return sys.stdout
+
+
+@contextmanager
+def capture_output() -> Iterator[io.StringIO]:
+    """
+    現在のスレッドの print 出力をバッファに溜める
+
+    並列実行時にリポジトリごとの出力を混在させず、後から決まった順序で表示するために使う。
+
+    Returns:
+        出力が溜まるバッファ
+    """
+    proxy = _install_proxy()
+    buffer = io.StringIO()
+    previous = getattr(proxy._local, "buffer", None)
+    proxy._local.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        proxy._local.buffer = previous
@@ -3,8 +3,15 @@
 """
 import json
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
 
 def ensure_dir(path: Union[str, Path]) -> None:
     """
@@ -15,6 +22,28 @@ def ensure_dir(path: Union[str, Path]) -> None:
     """
     Path(path).mkdir(parents=True, exist_ok=True)
 
+@contextmanager
+def file_lock(path: Union[str, Path]) -> Iterator[None]:
+    """
+    ファイルの隣の `.lock` ファイルでプロセス間の排他ロックを取る
+    
+    Webhook受信サーバーと収集処理のように、別のプロセスが同じファイルを読み込んで
+    書き換える場合に、読み込みから置き換えまでを囲む。fcntl のない環境ではロックしない。
+    
+    Args:
+        path: 保護するファイルのパス
+    """
+    lock_path = Path(f"{path}.lock")
+    ensure_dir(lock_path.parent)
+    with open(lock_path, 'a') as f:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
 def read_json_file(file_path: Union[str, Path]) -> List[Dict[str, Any]]:
     """
     JSONファイルを読み込む
@@ -51,6 +80,69 @@ def write_json_file(data: List[Dict[str, Any]], file_path: Union[str, Path]) ->
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
+def write_json_items(items: Iterable[Dict[str, Any]], file_path: Union[str, Path]) -> int:
+    """
+    アイテムを1件ずつJSON配列としてファイルに書き込む
+    
+    write_json_file と同じ形式で出力するが、全件をメモリに保持しない。
+    
+    Args:
+        items: 書き込むアイテム
+        file_path: 出力ファイルパス
+        
+    Returns:
+        書き込んだ件数
+    """
+    ensure_dir(Path(file_path).parent)
+    
+    count = 0
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write("[")
+        for item in items:
+            f.write(",\n  " if count else "\n  ")
+            f.write(json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+            count += 1
+        f.write("\n]" if count else "]")
+    
+    return count
+
+def read_json_lines(file_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    JSON Lines形式のファイルを読み込む（存在しない場合は空のリスト）
+    
+    Args:
+        file_path: JSON Linesファイルのパス
+        
+    Returns:
+        各行のデータのリスト
+    """
+    if not Path(file_path).exists():
+        return []
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def append_json_lines(items: Iterable[Dict[str, Any]], file_path: Union[str, Path]) -> int:
+    """
+    アイテムをJSON Lines形式でファイルに追記する
+    
+    Args:
+        items: 追記するアイテム
+        file_path: 出力ファイルパス
+        
+    Returns:
+        追記した件数
+    """
+    ensure_dir(Path(file_path).parent)
+    
+    count = 0
+    with open(file_path, 'a', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            count += 1
+    
+    return count
+
 def read_text_file(file_path: Union[str, Path]) -> str:
     """
     テキストファイルを読み込む
@@ -0,0 +1,159 @@
+"""
+GitHub APIレスポンスをフィクスチャとして記録するモジュール
+
+記録したフィクスチャは `python -m src.github_stub serve --fixtures <dir>` で再生できる。
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+import re
+from typing import Any, Dict, Mapping, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .file_utils import ensure_dir
+
+# 再生時にも返すレスポンスヘッダー
+RECORDED_HEADERS = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Link",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+    "X-RateLimit-Resource",
+)
+
+_LINK_URL_PATTERN = re.compile(r"<([^>]*)>")
+
+# 実行時刻から計算されるGraphQLの変数（レポート期間の開始日時）。キーに含めると記録した時刻
+# 以外では再生できないため、本文のハッシュからは除く
+TIME_DEPENDENT_VARIABLES = re.compile(r"^since\d*$")
+
+
+def fixture_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """
+    リクエストからフィクスチャのキーを作成
+
+    ホスト名は含めないため、記録したフィクスチャは任意のスタブサーバーで再生できる。
+    GraphQLのように本文で内容が決まるリクエストは本文のハッシュもキーに含める。
+    ただし実行時刻から計算される変数（TIME_DEPENDENT_VARIABLES）は除くため、記録した後の
+    任意の時刻に再生できる。
+
+    Args:
+        method: HTTPメソッド
+        url: クエリパラメータを含むURLまたはパス
+        body: リクエスト本文
+
+    Returns:
+        フィクスチャのキー
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{method.upper()} {parts.path.rstrip('/') or '/'}"
+    if query:
+        key += f"?{query}"
+    if body:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            normalized = body
+        else:
+            if isinstance(payload, dict) and isinstance(payload.get("variables"), dict):
+                payload["variables"] = {
+                    name: value for name, value in payload["variables"].items()
+                    if not TIME_DEPENDENT_VARIABLES.match(name)
+                }
+            # GraphQLの本文はキーの順序や空白の違いを無視して比較する
+            normalized = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        key += f" #{hashlib.sha256(normalized).hexdigest()[:16]}"
+    return key
+
+
+def fixture_filename(key: str) -> str:
+    """
+    フィクスチャのキーからファイル名を作成
+
+    Args:
+        key: フィクスチャのキー
+
+    Returns:
+        ファイル名
+    """
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:24] + ".json"
+
+
+class FixtureRecorder:
+    """実際のレスポンスをフィクスチャファイルに書き出すクラス"""
+
+    def __init__(self, fixture_dir: Union[str, Path], base_url: str = ""):
+        """
+        記録先を初期化
+
+        Args:
+            fixture_dir: フィクスチャの保存ディレクトリ
+            base_url: APIのベースURL（記録時にURLから取り除く。GitHub Enterpriseの `/api/v3` など）
+        """
+        self.fixture_dir = Path(fixture_dir)
+        self.base_url = base_url.rstrip("/")
+        self.base_path = urlsplit(base_url).path.rstrip("/")
+        self._lock = threading.Lock()
+        ensure_dir(self.fixture_dir)
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        request_body: Optional[bytes],
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes
+    ) -> None:
+        """
+        1件のリクエストとレスポンスを記録
+
+        Args:
+            method: HTTPメソッド
+            url: クエリパラメータを含む完全なURL
+            request_body: リクエスト本文
+            status: ステータスコード
+            headers: レスポンスヘッダー
+            body: レスポンス本文
+        """
+        parts = urlsplit(url)
+        path = parts.path
+        if self.base_path and path.startswith(self.base_path):
+            path = path[len(self.base_path):] or "/"
+        relative_url = path + (f"?{parts.query}" if parts.query else "")
+
+        recorded_headers = {name: headers[name] for name in RECORDED_HEADERS if headers.get(name)}
+        if "Link" in recorded_headers:
+            # ページングのリンクは再生するサーバーのホストに付け替えられるようにパスだけ残す
+            recorded_headers["Link"] = _LINK_URL_PATTERN.sub(
+                lambda match: f"<{match.group(1)[len(self.base_url):] if match.group(1).startswith(self.base_url) else match.group(1)}>",
+                recorded_headers["Link"]
+            )
+
+        key = fixture_key(method, relative_url, request_body)
+        fixture: Dict[str, Any] = {
+            "key": key,
+            "request": {
+                "method": method.upper(),
+                "url": relative_url,
+                "body": request_body.decode("utf-8") if request_body else None,
+            },
+            "response": {
+                "status": status,
+                "headers": recorded_headers,
+                "body": body.decode("utf-8"),
+            },
+        }
+
+        path_on_disk = self.fixture_dir / fixture_filename(key)
+        with self._lock:
+            tmp_path = path_on_disk.with_name(path_on_disk.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(fixture, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path_on_disk)
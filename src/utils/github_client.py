@@ -0,0 +1,668 @@
+"""
+GitHub APIクライアント
+
+issue/PR収集（github_logger）とコミット統計収集（commit_collector）が共有する。
+トークンの解決とHTTPセッションはプロセス内で1回だけ行う。
+"""
+import hashlib
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import Config
+from .file_utils import append_json_lines
+from .fixture_recorder import FixtureRecorder
+from .http_cache import DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_BYTES, HttpCache
+from .json_stream import iter_json_array
+from .rate_limiter import PRIORITY_HIGH, RateLimitScheduler, get_scheduler, resource_for_path
+from .resilience import RETRY_STATUSES, CircuitBreaker, RetryPolicy
+
+GITHUB_API_URL = "https://api.github.com"
+
+# レート制限（403/429）を受けたときに待機して再送する回数
+RATE_LIMIT_RETRIES = 3
+
+# セカンダリレート制限で Retry-After がない場合に待つ秒数（再送のたびに倍にする）
+SECONDARY_RATE_LIMIT_WAIT = 60.0
+
+# REST一覧の本文を逐次デコードする際に1回に読み込むバイト数
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_OPERATION_NAME_PATTERN = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+
+JsonObject = Dict[str, Any]
+JsonValue = Union[JsonObject, List[Any]]
+
+
+class GitHubAPIError(Exception):
+    """GitHub API呼び出しエラー"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        """
+        エラーを初期化
+
+        Args:
+            message: エラーメッセージ
+            status_code: HTTPステータスコード（通信エラーの場合はNone）
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def to_github_datetime(value: datetime) -> str:
+    """
+    datetimeをGitHub APIが返す形式（UTCのISO 8601）の文字列に変換
+
+    Args:
+        value: タイムゾーン付きのdatetime
+
+    Returns:
+        `YYYY-MM-DDTHH:MM:SSZ` 形式の文字列
+    """
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+_token_lock = threading.Lock()
+_token_resolved = False
+_token: Optional[str] = None
+
+
+def get_github_token(config: Optional[Config] = None) -> Optional[str]:
+    """
+    GitHubトークンを取得（プロセス内で1回だけ解決する）
+
+    GITHUB_TOKEN が設定されていればそれを使い、なければGitHub CLIから取得する。
+
+    Args:
+        config: 設定オブジェクト
+
+    Returns:
+        GitHubトークン
+    """
+    global _token_resolved, _token
+
+    with _token_lock:
+        if _token_resolved:
+            return _token
+
+        _token = (config or Config()).get("github.token")
+        if not _token:
+            try:
+                result = subprocess.run(['gh', 'auth', 'token'], capture_output=True, text=True, check=True)
+                _token = result.stdout.strip() or None
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                _token = None
+
+        if not _token:
+            print("GitHub CLIでの認証が必要です。'gh auth login' を実行するか GITHUB_TOKEN を設定してください。")
+
+        _token_resolved = True
+        return _token
+
+
+class GitHubClient:
+    """GitHub API クライアント（keep-aliveセッションを使い回す）"""
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str = GITHUB_API_URL,
+        pool_size: int = 10,
+        timeout: float = 60.0,
+        scheduler: Optional[RateLimitScheduler] = None,
+        cache: Optional[HttpCache] = None,
+        recorder: Optional[FixtureRecorder] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge_after: Optional[float] = None
+    ):
+        """
+        クライアントを初期化
+
+        Args:
+            token: GitHubトークン
+            api_url: APIのベースURL
+            pool_size: コネクションプールのサイズ
+            timeout: リクエストのタイムアウト（秒）
+            scheduler: レート制限スケジューラ（指定しない場合はプロセス共有のもの）
+            cache: RESTのGETレスポンスの条件付きリクエスト用キャッシュ（Noneの場合は使わない）
+            recorder: レスポンスをフィクスチャとして記録する場合の記録先
+            retry: 5xx・通信エラーの再試行ポリシー（指定しない場合は既定値）
+            breaker: ホストごとのサーキットブレーカー（指定しない場合は既定値）
+            hedge_after: 読み取りリクエストがこの秒数で応答しない場合に同じリクエストをもう1つ送る
+                （Noneの場合は送らない）
+        """
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self.scheduler = scheduler or get_scheduler()
+        self.cache = cache
+        self.recorder = recorder
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge_after = hedge_after
+        self.retried = 0
+        self.hedged = 0
+        # 再試行・ヘッジ・キャッシュの回数は複数のスレッドから更新するためロックで保護する
+        self._stats_lock = threading.Lock()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+        self._pool_size = pool_size
+        self.token_key = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        self._graphql_costs: Dict[str, int] = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "github-activity-reporter",
+        })
+
+    def _url(self, path: str) -> str:
+        """
+        APIパスを完全なURLに変換（完全なURLはそのまま返す）
+        """
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.api_url}/{path.lstrip('/')}"
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        priority: int = PRIORITY_HIGH,
+        cost: int = 1,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        レート制限に合わせて待機してからHTTPリクエストを送信し、2xx以外はGitHubAPIErrorにする
+
+        レート制限はリセットまで待って再送し、5xx・通信エラーは指数バックオフで再試行する。
+        失敗が続いたホストはサーキットブレーカーで一時的に止め、すぐにエラーにする。
+        """
+        resource = resource_for_path(url.split("?", 1)[0])
+        host = urlsplit(url).netloc
+        if idempotent is None:
+            idempotent = method == "GET"
+
+        cache_key = None
+        if self.cache is not None and method == "GET" and self.cache.cacheable(url):
+            prepared_url = requests.Request(method, url, params=kwargs.get("params")).prepare().url
+            cache_key = self.cache.make_key(self.token_key, prepared_url)
+            kwargs["headers"] = {**kwargs.get("headers", {}), **self.cache.validators(cache_key)}
+
+        rate_limit_attempts = 0
+        transient_attempts = 0
+        while True:
+            if not self.breaker.allow(host):
+                raise GitHubAPIError(
+                    f"{method} {url} を送信しませんでした: {host} への失敗が続いているため停止中です"
+                    f"（あと{self.breaker.retry_in(host):.0f}秒）"
+                )
+
+            self.scheduler.acquire(self.token_key, resource, priority, cost)
+            try:
+                response = self._send(method, url, resource, priority, cost, idempotent, **kwargs)
+            except requests.RequestException as e:
+                self.breaker.record_failure(host)
+                if transient_attempts >= self.retry.max_retries:
+                    raise GitHubAPIError(f"{method} {url} に失敗しました: {e}") from e
+                delay = self.retry.delay(transient_attempts)
+                transient_attempts += 1
+                self._count("retried")
+                print(f"{method} {url} の通信に失敗しました（{e.__class__.__name__}）。{delay:.1f}秒後に再試行します")
+                time.sleep(delay)
+                continue
+
+            self.scheduler.update_from_headers(self.token_key, response.headers, resource)
+
+            if response.status_code in RETRY_STATUSES:
+                self.breaker.record_failure(host)
+                if transient_attempts >= self.retry.max_retries:
+                    break
+                delay = self.retry.delay(transient_attempts, self._retry_after(response))
+                transient_attempts += 1
+                self._count("retried")
+                print(f"{method} {url} が HTTP {response.status_code} を返しました。{delay:.1f}秒後に再試行します")
+                response.close()
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success(host)
+
+            wait = self._rate_limit_wait(response, rate_limit_attempts)
+            if wait is None or rate_limit_attempts == RATE_LIMIT_RETRIES:
+                break
+            rate_limit_attempts += 1
+            print(f"GitHub APIのレート制限に達しました（HTTP {response.status_code}）。{wait:.0f}秒後に再送します")
+            response.close()
+            self.scheduler.block(self.token_key, resource, wait)
+
+        if cache_key is not None:
+            response = self._apply_cache(cache_key, response)
+
+        if self.recorder is not None:
+            request_body = response.request.body
+            if isinstance(request_body, str):
+                request_body = request_body.encode("utf-8")
+            self.recorder.record(
+                method, response.request.url, request_body, response.status_code, response.headers, response.content
+            )
+
+        if not 200 <= response.status_code < 300:
+            raise GitHubAPIError(
+                f"{method} {url} に失敗しました: HTTP {response.status_code} {response.text[:200]}",
+                status_code=response.status_code
+            )
+
+        return response
+
+    def _apply_cache(self, cache_key: str, response: requests.Response) -> requests.Response:
+        """
+        304応答をキャッシュ済みの本文で200応答に置き換え、200応答はキャッシュに保存する
+        """
+        if response.status_code == 304:
+            cached = self.cache.load(cache_key)
+            if cached is None:
+                return response
+            headers, body = cached
+            with self._stats_lock:
+                self.cache.hits += 1
+            # 304応答の空の本文を読み切ってから置き換える（逐次読み込みでもキャッシュの本文を返すため）
+            response.content
+            response.status_code = 200
+            response._content = body
+            response.headers.update(headers)
+            return response
+
+        if response.status_code == 200 and self.cache.save(cache_key, response.headers, response.content):
+            with self._stats_lock:
+                self.cache.misses += 1
+
+        return response
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        resource: str,
+        priority: int,
+        cost: int,
+        idempotent: bool,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        リクエストを送信（読み取りリクエストが hedge_after 秒以内に応答しない場合は同じものをもう1つ送り、
+        先に応答した方を使う）
+        """
+        if not idempotent or self.hedge_after is None:
+            return self.session.request(method, url, timeout=self.timeout, **kwargs)
+
+        executor = self._get_hedge_executor()
+        primary = executor.submit(self.session.request, method, url, timeout=self.timeout, **kwargs)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        self.scheduler.acquire(self.token_key, resource, priority, cost)
+        self._count("hedged")
+        secondary = executor.submit(self.session.request, method, url, timeout=self.timeout, **kwargs)
+
+        pending = {primary, secondary}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                # 遅れて届いた方のレスポンスは読まずに閉じる
+                for other in pending:
+                    other.add_done_callback(_close_response)
+                for other in done - {future}:
+                    _close_response(other)
+                return future.result()
+        raise error
+
+    def _count(self, name: str) -> None:
+        """
+        再試行・ヘッジの回数を加算
+        """
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        このクライアントで再試行・ヘッジしたリクエスト数と、キャッシュの利用状況
+
+        Returns:
+            retried / hedged / cache_hits / cache_misses の辞書
+            （cache_hits は304応答をキャッシュ済みの本文で返した数、cache_misses は200応答を保存した数）
+        """
+        with self._stats_lock:
+            return {
+                "retried": self.retried,
+                "hedged": self.hedged,
+                "cache_hits": self.cache.hits if self.cache is not None else 0,
+                "cache_misses": self.cache.misses if self.cache is not None else 0,
+            }
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """
+        ヘッジリクエスト用のスレッドプール（初回使用時に作成）
+        """
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self._pool_size * 2)
+            return self._hedge_executor
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """
+        Retry-After ヘッダーの秒数（ない・解析できない場合はNone）
+        """
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _rate_limit_wait(response: requests.Response, attempt: int = 0) -> Optional[float]:
+        """
+        レスポンスがレート制限によるものであれば、再送までに待つ秒数を返す
+
+        セカンダリレート制限で待ち時間の指定がない場合は、再送のたびに待ち時間を倍にする。
+        """
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 1.0)
+            except ValueError:
+                return SECONDARY_RATE_LIMIT_WAIT * (2 ** attempt)
+
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = float(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+            return max(reset - time.time(), 1.0)
+
+        if response.status_code == 429 or "secondary rate limit" in response.text.lower():
+            return SECONDARY_RATE_LIMIT_WAIT * (2 ** attempt)
+
+        return None
+
+    def rest(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        method: str = "GET",
+        priority: int = PRIORITY_HIGH
+    ) -> JsonValue:
+        """
+        REST APIを呼び出す
+
+        Args:
+            path: APIパス（例: `repos/owner/repo/commits`）または完全なURL
+            params: クエリパラメータ
+            method: HTTPメソッド
+            priority: レート制限上の優先度
+
+        Returns:
+            レスポンスのJSON
+        """
+        response = self._request(method, self._url(path), priority=priority, params=params)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise GitHubAPIError(f"{path} のレスポンスの解析に失敗しました: {e}") from e
+
+    def rest_pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_HIGH
+    ) -> Iterator[List[JsonObject]]:
+        """
+        REST APIの一覧をLinkヘッダーに従って1ページずつ取得
+
+        Args:
+            path: APIパス
+            params: 最初のページのクエリパラメータ（2ページ目以降はnextリンクに含まれる）
+            priority: レート制限上の優先度
+
+        Returns:
+            ページごとの要素のリストのイテレータ
+        """
+        for page, _ in self.rest_page_links(path, params, priority):
+            yield page
+
+    def rest_page_links(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_HIGH,
+        start_url: Optional[str] = None
+    ) -> Iterator[Tuple[List[JsonObject], Optional[str]]]:
+        """
+        REST APIの一覧を1ページずつ取得し、次のページのURLも返す（中断した取得の再開に使う）
+
+        Args:
+            path: APIパス
+            params: 最初のページのクエリパラメータ
+            priority: レート制限上の優先度
+            start_url: 取得を再開するページのURLまたはAPIパス（前回返された次のページのURL）
+
+        Returns:
+            (ページの要素のリスト, 次のページのURL) のイテレータ（最後のページでは次のURLはNone）
+        """
+        for items, next_url in self.rest_page_stream(path, params, priority, start_url):
+            yield list(items), next_url
+
+    def rest_page_stream(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_HIGH,
+        start_url: Optional[str] = None
+    ) -> Iterator[Tuple[Iterator[JsonObject], Optional[str]]]:
+        """
+        REST APIの一覧を1ページずつ取得し、ページの要素を本文の受信に合わせて1件ずつデコードして返す
+
+        本文全体の文字列やページ全体のリストを作らないため、大きなページでも要素1件分の
+        メモリで処理できる（キャッシュ・記録が有効な場合は本文を保存するため1ページ分になる）。
+        要素のイテレータは次のページに進む前に読み切ること（残りは捨てられる）。
+
+        Args:
+            path: APIパス
+            params: 最初のページのクエリパラメータ
+            priority: レート制限上の優先度
+            start_url: 取得を再開するページのURLまたはAPIパス（前回返された次のページのURL）
+
+        Returns:
+            (ページの要素のイテレータ, 次のページのURL) のイテレータ（最後のページでは次のURLはNone）
+        """
+        url: Optional[str] = self._url(start_url or path)
+        page_params = None
+        if start_url is None:
+            page_params = dict(params or {})
+            page_params.setdefault("per_page", 100)
+
+        while url:
+            response = self._request("GET", url, priority=priority, params=page_params, stream=True)
+            url = response.links.get("next", {}).get("url")
+            page_params = None
+
+            items = self._iter_response_items(response, path)
+            try:
+                yield items, url
+            finally:
+                items.close()
+
+    @staticmethod
+    def _iter_response_items(response: requests.Response, path: str) -> Iterator[JsonObject]:
+        """
+        レスポンス本文のJSON配列を受信しながら1件ずつ返す（配列でない場合は何も返さない）
+        """
+        try:
+            yield from iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        except ValueError as e:
+            raise GitHubAPIError(f"{path} のレスポンスの解析に失敗しました: {e}") from e
+        except requests.RequestException as e:
+            raise GitHubAPIError(f"{path} のレスポンスの受信に失敗しました: {e}") from e
+        finally:
+            response.close()
+
+    def graphql(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_HIGH
+    ) -> JsonObject:
+        """
+        GraphQLクエリを実行
+
+        クエリに `rateLimit { limit cost remaining resetAt }` が含まれていれば、その値で残り予算と
+        次回同じクエリを送る際の見込みコストを更新する。
+
+        Args:
+            query: GraphQLクエリ
+            variables: クエリ変数
+            priority: レート制限上の優先度
+
+        Returns:
+            レスポンスの data 部分
+        """
+        match = _OPERATION_NAME_PATTERN.match(query)
+        operation = match.group(1) if match else ""
+
+        response = self._request(
+            "POST",
+            f"{self.api_url}/graphql",
+            priority=priority,
+            cost=self._graphql_costs.get(operation, 1),
+            idempotent=not query.lstrip().startswith("mutation"),
+            json={"query": query, "variables": variables or {}}
+        )
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise GitHubAPIError(f"GraphQLレスポンスの解析に失敗しました: {e}") from e
+
+        rate_limit = (payload.get("data") or {}).get("rateLimit")
+        if isinstance(rate_limit, dict):
+            self.scheduler.update_from_graphql(self.token_key, rate_limit)
+            if operation and rate_limit.get("cost"):
+                self._graphql_costs[operation] = int(rate_limit["cost"])
+
+        if payload.get("errors"):
+            messages = ", ".join(error.get("message", "") for error in payload["errors"])
+            raise GitHubAPIError(f"GraphQLエラー: {messages}")
+
+        return payload.get("data") or {}
+
+    def close(self) -> None:
+        """
+        セッションを閉じる
+        """
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self.session.close()
+
+
+def _close_response(future: "Future[requests.Response]") -> None:
+    """
+    使わなかったヘッジリクエストのレスポンスを閉じる
+    """
+    if future.exception() is None:
+        future.result().close()
+
+
+_client_lock = threading.Lock()
+_client: Optional[GitHubClient] = None
+
+
+def get_client(config: Optional[Config] = None, pool_size: int = 10) -> Optional[GitHubClient]:
+    """
+    プロセス共有のGitHubクライアントを取得（初回呼び出し時に作成）
+
+    GITHUB_HTTP_CACHE_DIR（既定: `<OUTPUT_DIR>/state/http_cache`）にRESTレスポンスをキャッシュし、
+    ETag / Last-Modified による条件付きリクエストを送る。空文字を設定するとキャッシュを使わない。
+    キャッシュは GITHUB_HTTP_CACHE_MAX_AGE_DAYS 日使われなかったエントリと、
+    GITHUB_HTTP_CACHE_MAX_MB を超える分の古いエントリを開いたときに削除する。
+    GITHUB_API_URL を設定するとスタブサーバーなど別のAPIに接続し、GITHUB_RECORD_DIR を設定すると
+    レスポンスをフィクスチャとして記録する。5xx・通信エラーは GITHUB_MAX_RETRIES 回まで再試行し、
+    GITHUB_HEDGE_AFTER（秒）を設定すると応答の遅い読み取りリクエストを重複して送る。
+
+    Args:
+        config: 設定オブジェクト
+        pool_size: 初回作成時のコネクションプールのサイズ
+
+    Returns:
+        GitHubクライアント（トークンが取得できない場合はNone）
+    """
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            config = config or Config()
+            token = get_github_token(config)
+            if not token:
+                return None
+            api_url = config.get("github.api_url") or GITHUB_API_URL
+            cache_dir = config.get("github.http_cache_dir")
+            cache_max_age_days = float(config.get("github.http_cache_max_age_days") or DEFAULT_MAX_AGE_DAYS)
+            cache_max_mb = float(config.get("github.http_cache_max_mb") or DEFAULT_MAX_BYTES / (1 << 20))
+            record_dir = config.get("github.record_dir")
+            hedge_after = config.get("github.hedge_after")
+            _client = GitHubClient(
+                token,
+                api_url=api_url,
+                pool_size=pool_size,
+                cache=HttpCache(cache_dir, cache_max_age_days, int(cache_max_mb * (1 << 20))) if cache_dir else None,
+                recorder=FixtureRecorder(record_dir, api_url) if record_dir else None,
+                retry=RetryPolicy(max_retries=int(config.get("github.max_retries", 4))),
+                hedge_after=float(hedge_after) if hedge_after else None
+            )
+        return _client
+
+
+def report_client_stats(config: Optional[Config] = None) -> Optional[Dict[str, int]]:
+    """
+    共有クライアントの再試行・ヘッジ・キャッシュの回数を実行の最後に表示
+
+    GITHUB_STATS_FILE を設定すると、同じ内容をJSON Lines形式で追記する（ベンチマークの集計用）。
+
+    Args:
+        config: 設定オブジェクト
+
+    Returns:
+        GitHubClient.stats の結果（クライアントを作成していない場合はNone）
+    """
+    with _client_lock:
+        client = _client
+    if client is None:
+        return None
+
+    stats = client.stats()
+    print(
+        f"APIクライアント: 再試行 {stats['retried']}回, ヘッジ {stats['hedged']}回, "
+        f"キャッシュ ヒット {stats['cache_hits']}件 / 保存 {stats['cache_misses']}件"
+    )
+    stats_file = (config or Config()).get("github.stats_file")
+    if stats_file:
+        append_json_lines([stats], stats_file)
+    return stats
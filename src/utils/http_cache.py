@@ -0,0 +1,208 @@
+"""
+GitHub REST APIレスポンスの条件付きリクエスト用キャッシュ
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .file_utils import ensure_dir
+
+# 304応答時に復元するレスポンスヘッダー
+CACHED_HEADERS = ("ETag", "Last-Modified", "Link", "Content-Type")
+
+# URLが実行ごとに変わり、再利用されないためキャッシュしないパス（コミットの比較はSHAを含む）
+UNCACHED_PATHS = (re.compile(r"/repos/[^/]+/[^/]+/compare/"),)
+
+# エントリのファイルの拡張子（1行目にヘッダーのJSON、2行目以降に本文を置く）
+ENTRY_SUFFIX = ".entry"
+
+# 既定の保持期間（最後に使われてからの日数）と合計サイズの上限
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class HttpCache:
+    """
+    URLとトークン単位でレスポンス本文とETag/Last-Modifiedをディスクに保存するクラス
+
+    ヘッダーと本文は1つのファイルにまとめ、一時ファイルから置き換えるため途中で中断しても
+    不整合なエントリは残らない。開いたときに、保持期間を過ぎたエントリと、合計サイズが
+    上限を超える分の最も長く使われていないエントリを削除する。
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        キャッシュを初期化し、古いエントリを削除
+
+        Args:
+            cache_dir: キャッシュディレクトリ
+            max_age_days: 最後に使われてからこの日数を過ぎたエントリを削除する
+            max_bytes: エントリの合計サイズの上限（バイト）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        # 利用状況（GitHubClient がロックを取って更新する）
+        self.hits = 0
+        self.misses = 0
+        self.prune()
+
+    @staticmethod
+    def make_key(token_key: str, url: str) -> str:
+        """
+        キャッシュキーを作成（トークンが異なれば見える内容も異なるため、トークンもキーに含める）
+
+        Args:
+            token_key: トークンの識別子
+            url: クエリパラメータを含む完全なURL
+
+        Returns:
+            キャッシュキー
+        """
+        return hashlib.sha256(f"{token_key}\n{url}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def cacheable(url: str) -> bool:
+        """
+        URLのレスポンスをキャッシュするか
+
+        Args:
+            url: リクエストのURL
+
+        Returns:
+            キャッシュする場合はTrue
+        """
+        return not any(pattern.search(url) for pattern in UNCACHED_PATHS)
+
+    def _path(self, key: str) -> Path:
+        """
+        エントリのファイルのパス
+        """
+        return self.cache_dir / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    def _read_headers(self, path: Path) -> Optional[Dict[str, str]]:
+        """
+        エントリの1行目のヘッダーを読み込む（存在しない・壊れている場合はNone）
+        """
+        try:
+            with open(path, 'rb') as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """
+        キャッシュ済みのヘッダーと本文を読み込む（使われた時刻を更新する）
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            (ヘッダー, 本文)。キャッシュがない場合はNone
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                headers = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return headers, body
+
+    def validators(self, key: str) -> Dict[str, str]:
+        """
+        条件付きリクエストに付けるヘッダーを作成
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            If-None-Match / If-Modified-Since ヘッダー（キャッシュがない場合は空）
+        """
+        headers = self._read_headers(self._path(key))
+        if not headers:
+            return {}
+
+        conditional = {}
+        if headers.get("ETag"):
+            conditional["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
+
+    def save(self, key: str, headers: Dict[str, str], body: bytes) -> bool:
+        """
+        レスポンスを保存（ETagもLast-Modifiedもない場合は保存しない）
+
+        Args:
+            key: キャッシュキー
+            headers: レスポンスヘッダー
+            body: レスポンス本文
+
+        Returns:
+            保存した場合はTrue
+        """
+        kept = {name: headers[name] for name in CACHED_HEADERS if headers.get(name)}
+        if "ETag" not in kept and "Last-Modified" not in kept:
+            return False
+
+        path = self._path(key)
+        ensure_dir(path.parent)
+
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(kept, ensure_ascii=False).encode("utf-8") + b"\n")
+            f.write(body)
+        os.replace(tmp_path, path)
+        return True
+
+    def prune(self) -> int:
+        """
+        保持期間を過ぎたエントリと、合計サイズが上限を超える分の古いエントリを削除
+
+        以前の形式のファイル（ヘッダーと本文が別）や、中断で残った一時ファイルも削除する。
+
+        Returns:
+            削除したファイル数
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        now = time.time()
+        expire_before = now - self.max_age_days * 86400
+        entries: List[Tuple[float, int, Path]] = []
+        removed = 0
+        for path in self.cache_dir.glob("*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            # 一時ファイルは別のプロセスが書き込み中の場合があるため、時間が経ったものだけ削除する
+            stale_tmp = path.suffix == ".tmp" and stat.st_mtime < now - 3600
+            legacy = path.suffix in (".json", ".body")
+            if stale_tmp or legacy or (path.suffix == ENTRY_SUFFIX and stat.st_mtime < expire_before):
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            if path.suffix == ENTRY_SUFFIX:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
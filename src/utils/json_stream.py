@@ -0,0 +1,99 @@
+"""
+JSON配列の逐次デコードモジュール
+"""
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+
+# 読み込み済みの部分がこの文字数を超えたらバッファから捨てる
+_COMPACT_THRESHOLD = 1 << 16
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    バイト列のチャンクとして届くJSON配列を、要素が揃うたびに1件ずつ返す
+
+    本文全体の文字列や、全要素を解析したリストを保持しないため、メモリ使用量は
+    チャンクと要素1件分程度に収まる。トップレベルが配列でない場合は、JSONとして
+    正しいことだけを確認して何も返さない。
+
+    Args:
+        chunks: レスポンス本文のチャンク（`response.iter_content()` など）
+
+    Returns:
+        配列の要素のイテレータ
+
+    Raises:
+        ValueError: JSONとして解析できない場合
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunk_iter = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        # 次のチャンクをバッファに追加する（これ以上ない場合はFalse）
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        for chunk in chunk_iter:
+            text = text_decoder.decode(chunk)
+            if text:
+                if pos > _COMPACT_THRESHOLD:
+                    buffer, pos = buffer[pos:], 0
+                buffer += text
+                return True
+        buffer += text_decoder.decode(b"", final=True)
+        eof = True
+        return False
+
+    def next_char() -> str:
+        # 空白を読み飛ばして次の文字を返す（終端の場合は空文字）
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    first = next_char()
+    if first != "[":
+        while fill():
+            pass
+        json.loads(buffer[pos:])
+        return
+
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            next_char()
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            if not eof and (end >= len(buffer) or buffer[end] not in _WHITESPACE + ",]"):
+                # 数値はチャンクの境目で切れていても解析できてしまうため、区切り文字が届くまで待つ
+                if fill():
+                    continue
+            pos = end
+            yield value
+
+            separator = next_char()
+            pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise ValueError(f"JSON配列の区切りが不正です: {separator!r}")
+
+    if next_char():
+        raise ValueError("JSON配列の後に余分なデータがあります")
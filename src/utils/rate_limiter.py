@@ -0,0 +1,192 @@
+"""
+GitHub APIのレート制限を考慮したリクエストスケジューラ
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+# レポート生成に必要な取得（issue/PRなど）
+PRIORITY_HIGH = 0
+# 後回しにできる取得（コミットのバックフィルなど）
+PRIORITY_LOW = 1
+
+# 優先度ごとに残しておく予算の割合。低優先度のリクエストは予算が20%を切ったら回復を待つ
+DEFAULT_RESERVE_RATIOS = {
+    PRIORITY_HIGH: 0.0,
+    PRIORITY_LOW: 0.2,
+}
+
+# 残り予算がこの割合を下回ったら、リセットまでの残り時間に均等に分散させる
+DEFAULT_PACING_RATIO = 0.1
+
+
+@dataclass
+class RateBudget:
+    """トークン・リソース種別ごとのレート制限の状態"""
+
+    limit: int
+    remaining: int
+    reset_at: float
+    blocked_until: float = 0.0
+    last_request_at: float = 0.0
+
+
+def resource_for_path(path: str) -> str:
+    """
+    APIパスからレート制限のリソース種別を判定
+
+    Args:
+        path: APIのパスまたはURL
+
+    Returns:
+        リソース種別（core / search / graphql）
+    """
+    if path.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+class RateLimitScheduler:
+    """レスポンスヘッダーから残り予算を追跡し、リクエストの送信タイミングを調整するクラス"""
+
+    def __init__(
+        self,
+        reserve_ratios: Optional[Mapping[int, float]] = None,
+        pacing_ratio: float = DEFAULT_PACING_RATIO
+    ):
+        """
+        スケジューラを初期化
+
+        Args:
+            reserve_ratios: 優先度ごとに残しておく予算の割合
+            pacing_ratio: ペース配分を始める残り予算の割合
+        """
+        self.reserve_ratios = dict(reserve_ratios or DEFAULT_RESERVE_RATIOS)
+        self.pacing_ratio = pacing_ratio
+        self._budgets: Dict[Tuple[str, str], RateBudget] = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, token_key: str, resource: str, priority: int = PRIORITY_HIGH, cost: int = 1) -> float:
+        """
+        リクエストを送信してよいタイミングまで待つ
+
+        Args:
+            token_key: トークンの識別子
+            resource: リソース種別
+            priority: 優先度（PRIORITY_HIGH / PRIORITY_LOW）
+            cost: このリクエストで消費する見込みのポイント
+
+        Returns:
+            待機した秒数
+        """
+        waited = 0.0
+        with self._condition:
+            while True:
+                budget = self._budgets.get((token_key, resource))
+                if budget is None:
+                    return waited
+
+                now = time.time()
+                if now >= budget.reset_at and budget.reset_at > 0:
+                    budget.remaining = budget.limit
+                    budget.reset_at = 0.0
+
+                wait = budget.blocked_until - now
+                reserve = budget.limit * self.reserve_ratios.get(priority, 0.0)
+                available = budget.remaining - reserve
+
+                if wait <= 0 and available < cost and budget.reset_at > 0:
+                    wait = budget.reset_at - now
+                elif wait <= 0 and budget.remaining < budget.limit * self.pacing_ratio and budget.reset_at > 0:
+                    interval = (budget.reset_at - now) / max(available / cost, 1)
+                    wait = budget.last_request_at + interval - now
+
+                if wait <= 0:
+                    budget.remaining -= cost
+                    budget.last_request_at = now
+                    return waited
+
+                if waited == 0:
+                    print(f"GitHub APIのレート制限（{resource}）のため {wait:.1f}秒待機します（残り: {budget.remaining}）")
+                self._condition.wait(timeout=wait)
+                waited += time.time() - now
+
+    def update_from_headers(self, token_key: str, headers: Mapping[str, str], default_resource: str) -> None:
+        """
+        レスポンスヘッダー（X-RateLimit-*）から残り予算を更新
+
+        Args:
+            token_key: トークンの識別子
+            headers: レスポンスヘッダー
+            default_resource: ヘッダーにリソース種別がない場合の種別
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        limit = headers.get("X-RateLimit-Limit")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or limit is None or reset is None:
+            return
+
+        resource = headers.get("X-RateLimit-Resource", default_resource)
+        self._set(token_key, resource, int(limit), int(remaining), float(reset))
+
+    def update_from_graphql(self, token_key: str, rate_limit: Mapping[str, object]) -> None:
+        """
+        GraphQLの rateLimit { limit remaining resetAt } から残り予算を更新
+
+        Args:
+            token_key: トークンの識別子
+            rate_limit: レスポンスの rateLimit オブジェクト
+        """
+        try:
+            reset_at = datetime.fromisoformat(str(rate_limit["resetAt"]).replace("Z", "+00:00")).timestamp()
+            self._set(token_key, "graphql", int(rate_limit["limit"]), int(rate_limit["remaining"]), reset_at)
+        except (KeyError, TypeError, ValueError):
+            return
+
+    def block(self, token_key: str, resource: str, seconds: float) -> None:
+        """
+        レート制限に達したリソースへのリクエストを一定時間止める（403/429を受けた場合）
+
+        Args:
+            token_key: トークンの識別子
+            resource: リソース種別
+            seconds: 停止する秒数
+        """
+        with self._condition:
+            budget = self._budgets.setdefault((token_key, resource), RateBudget(limit=0, remaining=0, reset_at=0.0))
+            budget.blocked_until = max(budget.blocked_until, time.time() + seconds)
+            self._condition.notify_all()
+
+    def _set(self, token_key: str, resource: str, limit: int, remaining: int, reset_at: float) -> None:
+        """
+        残り予算を記録して待機中のリクエストに通知
+        """
+        with self._condition:
+            budget = self._budgets.get((token_key, resource))
+            if budget is None:
+                self._budgets[(token_key, resource)] = RateBudget(limit=limit, remaining=remaining, reset_at=reset_at)
+            else:
+                # 並列リクエストの応答が前後しても、同じリセット期間内では少ない方の残りを採用する
+                if reset_at == budget.reset_at:
+                    remaining = min(remaining, budget.remaining)
+                budget.limit = limit
+                budget.remaining = remaining
+                budget.reset_at = reset_at
+            self._condition.notify_all()
+
+
+_default_scheduler = RateLimitScheduler()
+
+
+def get_scheduler() -> RateLimitScheduler:
+    """
+    プロセス共有のスケジューラを取得
+
+    Returns:
+        スケジューラ
+    """
+    return _default_scheduler
@@ -0,0 +1,88 @@
+"""
+リポジトリの更新状況（フィンガープリント）の一括取得モジュール
+"""
+from typing import Any, Dict, List, Optional
+
+from .github_client import GitHubAPIError, GitHubClient
+from .rate_limiter import PRIORITY_HIGH
+
+# 1つのGraphQLクエリにまとめるリポジトリ数
+METADATA_BATCH_SIZE = 50
+
+REPO_METADATA_FIELDS = """
+pushedAt
+updatedAt
+defaultBranchRef { name }
+issues(first: 1, orderBy: {field: UPDATED_AT, direction: DESC}) { nodes { updatedAt } }
+pullRequests(first: 1, orderBy: {field: UPDATED_AT, direction: DESC}) { nodes { updatedAt } }
+"""
+
+
+def _latest_updated_at(connection: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    first: 1 で取得したコネクションから最新の updatedAt を取り出す
+    """
+    nodes = (connection or {}).get("nodes") or []
+    return nodes[0].get("updatedAt") if nodes else None
+
+
+def fetch_repo_metadata(
+    client: GitHubClient,
+    repos: List[str],
+    batch_size: int = METADATA_BATCH_SIZE,
+    priority: int = PRIORITY_HIGH
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    複数リポジトリの最終push日時・更新日時と、最新のissue/PRの更新日時をまとめて取得
+
+    前回の値と一致するリポジトリは、issue/PRやコミットを取得し直す必要がない。
+    取得に失敗したバッチのリポジトリは結果に含めない（呼び出し側は通常どおり取得する）。
+
+    Args:
+        client: GitHubクライアント
+        repos: リポジトリ名（owner/repo形式）のリスト
+        batch_size: 1クエリにまとめるリポジトリ数
+        priority: レート制限上の優先度
+
+    Returns:
+        リポジトリ名 -> {pushedAt, updatedAt, defaultBranch, issuesUpdatedAt, pullRequestsUpdatedAt}
+    """
+    metadata: Dict[str, Dict[str, Optional[str]]] = {}
+
+    for start in range(0, len(repos), batch_size):
+        batch = repos[start:start + batch_size]
+        variable_defs = []
+        variables: Dict[str, Any] = {}
+        blocks = []
+        for index, repo in enumerate(batch):
+            owner, name = repo.split("/", 1)
+            variable_defs += [f"$owner{index}: String!", f"$name{index}: String!"]
+            variables.update({f"owner{index}": owner, f"name{index}": name})
+            blocks.append(f"r{index}: repository(owner: $owner{index}, name: $name{index}) {{ {REPO_METADATA_FIELDS} }}")
+
+        query = (
+            f"query RepoMetadata({', '.join(variable_defs)}) {{\n"
+            f"  rateLimit {{ limit cost remaining resetAt }}\n"
+            + "\n".join(blocks)
+            + "\n}\n"
+        )
+
+        try:
+            data = client.graphql(query, variables, priority=priority)
+        except GitHubAPIError as e:
+            print(f"{len(batch)}件のリポジトリの更新状況を取得できませんでした: {e}")
+            continue
+
+        for index, repo in enumerate(batch):
+            node = data.get(f"r{index}")
+            if not node:
+                continue
+            metadata[repo] = {
+                "pushedAt": node.get("pushedAt"),
+                "updatedAt": node.get("updatedAt"),
+                "defaultBranch": (node.get("defaultBranchRef") or {}).get("name"),
+                "issuesUpdatedAt": _latest_updated_at(node.get("issues")),
+                "pullRequestsUpdatedAt": _latest_updated_at(node.get("pullRequests")),
+            }
+
+    return metadata
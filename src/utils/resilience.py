@@ -0,0 +1,131 @@
+"""
+GitHub API呼び出しの再試行・サーキットブレーカーモジュール
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# 一時的な障害として再試行するHTTPステータス
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+@dataclass
+class RetryPolicy:
+    """一時的な障害に対する再試行の回数と待ち時間（指数バックオフ + フルジッター）"""
+
+    max_retries: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        再試行までに待つ秒数
+
+        同時に失敗した複数のリクエストが同じタイミングで再送しないよう、上限までの範囲で
+        ランダムに選ぶ。Retry-After が指定されている場合はそれより短くしない。
+
+        Args:
+            attempt: 何回目の再試行か（0始まり）
+            retry_after: レスポンスの Retry-After（秒）
+
+        Returns:
+            待つ秒数
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+@dataclass
+class _CircuitState:
+    """ホストごとのサーキットの状態"""
+
+    failures: int = 0
+    opened_at: Optional[float] = None
+    trial_in_flight: bool = False
+
+
+class CircuitBreaker:
+    """
+    ホストごとに連続した失敗を数え、しきい値を超えたら一定時間リクエストを止めるクラス
+
+    停止中（open）のホストへのリクエストはすぐに失敗させる。reset_timeout 経過後は
+    1件だけ試行を通し（half-open）、成功すれば再開、失敗すれば再び停止する。
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        サーキットブレーカーを初期化
+
+        Args:
+            failure_threshold: 停止するまでの連続失敗回数
+            reset_timeout: 停止してから試行を再開するまでの秒数
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._states: Dict[str, _CircuitState] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        """
+        ホストへのリクエストを送ってよいか
+
+        Args:
+            host: ホスト名（ポートを含む）
+
+        Returns:
+            送ってよい場合はTrue
+        """
+        with self._lock:
+            state = self._states.setdefault(host, _CircuitState())
+            if state.opened_at is None:
+                return True
+            if state.trial_in_flight or time.monotonic() - state.opened_at < self.reset_timeout:
+                return False
+            state.trial_in_flight = True
+            return True
+
+    def record_success(self, host: str) -> None:
+        """
+        成功を記録（連続失敗回数を戻し、停止中であれば再開する）
+
+        Args:
+            host: ホスト名
+        """
+        with self._lock:
+            self._states[host] = _CircuitState()
+
+    def record_failure(self, host: str) -> None:
+        """
+        失敗を記録（しきい値に達するか、再開の試行が失敗したら停止する）
+
+        Args:
+            host: ホスト名
+        """
+        with self._lock:
+            state = self._states.setdefault(host, _CircuitState())
+            state.failures += 1
+            if state.trial_in_flight or state.failures >= self.failure_threshold:
+                if state.opened_at is None or state.trial_in_flight:
+                    print(f"{host} への失敗が続いたため、{self.reset_timeout:.0f}秒間リクエストを停止します")
+                state.opened_at = time.monotonic()
+                state.trial_in_flight = False
+
+    def retry_in(self, host: str) -> float:
+        """
+        停止中のホストへの試行を再開できるまでの秒数
+
+        Args:
+            host: ホスト名
+
+        Returns:
+            秒数（停止していない場合は0）
+        """
+        with self._lock:
+            state = self._states.get(host)
+            if state is None or state.opened_at is None:
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - state.opened_at), 0.0)
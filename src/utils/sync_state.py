@@ -0,0 +1,69 @@
+"""
+同期状態（ウォーターマーク）管理モジュール
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Union
+
+from .file_utils import ensure_dir
+
+
+class SyncState:
+    """リポジトリごとの同期状態をJSONファイルに永続化するクラス"""
+
+    def __init__(self, state_file: Union[str, Path]):
+        """
+        同期状態を読み込む
+
+        Args:
+            state_file: 状態ファイルのパス
+        """
+        self.state_file = Path(state_file)
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._state = data
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"同期状態の読み込みに失敗しました: {self.state_file}, エラー: {e}")
+
+    def get(self, key: str) -> Dict[str, Any]:
+        """
+        同期状態を取得
+
+        Args:
+            key: リポジトリ名などのキー
+
+        Returns:
+            同期状態の辞書（未登録の場合は空の辞書）
+        """
+        with self._lock:
+            return dict(self._state.get(key, {}))
+
+    def update(self, key: str, **values: Any) -> None:
+        """
+        同期状態を更新してファイルに保存
+
+        Args:
+            key: リポジトリ名などのキー
+            **values: 更新する値
+        """
+        with self._lock:
+            self._state.setdefault(key, {}).update(values)
+            self._save()
+
+    def _save(self) -> None:
+        """
+        状態ファイルを一時ファイル経由で書き換える
+        """
+        ensure_dir(self.state_file.parent)
+        tmp_file = self.state_file.with_name(self.state_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.state_file)
@@ -0,0 +1,3 @@
+"""
+GitHub Webhook受信モジュール
+"""
@@ -0,0 +1,127 @@
+"""
+Webhook受信サーバーのメインモジュール
+
+    # Webhookを受信して保存コピーに反映（受信したペイロードも保存）
+    GITHUB_WEBHOOK_SECRET=... python -m src.webhook_receiver serve --port 8080 --save-dir webhooks
+
+    # 保存したペイロードを直接保存コピーに反映
+    python -m src.webhook_receiver replay webhooks/*.json
+
+    # 保存したペイロードを署名付きで受信サーバーに送信
+    python -m src.webhook_receiver replay webhooks/*.json --url http://127.0.0.1:8080
+"""
+import argparse
+import json
+import sys
+import uuid
+
+import requests
+
+from ..utils.config import Config
+from .events import apply_event
+from .server import WebhookServer, sign_payload
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Webhook受信サーバーを起動して終了まで待つ
+
+    Args:
+        args: 解析済みの引数
+
+    Returns:
+        終了コード
+    """
+    if not args.secret:
+        print("エラー: Webhookのシークレットが設定されていません（GITHUB_WEBHOOK_SECRET または --secret）")
+        return 1
+
+    server = WebhookServer((args.host, args.port), args.secret, args.output_dir, args.save_dir)
+    print(f"Webhook受信サーバーを起動しました: {server.url}（出力ディレクトリ: {args.output_dir}）")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"受信したイベント数: {server.received}")
+    return 0
+
+
+def replay(args: argparse.Namespace) -> int:
+    """
+    保存したペイロードを順番に反映（--url を指定した場合は受信サーバーに送信）
+
+    Args:
+        args: 解析済みの引数
+
+    Returns:
+        終了コード
+    """
+    if args.url and not args.secret:
+        print("エラー: 送信する場合はWebhookのシークレットが必要です（GITHUB_WEBHOOK_SECRET または --secret）")
+        return 1
+
+    failed = 0
+    for file in args.files:
+        with open(file, 'r', encoding='utf-8') as f:
+            delivery = json.load(f)
+        event = delivery["event"]
+        payload = delivery["payload"]
+
+        if not args.url:
+            print(f"[{event}] {apply_event(event, payload, args.output_dir)}")
+            continue
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        response = requests.post(args.url, data=body, headers={
+            "Content-Type": "application/json",
+            "X-GitHub-Event": event,
+            "X-GitHub-Delivery": delivery.get("delivery") or str(uuid.uuid4()),
+            "X-Hub-Signature-256": sign_payload(args.secret, body),
+        }, timeout=30)
+        print(f"[{event}] {response.status_code} {response.text}")
+        if response.status_code >= 300:
+            failed += 1
+
+    if failed:
+        print(f"{failed}件のイベントの送信に失敗しました")
+        return 1
+    return 0
+
+
+def main() -> int:
+    """
+    メイン関数
+
+    Returns:
+        終了コード（0: 成功, 1: 失敗）
+    """
+    config = Config()
+
+    parser = argparse.ArgumentParser(description='GitHub Webhookを受信して保存コピーをリアルタイムに更新する')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Webhook受信サーバーを起動')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='待ち受けるホスト')
+    serve_parser.add_argument('--port', type=int, default=8080, help='待ち受けるポート')
+    serve_parser.add_argument('--save-dir', help='受信したペイロードを保存するディレクトリ（replay で再生できる）')
+
+    replay_parser = subparsers.add_parser('replay', help='保存したペイロードを反映')
+    replay_parser.add_argument('files', nargs='+', help='serve --save-dir で保存したペイロードのファイル')
+    replay_parser.add_argument('--url', help='送信先の受信サーバーのURL（指定しない場合は直接反映する）')
+
+    for sub in (serve_parser, replay_parser):
+        sub.add_argument('--secret', default=config.get("github.webhook_secret"), help='Webhookのシークレット')
+        sub.add_argument('--output-dir', default=config.get("output.default_dir", "./data"), help='出力ディレクトリ')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        return serve(args)
+    return replay(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
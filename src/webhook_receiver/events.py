@@ -0,0 +1,204 @@
+"""
+GitHub Webhookイベントを保存コピーに反映するモジュール
+
+issue/PRは収集処理と同じ保存コピー（state/github）に、コメントはコメントキャッシュ
+（state/comments）に、pushされたコミットはコミットデータ（state/commits）に反映する。
+反映後のデータは `--from-store` を付けた各収集処理でAPIを呼ばずに集計できる。
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from ..commit_collector.commit_cache import CommitCache
+from ..commit_collector.commit_stats import build_commit_record
+from ..github_logger.comment_fetch import CommentFetcher
+from ..github_logger.item_store import ItemStore
+
+SUPPORTED_EVENTS = ("issues", "pull_request", "issue_comment", "push", "ping")
+
+_MERGEABLE_STATES = {True: "MERGEABLE", False: "CONFLICTING", None: "UNKNOWN"}
+
+
+def _login(user: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+    """
+    Webhookのユーザー情報をGraphQLの author 形式にする
+    """
+    return {"login": user["login"]} if user and user.get("login") else None
+
+
+def convert_comment(comment: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Webhookのコメントを収集処理のコメントノードと同じ形にする
+
+    Args:
+        comment: Webhookペイロードの comment
+
+    Returns:
+        コメントノード（id, author, authorAssociation, body, createdAt, url）
+    """
+    return {
+        "id": comment.get("node_id"),
+        "author": _login(comment.get("user")),
+        "authorAssociation": comment.get("author_association"),
+        "body": comment.get("body") or "",
+        "createdAt": comment.get("created_at"),
+        "url": comment.get("html_url"),
+    }
+
+
+def convert_item(payload_item: Dict[str, Any], existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Webhookのissue/PRを保存コピーのアイテムと同じ形にする
+
+    Webhookに含まれないコメント本文と担当者の表示名は、保存済みのアイテムから引き継ぐ。
+
+    Args:
+        payload_item: Webhookペイロードの issue または pull_request
+        existing: 保存済みのアイテム
+
+    Returns:
+        保存コピーのアイテム
+    """
+    existing = existing or {}
+    names = {assignee.get("login"): assignee.get("name") for assignee in existing.get("assignees", [])}
+    # issue_comment のペイロードはPRでもissue形式のため、マージ日時は pull_request から取る
+    is_pr = "mergeable" in payload_item or "mergeable" in existing
+    merged_at = payload_item.get("merged_at") or (payload_item.get("pull_request") or {}).get("merged_at")
+
+    if payload_item.get("state") == "open":
+        state = "OPEN"
+    elif is_pr and merged_at:
+        state = "MERGED"
+    else:
+        state = "CLOSED"
+
+    item = dict(existing)
+    item.update({
+        "number": payload_item["number"],
+        "title": payload_item.get("title"),
+        "body": payload_item.get("body") or "",
+        "state": state,
+        "createdAt": payload_item.get("created_at"),
+        "updatedAt": payload_item.get("updated_at"),
+        "closedAt": payload_item.get("closed_at"),
+        "url": payload_item.get("html_url"),
+        "author": _login(payload_item.get("user")),
+        "assignees": [
+            {"login": assignee.get("login"), "name": names.get(assignee.get("login"))}
+            for assignee in payload_item.get("assignees") or []
+        ],
+        "labels": [
+            {"name": label.get("name"), "description": label.get("description"), "color": label.get("color")}
+            for label in payload_item.get("labels") or []
+        ],
+    })
+
+    if isinstance(payload_item.get("comments"), int):
+        item["commentCount"] = payload_item["comments"]
+
+    if is_pr:
+        item.update({
+            "mergedAt": merged_at,
+            "mergeable": _MERGEABLE_STATES.get(payload_item.get("mergeable"), "UNKNOWN")
+            if "mergeable" in payload_item else existing.get("mergeable", "UNKNOWN"),
+            "additions": payload_item.get("additions", existing.get("additions")),
+            "deletions": payload_item.get("deletions", existing.get("deletions")),
+            "changedFiles": payload_item.get("changed_files", existing.get("changedFiles")),
+        })
+
+    return item
+
+
+def _apply_item(store: ItemStore, payload_item: Dict[str, Any]) -> str:
+    """
+    issues / pull_request イベントのアイテムを保存コピーに反映
+    """
+    number = payload_item["number"]
+    store.upsert([convert_item(payload_item, store.get(number))])
+    return f"#{number} を保存コピーに反映しました"
+
+
+def _apply_comment(store: ItemStore, state_dir: Path, repo: str, payload: Dict[str, Any]) -> str:
+    """
+    issue_comment イベントのコメントをアイテムとコメントキャッシュに反映
+    """
+    action = payload.get("action", "")
+    issue = payload["issue"]
+    number = issue["number"]
+    comment = convert_comment(payload["comment"])
+    existing = store.get(number)
+
+    if existing is None and issue.get("pull_request"):
+        # issue形式のペイロードにはPR固有の項目がないため、PRは次回の取得で保存コピーに入る
+        return f"#{number} は保存コピーにないPRのためスキップしました"
+
+    item = convert_item(issue, existing)
+    if isinstance(item.get("comments"), list):
+        comments = [cached for cached in item["comments"] if cached.get("id") != comment["id"]]
+        if action != "deleted":
+            comments.append(comment)
+            comments.sort(key=lambda cached: cached.get("createdAt") or "")
+        item["comments"] = comments
+    store.upsert([item])
+
+    cached = CommentFetcher(None, repo, state_dir / "comments").apply_comment_event(
+        number, item["updatedAt"], comment, action
+    )
+    return f"#{number} のコメントを反映しました（{action}{', キャッシュ更新' if cached else ''}）"
+
+
+def _apply_push(state_dir: Path, repo: str, payload: Dict[str, Any]) -> str:
+    """
+    push イベントのコミットをコミットデータに追加（デフォルトブランチのみ）
+    """
+    default_branch = (payload.get("repository") or {}).get("default_branch")
+    if payload.get("ref") != f"refs/heads/{default_branch}":
+        return f"{payload.get('ref')} はデフォルトブランチではないためスキップしました"
+
+    records: List[Dict[str, Any]] = [
+        build_commit_record(
+            repo, commit.get("id"), (commit.get("author") or {}).get("name", "unknown"), commit.get("timestamp", "")
+        )
+        for commit in payload.get("commits") or []
+    ]
+    added = CommitCache(state_dir).add(repo, records)
+    message = f"{len(records)}件のコミットのうち{added}件を追加しました"
+    if payload.get("forced"):
+        message += "（force pushのため、削除されたコミットは次回の取得で反映されます）"
+    return message
+
+
+def apply_event(event: str, payload: Dict[str, Any], output_dir: Union[str, Path] = "./data") -> str:
+    """
+    Webhookイベントを出力ディレクトリの保存コピーに反映
+
+    Args:
+        event: イベント名（X-GitHub-Event ヘッダーの値）
+        payload: Webhookペイロード
+        output_dir: 出力ディレクトリ（収集処理と同じもの）
+
+    Returns:
+        処理結果の説明
+    """
+    if event == "ping":
+        return "pong"
+    if event not in SUPPORTED_EVENTS:
+        return f"イベント {event} は対象外のためスキップしました"
+
+    repo = (payload.get("repository") or {}).get("full_name")
+    if not repo:
+        return f"イベント {event} にリポジトリ情報がないためスキップしました"
+
+    state_dir = Path(output_dir) / "state"
+    if event == "push":
+        return f"{repo}: {_apply_push(state_dir, repo, payload)}"
+
+    if event in ("issues", "pull_request") and payload.get("action") in ("deleted", "transferred"):
+        # 収集処理も削除・移管されたアイテムを保存コピーから消さないため、同じ扱いにする
+        return f"{repo}: {payload.get('action')} のイベントはスキップしました"
+
+    store = ItemStore(state_dir / "github", repo)
+    if event == "issues":
+        return f"{repo}: {_apply_item(store, payload['issue'])}"
+    if event == "pull_request":
+        return f"{repo}: {_apply_item(store, payload['pull_request'])}"
+    return f"{repo}: {_apply_comment(store, state_dir, repo, payload)}"
@@ -0,0 +1,147 @@
+"""
+GitHub Webhookの受信サーバー
+
+X-Hub-Signature-256 の署名を検証してから、イベントを保存コピーに反映する。
+反映は1件ずつ順番に行うため、同じリポジトリへのイベントが同時に届いても保存コピーは壊れない。
+"""
+import hashlib
+import hmac
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from ..utils.file_utils import ensure_dir
+from .events import apply_event
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    """
+    ペイロードの署名（X-Hub-Signature-256 ヘッダーの値）を計算
+
+    Args:
+        secret: Webhookのシークレット
+        body: リクエストボディ
+
+    Returns:
+        `sha256=` で始まる署名
+    """
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """
+    X-Hub-Signature-256 ヘッダーの署名を検証
+
+    Args:
+        secret: Webhookのシークレット
+        body: リクエストボディ
+        signature: X-Hub-Signature-256 ヘッダーの値
+
+    Returns:
+        署名が一致する場合はTrue
+    """
+    if not signature:
+        return False
+    return hmac.compare_digest(sign_payload(secret, body), signature)
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """Webhookを受信して保存コピーに反映するHTTPサーバー"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        secret: str,
+        output_dir: Union[str, Path],
+        save_dir: Optional[Union[str, Path]] = None
+    ):
+        """
+        サーバーを初期化
+
+        Args:
+            address: 待ち受けるホストとポート
+            secret: Webhookのシークレット
+            output_dir: 出力ディレクトリ（収集処理と同じもの）
+            save_dir: 受信したペイロードを保存するディレクトリ（replay で再生できる）
+        """
+        super().__init__(address, WebhookRequestHandler)
+        self.secret = secret
+        self.output_dir = Path(output_dir)
+        self.save_dir = Path(save_dir) if save_dir else None
+        self.apply_lock = threading.Lock()
+        self.received = 0
+
+    @property
+    def url(self) -> str:
+        """
+        サーバーのURL
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def save_delivery(self, event: str, delivery: str, payload: Dict[str, Any]) -> None:
+        """
+        受信したペイロードを replay で読み込める形式で保存
+        """
+        if self.save_dir is None:
+            return
+        ensure_dir(self.save_dir)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = self.save_dir / f"{timestamp}-{event}-{delivery or 'unknown'}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"event": event, "delivery": delivery, "payload": payload}, f, ensure_ascii=False, indent=2)
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    """Webhook受信サーバーのリクエストハンドラー"""
+
+    server: WebhookServer
+
+    def do_POST(self) -> None:
+        """
+        Webhookを受信して保存コピーに反映
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if not verify_signature(self.server.secret, body, self.headers.get("X-Hub-Signature-256")):
+            self._send_text(401, "invalid signature")
+            return
+
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            self._send_text(400, "invalid payload")
+            return
+
+        event = self.headers.get("X-GitHub-Event", "")
+        delivery = self.headers.get("X-GitHub-Delivery", "")
+
+        with self.server.apply_lock:
+            self.server.received += 1
+            self.server.save_delivery(event, delivery, payload)
+            try:
+                message = apply_event(event, payload, self.server.output_dir)
+            except (KeyError, TypeError, ValueError, OSError) as e:
+                print(f"イベント {event}（{delivery}）の反映に失敗しました: {e}")
+                self._send_text(500, "failed to apply event")
+                return
+
+        print(f"[{event}] {message}")
+        self._send_text(202, message)
+
+    def _send_text(self, status: int, message: str) -> None:
+        """
+        テキストのレスポンスを送信
+        """
+        body = message.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)